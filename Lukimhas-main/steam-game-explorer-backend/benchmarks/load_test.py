@@ -0,0 +1,340 @@
+"""
+Teste de carga: replica um mix de tráfego contra o backend rodando de verdade
+(servidor HTTP em outro processo), com a Steam trocada pelo stub.
+
+A carga é de malha aberta: as requisições saem na taxa pedida mesmo que o
+servidor atrase, então a fila aparece na latência. Cada estágio de --rates
+roda por --duration segundos; durante o teste, threads, RSS e CPU do
+processo do servidor são amostrados para achar o ponto em que ele cai.
+
+Exemplos:
+    python benchmarks/load_test.py --rates 10 25 50 100 --duration 20
+    python benchmarks/load_test.py --mix search=50,details=50 --latency-ms 120 --output load.json
+    python benchmarks/load_test.py --target http://127.0.0.1:5001 --pid 12345
+"""
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import requests
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from benchmarks.run_bench import GAME_REQUIREMENTS, git_commit, summarize_latencies
+from benchmarks.stub_steam import StubSteamServer, load_fixture
+
+DEFAULT_MIX = 'search=30,details=30,reviews=15,stats=10,news=10,compare=5'
+
+# Termos de busca tirados dos nomes do GetAppList gravado
+SEARCH_TERMS = ('counter', 'strike', 'half', 'portal', 'cyber', 'dota', 'team', 'war', 'the', 'souls')
+
+SERVER = """
+import sys
+sys.path.insert(0, {backend!r})
+from werkzeug.serving import run_simple
+from src.main import create_app, init_db
+app = create_app({{'SQLALCHEMY_DATABASE_URI': {database!r}}})
+init_db(app)
+run_simple('127.0.0.1', {port}, app, threaded=True)
+"""
+
+
+def build_requests(appids):
+    """nome -> função que sorteia (método, caminho, corpo) de uma requisição."""
+    return {
+        'search': lambda rng: ('GET', f'/api/steam/games/search?q={rng.choice(SEARCH_TERMS)}', None),
+        'details': lambda rng: ('GET', f'/api/steam/games/{rng.choice(appids)}/details', None),
+        'reviews': lambda rng: ('GET', f'/api/steam/games/{rng.choice(appids)}/reviews?num_per_page=20', None),
+        'stats': lambda rng: ('GET', f'/api/steam/games/{rng.choice(appids)}/stats', None),
+        'news': lambda rng: ('GET', f'/api/steam/games/{rng.choice(appids)}/news?count=5', None),
+        # cpu_percent(interval=1) faz cada compare segurar uma thread por ~1s
+        'compare': lambda rng: ('POST', '/api/system/compare',
+                                {'game_requirements': GAME_REQUIREMENTS, 'type': 'minimum'}),
+    }
+
+
+def parse_mix(text, available):
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in available:
+            raise argparse.ArgumentTypeError(f'tipo de requisição desconhecido: {name}')
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(stub_url, database):
+    port = free_port()
+    env = dict(os.environ, STEAM_STORE_BASE=stub_url, STEAM_API_BASE=stub_url)
+    code = SERVER.format(backend=BACKEND_DIR, database=database, port=port)
+    process = subprocess.Popen([sys.executable, '-c', code], cwd=BACKEND_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f'http://127.0.0.1:{port}'
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError('o servidor terminou durante o startup')
+        try:
+            requests.get(f'{base_url}/api/metrics', timeout=1)
+            return process, base_url
+        except requests.RequestException:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError('o servidor não respondeu em 30s')
+
+
+class ProcessSampler:
+    """Amostra threads, RSS e CPU de um processo numa thread separada."""
+
+    def __init__(self, pid, interval):
+        import psutil
+        self.process = psutil.Process(pid) if pid else None
+        self.interval = interval
+        self.samples = []
+        self.extra = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='load-sampler', daemon=True)
+
+    def _run(self):
+        started = time.monotonic()
+        if self.process is not None:
+            self.process.cpu_percent()
+        while not self._stop.wait(self.interval):
+            sample = {'t': round(time.monotonic() - started, 2)}
+            if self.process is not None:
+                try:
+                    sample['threads'] = self.process.num_threads()
+                    sample['rss_bytes'] = self.process.memory_info().rss
+                    sample['cpu_percent'] = self.process.cpu_percent()
+                except Exception:
+                    sample['process'] = 'gone'
+            if self.extra is not None:
+                sample.update(self.extra())
+            self.samples.append(sample)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+
+class Stage:
+    """Estatísticas de um estágio (uma taxa alvo)."""
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.lock = threading.Lock()
+        self.latencies = {}
+        self.statuses = {}
+        self.sent = 0
+        self.dropped = 0
+        self.inflight = 0
+        self.completed_window = 0
+        self.errors_window = 0
+
+    def record(self, kind, status, latency_ms):
+        with self.lock:
+            self.inflight -= 1
+            self.latencies.setdefault(kind, []).append(latency_ms)
+            self.statuses.setdefault(kind, {})
+            self.statuses[kind][status] = self.statuses[kind].get(status, 0) + 1
+            self.completed_window += 1
+            if not status.startswith('2'):
+                self.errors_window += 1
+
+    def window(self):
+        """Contagens desde a última amostra, para a linha do tempo."""
+        with self.lock:
+            result = {'rate': self.rate, 'inflight': self.inflight,
+                      'completed': self.completed_window, 'errors': self.errors_window}
+            self.completed_window = self.errors_window = 0
+        return result
+
+    def summary(self, elapsed):
+        kinds = {}
+        all_latencies = []
+        total_errors = 0
+        for kind, latencies in self.latencies.items():
+            statuses = self.statuses[kind]
+            errors = sum(count for status, count in statuses.items() if not status.startswith('2'))
+            total_errors += errors
+            all_latencies.extend(latencies)
+            kinds[kind] = {
+                'requests': len(latencies),
+                'errors': errors,
+                'error_rate': errors / len(latencies),
+                'status_counts': statuses,
+                'latency_ms': summarize_latencies(latencies),
+            }
+        completed = len(all_latencies)
+        return {
+            'target_rps': self.rate,
+            'sent': self.sent,
+            'completed': completed,
+            'dropped': self.dropped,
+            'achieved_rps': completed / elapsed if elapsed > 0 else None,
+            'errors': total_errors,
+            'error_rate': total_errors / completed if completed else None,
+            'latency_ms': summarize_latencies(all_latencies),
+            'by_type': kinds,
+        }
+
+
+def run_stage(base_url, rate, duration, mix, generators, max_inflight, timeout, seed, sampler):
+    stage = Stage(rate)
+    sampler.extra = stage.window
+    rng = random.Random(seed)
+    kinds = list(mix)
+    weights = [mix[k] for k in kinds]
+    local = threading.local()
+
+    def send(kind, method, path, body):
+        session = getattr(local, 'session', None)
+        if session is None:
+            session = local.session = requests.Session()
+        t0 = time.perf_counter()
+        try:
+            response = session.request(method, base_url + path, json=body, timeout=timeout)
+            status = str(response.status_code)
+        except requests.Timeout:
+            status = 'timeout'
+        except requests.RequestException:
+            status = 'connection_error'
+        stage.record(kind, status, (time.perf_counter() - t0) * 1000.0)
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=max_inflight, thread_name_prefix='load') as executor:
+        next_at = started
+        while next_at - started < duration:
+            delay = next_at - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            # Chegadas de Poisson na taxa alvo
+            next_at += rng.expovariate(rate)
+            with stage.lock:
+                if stage.inflight >= max_inflight:
+                    # Cliente saturado: conta como descartada em vez de atrasar o relógio
+                    stage.dropped += 1
+                    continue
+                stage.inflight += 1
+                stage.sent += 1
+            kind = rng.choices(kinds, weights)[0]
+            method, path, body = generators[kind](rng)
+            executor.submit(send, kind, method, path, body)
+    elapsed = time.monotonic() - started
+    sampler.extra = None
+    return stage.summary(elapsed)
+
+
+def print_report(results):
+    print(f"\n{'rps alvo':>9} {'rps real':>9} {'erros':>7} {'desc.':>6} {'p50 ms':>9} {'p95 ms':>9} "
+          f"{'p99 ms':>9} {'threads':>8} {'RSS MB':>8}")
+    for stage in results['stages']:
+        lat = stage['latency_ms']
+        # Sem amostras (--target sem --pid, estágio curto) os picos vêm como None
+        peaks = stage.get('server_peak') or {}
+        rss = peaks.get('rss_bytes')
+        print(f"{stage['target_rps']:>9.1f} {stage['achieved_rps'] or 0:>9.1f} "
+              f"{(stage['error_rate'] or 0) * 100:>6.1f}% {stage['dropped']:>6} "
+              f"{lat['p50'] or 0:>9.1f} {lat['p95'] or 0:>9.1f} {lat['p99'] or 0:>9.1f} "
+              f"{peaks.get('threads') or '-':>8} {rss / 2 ** 20 if rss else 0:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Teste de carga do backend contra um stub da Steam')
+    parser.add_argument('--rates', type=float, nargs='+', default=[5, 10, 25, 50],
+                        help='requisições por segundo de cada estágio')
+    parser.add_argument('--duration', type=float, default=15, help='segundos por estágio')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help=f'pesos por tipo (padrão: {DEFAULT_MIX})')
+    parser.add_argument('--appids', type=int, default=200,
+                        help='quantidade de appids distintos sorteados (mais = menos acertos de cache)')
+    parser.add_argument('--max-inflight', type=int, default=256)
+    parser.add_argument('--timeout', type=float, default=30)
+    parser.add_argument('--sample-interval', type=float, default=1.0)
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--latency-ms', type=float, default=80)
+    parser.add_argument('--jitter-ms', type=float, default=40)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--app-count', type=int, default=150000)
+    parser.add_argument('--target', help='URL de um backend já rodando (não sobe stub nem servidor)')
+    parser.add_argument('--pid', type=int, help='PID do servidor em --target, para amostrar threads e RSS')
+    parser.add_argument('--output', help='arquivo JSON de saída')
+    args = parser.parse_args()
+
+    apps = load_fixture('GetAppList')['applist']['apps']
+    appids = [app['appid'] for app in apps][:args.appids]
+    appids += list(range(3000000, 3000000 + max(args.appids - len(appids), 0)))
+    generators = build_requests(appids)
+    mix = parse_mix(args.mix, generators)
+
+    stub = server = None
+    database = os.path.join(tempfile.mkdtemp(prefix='steam-load-'), 'app.db')
+    if args.target:
+        base_url, pid = args.target.rstrip('/'), args.pid
+    else:
+        stub = StubSteamServer(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                               error_rate=args.error_rate, app_count=args.app_count).start()
+        server, base_url = start_server(stub.base_url, f'sqlite:///{database}')
+        pid = server.pid
+
+    sampler = ProcessSampler(pid, args.sample_interval).start()
+    results = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'target': base_url,
+            'config': {k: v for k, v in vars(args).items() if k != 'output'},
+        },
+        'stages': [],
+    }
+    try:
+        for i, rate in enumerate(args.rates):
+            first_sample = len(sampler.samples)
+            print(f'estágio {i + 1}/{len(args.rates)}: {rate} rps por {args.duration}s', file=sys.stderr)
+            stage = run_stage(base_url, rate, args.duration, mix, generators,
+                              args.max_inflight, args.timeout, args.seed + i, sampler)
+            window = sampler.samples[first_sample:]
+            stage['server_peak'] = {
+                key: max((s[key] for s in window if key in s), default=None)
+                for key in ('threads', 'rss_bytes', 'cpu_percent')
+            }
+            results['stages'].append(stage)
+    finally:
+        sampler.stop()
+        if server is not None:
+            server.terminate()
+            server.wait()
+        if stub is not None:
+            stub.stop()
+            results['meta']['stub_requests'] = stub.request_count
+    results['timeline'] = sampler.samples
+
+    # Grava antes do relatório: um erro na impressão não pode perder a rodada
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(results, indent=2) + '\n')
+    print_report(results)
+
+
+if __name__ == '__main__':
+    main()
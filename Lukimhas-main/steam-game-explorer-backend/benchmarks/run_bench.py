@@ -0,0 +1,211 @@
+"""
+Benchmark das rotas principais contra o stub da Steam, usando o test client do Flask.
+
+Exemplos:
+    python benchmarks/run_bench.py --output bench.json
+    python benchmarks/run_bench.py --cold --latency-ms 50 --compare bench.json
+
+O resultado é um JSON (latência em percentis, throughput e pico de memória por
+cenário) que pode ser comparado entre commits com --compare.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from benchmarks.stub_steam import StubSteamServer
+
+BENCH_APP_ID = 1091500
+
+GAME_REQUIREMENTS = {
+    'minimum': {
+        'os': '64-bit Windows 10',
+        'processor': 'Core i7-6700 or Ryzen 5 1600',
+        'memory': '12 GB RAM',
+        'graphics': 'GeForce GTX 1060 6GB or Radeon RX 580 8GB',
+        'storage': '70 GB available space'
+    }
+}
+
+# nome -> (método, url, corpo json, iterações padrão)
+SCENARIOS = {
+    'search_games': ('GET', '/api/steam/games/search?q=counter', None, None),
+    'get_game_details': ('GET', f'/api/steam/games/{BENCH_APP_ID}/details', None, None),
+    'get_game_reviews': ('GET', f'/api/steam/games/{BENCH_APP_ID}/reviews?num_per_page=20', None, None),
+    'get_game_stats': ('GET', f'/api/steam/games/{BENCH_APP_ID}/stats', None, None),
+    # cpu_percent(interval=1) faz cada chamada levar ~1s; poucas iterações bastam
+    'system_compare': ('POST', '/api/system/compare',
+                       {'game_requirements': GAME_REQUIREMENTS, 'type': 'minimum'}, 3),
+}
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    k = (len(sorted_values) - 1) * pct / 100.0
+    lower = int(k)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (k - lower)
+
+
+def summarize_latencies(latencies):
+    values = sorted(latencies)
+    return {
+        'min': values[0] if values else None,
+        'mean': sum(values) / len(values) if values else None,
+        'p50': percentile(values, 50),
+        'p90': percentile(values, 90),
+        'p95': percentile(values, 95),
+        'p99': percentile(values, 99),
+        'max': values[-1] if values else None,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=BACKEND_DIR,
+                              capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def run_request(client, method, url, body):
+    if method == 'POST':
+        return client.post(url, json=body)
+    return client.get(url)
+
+
+def run_scenario(client, name, iterations, warmup, cold, memory_iterations):
+    from src.utils.cache import clear_all_caches
+
+    method, url, body, default_iterations = SCENARIOS[name]
+    iterations = min(iterations, default_iterations) if default_iterations else iterations
+
+    for _ in range(warmup):
+        run_request(client, method, url, body)
+
+    latencies = []
+    status_counts = {}
+    started = time.perf_counter()
+    for _ in range(iterations):
+        if cold:
+            clear_all_caches()
+        t0 = time.perf_counter()
+        response = run_request(client, method, url, body)
+        latencies.append((time.perf_counter() - t0) * 1000.0)
+        status_counts[str(response.status_code)] = status_counts.get(str(response.status_code), 0) + 1
+    elapsed = time.perf_counter() - started
+
+    # Passada separada com tracemalloc, que distorce a latência
+    tracemalloc.start()
+    for _ in range(min(memory_iterations, iterations)):
+        if cold:
+            clear_all_caches()
+        run_request(client, method, url, body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    errors = sum(count for status, count in status_counts.items() if not status.startswith('2'))
+    return {
+        'method': method,
+        'url': url,
+        'iterations': iterations,
+        'errors': errors,
+        'status_counts': status_counts,
+        'latency_ms': summarize_latencies(latencies),
+        'throughput_rps': iterations / elapsed if elapsed > 0 else None,
+        'peak_traced_memory_bytes': peak,
+    }
+
+
+def compare(current, baseline_path):
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    def delta(new, old):
+        if new is None or not old:
+            return 'n/a'
+        return f'{(new - old) / old * 100:+.1f}%'
+
+    print(f"\nComparação com {baseline_path} (commit {baseline.get('meta', {}).get('commit')})")
+    print(f"{'cenário':<20} {'p50 ms':>10} {'Δp50':>8} {'p95 ms':>10} {'Δp95':>8} {'rps':>10} {'Δrps':>8} {'Δmem':>8}")
+    for name, result in current['scenarios'].items():
+        old = baseline.get('scenarios', {}).get(name)
+        if not old:
+            continue
+        lat, old_lat = result['latency_ms'], old['latency_ms']
+        print(f"{name:<20} {lat['p50']:>10.2f} {delta(lat['p50'], old_lat['p50']):>8} "
+              f"{lat['p95']:>10.2f} {delta(lat['p95'], old_lat['p95']):>8} "
+              f"{result['throughput_rps']:>10.1f} {delta(result['throughput_rps'], old['throughput_rps']):>8} "
+              f"{delta(result['peak_traced_memory_bytes'], old['peak_traced_memory_bytes']):>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark do backend contra um stub da Steam')
+    parser.add_argument('--scenarios', nargs='+', choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--warmup', type=int, default=2)
+    parser.add_argument('--memory-iterations', type=int, default=5)
+    parser.add_argument('--cold', action='store_true', help='limpa os caches antes de cada requisição')
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--jitter-ms', type=float, default=0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--app-count', type=int, default=150000)
+    parser.add_argument('--output', help='arquivo JSON de saída (padrão: stdout)')
+    parser.add_argument('--compare', help='JSON de uma execução anterior para comparar')
+    args = parser.parse_args()
+
+    stub = StubSteamServer(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                           error_rate=args.error_rate, app_count=args.app_count).start()
+    os.environ['STEAM_STORE_BASE'] = stub.base_url
+    os.environ['STEAM_API_BASE'] = stub.base_url
+
+    # Importado só depois de apontar as URLs da Steam para o stub
+    t0 = time.perf_counter()
+    from src.main import app
+    import_ms = (time.perf_counter() - t0) * 1000.0
+    from src.utils.memory import peak_rss_bytes
+    client = app.test_client()
+
+    results = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'app_import_ms': import_ms,
+            'config': {k: v for k, v in vars(args).items() if k not in ('output', 'compare')},
+        },
+        'scenarios': {},
+    }
+    try:
+        for name in args.scenarios:
+            results['scenarios'][name] = run_scenario(
+                client, name, args.iterations, args.warmup, args.cold, args.memory_iterations
+            )
+    finally:
+        stub.stop()
+    results['meta']['stub_requests'] = stub.request_count
+    results['meta']['peak_rss_bytes'] = peak_rss_bytes()
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
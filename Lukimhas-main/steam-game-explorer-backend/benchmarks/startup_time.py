@@ -0,0 +1,90 @@
+"""
+Mede o custo de inicialização do backend em interpretadores novos.
+
+Cada rodada abre um Python limpo, importa src.main (que cria o app) e mede o
+tempo; uma rodada extra com -X importtime lista os módulos mais caros. Também
+verifica se as bibliotecas de hardware continuam fora do caminho de import.
+
+    python benchmarks/startup_time.py --runs 5 --output startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ('psutil', 'cpuinfo', 'GPUtil', 'streamlit_panel.utils', 'aiohttp')
+
+PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+sys.path.insert(0, {backend!r})
+import src.main
+import_ms = (time.perf_counter() - t0) * 1000.0
+t1 = time.perf_counter()
+src.main.create_app()
+factory_ms = (time.perf_counter() - t1) * 1000.0
+print(json.dumps({{
+    'import_ms': import_ms,
+    'create_app_ms': factory_ms,
+    'heavy_modules_loaded': [m for m in {heavy!r} if m in sys.modules],
+}}))
+"""
+
+
+def run_probe():
+    code = PROBE.format(backend=BACKEND_DIR, heavy=HEAVY_MODULES)
+    result = subprocess.run([sys.executable, '-c', code], cwd=BACKEND_DIR,
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def top_imports(limit):
+    """Roda com -X importtime e retorna os módulos com maior tempo cumulativo."""
+    code = f'import sys; sys.path.insert(0, {BACKEND_DIR!r}); import src.main'
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=BACKEND_DIR,
+                            capture_output=True, text=True, check=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, self_us, cumulative_us, name = [part.strip() for part in line.replace('import time:', '|').split('|')]
+        rows.append({'module': name.strip(), 'self_us': int(self_us), 'cumulative_us': int(cumulative_us)})
+    rows.sort(key=lambda row: row['cumulative_us'], reverse=True)
+    return rows[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tempo de inicialização do backend')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--output', help='arquivo JSON de saída (padrão: stdout)')
+    args = parser.parse_args()
+
+    runs = [run_probe() for _ in range(args.runs)]
+    import_ms = [run['import_ms'] for run in runs]
+    results = {
+        'runs': args.runs,
+        'import_ms': {
+            'min': min(import_ms),
+            'median': statistics.median(import_ms),
+            'max': max(import_ms),
+        },
+        'create_app_ms_median': statistics.median(run['create_app_ms'] for run in runs),
+        'heavy_modules_loaded': runs[-1]['heavy_modules_loaded'],
+        'top_imports': top_imports(args.top),
+    }
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+"""
+Servidor HTTP local que imita a Steam (Store API, Web API e appreviews)
+a partir dos payloads gravados em benchmarks/fixtures.
+
+Uso isolado:
+    python benchmarks/stub_steam.py --port 8765 --latency-ms 80 --error-rate 0.05
+
+Depois aponte o backend para ele:
+    STEAM_STORE_BASE=http://127.0.0.1:8765 STEAM_API_BASE=http://127.0.0.1:8765 python src/main.py
+"""
+import argparse
+import copy
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, f'{name}.json'), encoding='utf-8') as f:
+        return json.load(f)
+
+
+class StubSteamServer:
+    """
+    Stub da Steam rodando numa thread.
+
+    latency_ms/jitter_ms: atraso aplicado a cada resposta.
+    error_rate: fração das requisições que recebem 500.
+    app_count: tamanho total do GetAppList (os apps gravados + apps sintéticos),
+    para que a busca linear no catálogo tenha um custo realista.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, latency_ms=0, jitter_ms=0,
+                 error_rate=0.0, app_count=150000, seed=1234):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.request_count = 0
+        self._count_lock = threading.Lock()
+        self._load_fixtures(app_count)
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def _load_fixtures(self, app_count):
+        app_list = load_fixture('GetAppList')
+        apps = app_list['applist']['apps']
+        for i in range(max(app_count - len(apps), 0)):
+            apps.append({'appid': 3000000 + i, 'name': f'Synthetic Game {i:06d}'})
+        self.app_names = {app['appid']: app['name'] for app in apps}
+        self.payloads = {
+            'applist': json.dumps(app_list).encode(),
+            'reviews': json.dumps(load_fixture('appreviews')).encode(),
+            'news': load_fixture('GetNewsForApp'),
+            'achievements': json.dumps(load_fixture('GetGlobalAchievementPercentagesForApp')).encode(),
+            'schema': json.dumps(load_fixture('GetSchemaForGame')).encode(),
+        }
+        details = load_fixture('appdetails')
+        self.details_template = next(iter(details.values()))
+
+    def _details_payload(self, app_id):
+        if app_id not in self.app_names:
+            return json.dumps({str(app_id): {'success': False}}).encode()
+        entry = copy.deepcopy(self.details_template)
+        entry['data']['steam_appid'] = app_id
+        entry['data']['name'] = self.app_names[app_id]
+        entry['data']['header_image'] = entry['data']['header_image'].replace('1091500', str(app_id))
+        return json.dumps({str(app_id): entry}).encode()
+
+    def _news_payload(self, app_id, count):
+        news = copy.deepcopy(self.payloads['news'])
+        news['appnews']['appid'] = app_id
+        news['appnews']['newsitems'] = news['appnews']['newsitems'][:count]
+        return json.dumps(news).encode()
+
+    def route(self, path, query):
+        """Retorna (status, corpo) para uma requisição ao stub."""
+        if path.endswith('/ISteamApps/GetAppList/v2/'):
+            return 200, self.payloads['applist']
+        if path.endswith('/api/appdetails'):
+            return 200, self._details_payload(int(query.get('appids', ['0'])[0]))
+        if path.startswith('/appreviews/'):
+            return 200, self.payloads['reviews']
+        if path.endswith('/ISteamNews/GetNewsForApp/v2/'):
+            app_id = int(query.get('appid', ['0'])[0])
+            return 200, self._news_payload(app_id, int(query.get('count', ['5'])[0]))
+        if path.endswith('/ISteamUserStats/GetGlobalAchievementPercentagesForApp/v2/'):
+            return 200, self.payloads['achievements']
+        if path.endswith('/ISteamUserStats/GetSchemaForGame/v2/'):
+            return 200, self.payloads['schema']
+        return 404, b'{}'
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                with server._count_lock:
+                    server.request_count += 1
+                    fail = server.random.random() < server.error_rate
+                    delay = server.latency_ms + server.random.uniform(0, server.jitter_ms)
+                if delay:
+                    time.sleep(delay / 1000.0)
+                if fail:
+                    status, body = 500, b'{"error": "injected"}'
+                else:
+                    parsed = urlparse(self.path)
+                    status, body = server.route(parsed.path, parse_qs(parsed.query))
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='stub-steam', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Servidor stub da Steam para benchmarks')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--jitter-ms', type=float, default=0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--app-count', type=int, default=150000)
+    args = parser.parse_args()
+
+    server = StubSteamServer(args.host, args.port, args.latency_ms, args.jitter_ms,
+                             args.error_rate, args.app_count)
+    print(f'Stub Steam em {server.base_url}')
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -3,47 +3,95 @@ import sys
 # DON'T CHANGE THIS !!!
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from flask import Flask, send_from_directory
+from flask import Flask, current_app, request
 from flask_cors import CORS
 from src.models.user import db
 from src.routes.user import user_bp
 from src.routes.steam import steam_bp
 from src.routes.system import system_bp  # Nova importação
+from src.routes.metrics import metrics_bp
+from src.routes.profiling import profiling_bp
+from src.routes.debug import debug_bp
+from src.utils import catalog_crawler, memory, metrics, profiling, telemetry
+from src.utils.static_assets import StaticAssets
 
-app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
-app.config['SECRET_KEY'] = 'asdf#FGSgvasgf$5$WGT'
 
-# Enable CORS for all routes
-CORS(app)
+def create_app(config=None):
+    """
+    Cria e configura o app Flask. Não toca no banco: o schema é criado por
+    init_db() (ou `flask --app src.main init-db`).
+    """
+    app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
+    app.config['SECRET_KEY'] = 'asdf#FGSgvasgf$5$WGT'
 
-app.register_blueprint(user_bp, url_prefix='/api')
-app.register_blueprint(steam_bp, url_prefix='/api/steam')
-app.register_blueprint(system_bp, url_prefix='/api/system')  # Novo blueprint
+    # uncomment if you need to use database
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(os.path.dirname(__file__), 'database', 'app.db')}"
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    if config:
+        app.config.update(config)
+
+    # Enable CORS for all routes
+    CORS(app)
+
+    app.register_blueprint(user_bp, url_prefix='/api')
+    app.register_blueprint(steam_bp, url_prefix='/api/steam')
+    # As bibliotecas de hardware do system_bp só carregam no primeiro uso
+    app.register_blueprint(system_bp, url_prefix='/api/system')  # Novo blueprint
+    app.register_blueprint(metrics_bp, url_prefix='/api')
+    app.register_blueprint(profiling_bp, url_prefix='/api')
+    app.register_blueprint(debug_bp, url_prefix='/api/debug')
+
+    # Latência e status de todas as rotas, exportados em /api/metrics
+    metrics.init_app(app)
+
+    # Profiling opcional por requisição (PROFILING_ENABLED, PROFILING_SAMPLE_RATE
+    # ou header X-Profile-Token); perfis listados em /api/profiles
+    profiling.init_app(app)
+
+    # Tamanho dos caches e tracemalloc em /api/debug/memory (DEBUG_TOKEN; TRACEMALLOC_FRAMES liga no startup)
+    memory.init_app(app)
+
+    # Sampler de CPU/RAM/GPU do /api/system/telemetry (TELEMETRY_ENABLED)
+    telemetry.init_app(app)
+
+    db.init_app(app)
+
+    # Comando `flask --app src.main crawl-catalog`; com CRAWLER_ENABLED=1 o
+    # crawler sobe na primeira requisição, em um processo só
+    catalog_crawler.init_app(app)
+
+    @app.cli.command('init-db')
+    def init_db_command():
+        """Cria as tabelas do banco."""
+        init_db(app)
+        print('Banco inicializado.')
+
+    # Manifesto do build do SPA, montado uma vez aqui e usado pelo serve()
+    app.extensions['static_assets'] = StaticAssets(app.static_folder)
+    app.add_url_rule('/', defaults={'path': ''}, view_func=serve)
+    app.add_url_rule('/<path:path>', view_func=serve)
+    return app
+
+
+def init_db(app):
+    """
+    Cria o schema do banco. Passo explícito de deploy, fora do import do app.
+    """
+    with app.app_context():
+        db.create_all()
 
-# uncomment if you need to use database
-app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(os.path.dirname(__file__), 'database', 'app.db')}"
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-db.init_app(app)
-with app.app_context():
-    db.create_all()
 
-@app.route('/', defaults={'path': ''})
-@app.route('/<path:path>')
 def serve(path):
-    static_folder_path = app.static_folder
-    if static_folder_path is None:
+    if current_app.static_folder is None:
             return "Static folder not configured", 404
 
-    if path != "" and os.path.exists(os.path.join(static_folder_path, path)):
-        return send_from_directory(static_folder_path, path)
-    else:
-        index_path = os.path.join(static_folder_path, 'index.html')
-        if os.path.exists(index_path):
-            return send_from_directory(static_folder_path, 'index.html')
-        else:
-            return "index.html not found", 404
+    # Caminhos desconhecidos caem no index.html (em memória) sem syscalls
+    return current_app.extensions['static_assets'].serve(path, request)
+
+
+app = create_app()
 
 
 if __name__ == '__main__':
+    init_db(app)
     app.run(host='0.0.0.0', port=5001, debug=True)
-
@@ -0,0 +1,56 @@
+from src.models.user import db
+
+class CatalogApp(db.Model):
+    """Dados compactos de um app da Steam, gravados pelo crawler do catálogo."""
+    __tablename__ = 'catalog_app'
+
+    appid = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(255), index=True)
+    success = db.Column(db.Boolean, nullable=False, default=False)
+    type = db.Column(db.String(20), index=True)
+    is_free = db.Column(db.Boolean, default=False)
+    price_cents = db.Column(db.Integer, index=True)
+    currency = db.Column(db.String(8))
+    windows = db.Column(db.Boolean, default=False, index=True)
+    mac = db.Column(db.Boolean, default=False, index=True)
+    linux = db.Column(db.Boolean, default=False, index=True)
+    release_date = db.Column(db.String(40))
+    release_year = db.Column(db.Integer, index=True)
+    coming_soon = db.Column(db.Boolean, default=False)
+    header_image = db.Column(db.String(512))
+    fetched_at = db.Column(db.DateTime, nullable=False, index=True)
+
+    genres = db.relationship('CatalogGenre', backref='app', lazy='selectin',
+                             cascade='all, delete-orphan')
+
+    def to_dict(self):
+        return {
+            'appid': self.appid,
+            'name': self.name,
+            'type': self.type,
+            'genres': [genre.genre for genre in self.genres],
+            'is_free': self.is_free,
+            'price': self.price_cents / 100.0 if self.price_cents is not None else None,
+            'currency': self.currency,
+            'platforms': {'windows': self.windows, 'mac': self.mac, 'linux': self.linux},
+            'release_date': self.release_date,
+            'release_year': self.release_year,
+            'coming_soon': self.coming_soon,
+            'header_image': self.header_image
+        }
+
+    def __repr__(self):
+        return f'<CatalogApp {self.appid} {self.name}>'
+
+class CatalogGenre(db.Model):
+    __tablename__ = 'catalog_genre'
+
+    appid = db.Column(db.Integer, db.ForeignKey('catalog_app.appid'), primary_key=True)
+    genre = db.Column(db.String(64), primary_key=True, index=True)
+
+class CrawlerState(db.Model):
+    """Checkpoint do crawler (chave/valor), para retomar depois de um restart."""
+    __tablename__ = 'crawler_state'
+
+    key = db.Column(db.String(64), primary_key=True)
+    value = db.Column(db.String(255))
@@ -0,0 +1,53 @@
+from flask import Blueprint, current_app, jsonify, request
+from src.utils import memory
+from src.utils.auth import endpoint_authorized
+
+debug_bp = Blueprint('debug', __name__)
+
+DEBUG_HEADER = 'X-Debug-Token'
+
+@debug_bp.route('/memory', methods=['GET'])
+def get_memory():
+    """
+    Memória do processo: RSS, entradas/bytes/taxa de acerto de cada cache e,
+    com o tracemalloc ligado, os maiores locais de alocação.
+    Parâmetros: top (padrão 20) e group_by (lineno, filename ou traceback).
+    """
+    if not endpoint_authorized(current_app.config, request, 'DEBUG', DEBUG_HEADER):
+        return jsonify({'error': 'Invalid debug token'}), 403
+    try:
+        top = min(max(int(request.args.get('top', 20)), 1), 200)
+    except ValueError as e:
+        return jsonify({'error': f'Invalid parameter: {str(e)}'}), 400
+    group_by = request.args.get('group_by', 'lineno')
+    if group_by not in memory.GROUP_BY:
+        return jsonify({'error': f'group_by must be one of {", ".join(memory.GROUP_BY)}'}), 400
+
+    report = memory.cache_report()
+    report.update({
+        'rss_bytes': memory.current_rss_bytes(),
+        'peak_rss_bytes': memory.peak_rss_bytes(),
+        'tracemalloc': memory.tracemalloc_report(top, group_by)
+    })
+    return jsonify(report)
+
+@debug_bp.route('/memory/tracemalloc', methods=['POST'])
+def toggle_tracemalloc():
+    """
+    Liga ou desliga o tracemalloc. Corpo: {"action": "start" | "stop", "frames": 1}.
+    """
+    if not endpoint_authorized(current_app.config, request, 'DEBUG', DEBUG_HEADER):
+        return jsonify({'error': 'Invalid debug token'}), 403
+    data = request.get_json(silent=True) or {}
+    action = data.get('action')
+    if action == 'start':
+        try:
+            frames = min(max(int(data.get('frames', 1)), 1), 50)
+        except (TypeError, ValueError) as e:
+            return jsonify({'error': f'Invalid parameter: {str(e)}'}), 400
+        memory.start_tracemalloc(frames)
+    elif action == 'stop':
+        memory.stop_tracemalloc()
+    else:
+        return jsonify({'error': 'Body field "action" must be "start" or "stop"'}), 400
+    return jsonify({'tracing': action == 'start'})
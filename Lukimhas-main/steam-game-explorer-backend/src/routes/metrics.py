@@ -0,0 +1,11 @@
+from flask import Blueprint, Response
+from src.utils.metrics import CONTENT_TYPE, REGISTRY
+
+metrics_bp = Blueprint('metrics', __name__)
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def get_metrics():
+    """
+    Exporta as métricas do processo no formato texto do Prometheus.
+    """
+    return Response(REGISTRY.render(), mimetype=None, content_type=CONTENT_TYPE)
@@ -0,0 +1,27 @@
+from flask import Blueprint, current_app, jsonify, request, send_from_directory
+from src.utils.auth import endpoint_authorized
+from src.utils.profiling import PROFILE_HEADER, list_profiles, profile_dir
+
+profiling_bp = Blueprint('profiling', __name__)
+
+@profiling_bp.route('/profiles', methods=['GET'])
+def get_profiles():
+    """
+    Lista os perfis gravados mais recentes.
+    """
+    if not endpoint_authorized(current_app.config, request, 'PROFILING', PROFILE_HEADER):
+        return jsonify({'error': 'Invalid profiling token'}), 403
+    try:
+        limit = min(int(request.args.get('limit', 20)), 200)
+    except ValueError as e:
+        return jsonify({'error': f'Invalid parameter: {str(e)}'}), 400
+    return jsonify({'profiles': list_profiles(current_app, limit)})
+
+@profiling_bp.route('/profiles/<path:filename>', methods=['GET'])
+def download_profile(filename):
+    """
+    Baixa um arquivo de perfil (.pstats, .collapsed ou .json).
+    """
+    if not endpoint_authorized(current_app.config, request, 'PROFILING', PROFILE_HEADER):
+        return jsonify({'error': 'Invalid profiling token'}), 403
+    return send_from_directory(profile_dir(current_app), filename, as_attachment=True)
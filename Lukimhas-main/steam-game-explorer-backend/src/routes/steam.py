@@ -1,87 +1,193 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, jsonify, request, send_file, url_for
 import requests
 import os
-from urllib.parse import quote
+from urllib.parse import quote, urlparse
 from functools import lru_cache
-from datetime import datetime, timedelta
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from streamlit_panel.utils import fetch_achievements
+from datetime import timedelta
+import asyncio
+import math
+import threading
+import time
+from concurrent.futures import TimeoutError as FuturesTimeoutError, as_completed, wait
+from sqlalchemy.exc import OperationalError
+from src.models.catalog import CatalogApp, CatalogGenre, CrawlerState
+from src.models.user import db
+from src.utils.achievement_stats import ACHIEVEMENT_AGGREGATES, RAREST_STORED, compare_aggregates
+from src.utils.cache import SWRCache
+from src.utils.catalog_crawler import CURSOR_KEY
+from src.utils.circuit_breaker import CircuitOpenError
+from src.utils.image_cache import get_image_cache
+from src.utils.outbound import get_engine
+from src.utils.requirements_matrix import REQUIREMENTS_MATRIX
+from src.utils.review_terms import AnalysisCapacityError, MAX_REVIEWS_LIMIT, get_or_start_analysis
+from src.utils.steam_client import (
+    REQUEST_TIMEOUT, STEAM_API_BASE, STEAM_STORE_BASE, call_steam, steam_get_json, steam_get_json_async
+)
 
 steam_bp = Blueprint('steam', __name__)
 
 # Steam API key - Quanto por em produ troca pra .env pelo amor de deus
 STEAM_API_KEY = os.environ.get('STEAM_API_KEY', '191216FAB4F49662CE0209FBF2A218FD')
 
-# Cache para a lista de apps
-_apps_cache = {
-    'data': None,
-    'timestamp': None
-}
-
 # Cache timeout de 1 hora
 CACHE_TIMEOUT = timedelta(hours=1)
 
+# Caches das chamadas à Steam. Depois do ttl a entrada ainda é servida
+# (marcada como stale) por stale_ttl enquanto é atualizada em segundo plano.
+# max_bytes é o orçamento de memória de cada um (CACHE_MAX_BYTES_<NOME> muda);
+# o uso real aparece em /api/debug/memory.
+MB = 1024 * 1024
+_apps_cache = SWRCache('apps_list', ttl=CACHE_TIMEOUT.total_seconds(),
+                       stale_ttl=timedelta(hours=24).total_seconds(), maxsize=1)
+_details_cache = SWRCache('app_details', ttl=timedelta(minutes=15).total_seconds(),
+                          stale_ttl=timedelta(hours=6).total_seconds(), maxsize=2000, max_bytes=64 * MB)
+_reviews_cache = SWRCache('reviews', ttl=timedelta(minutes=5).total_seconds(),
+                          stale_ttl=timedelta(hours=1).total_seconds(), maxsize=500, max_bytes=16 * MB)
+_news_cache = SWRCache('news', ttl=timedelta(minutes=15).total_seconds(),
+                       stale_ttl=timedelta(hours=6).total_seconds(), maxsize=500, max_bytes=8 * MB)
+_achievements_cache = SWRCache('achievements', ttl=CACHE_TIMEOUT.total_seconds(),
+                               stale_ttl=timedelta(hours=24).total_seconds(), maxsize=500, max_bytes=16 * MB)
+
+
+# Proxy de imagens: só hosts da CDN da Steam, para não virar um proxy aberto
+IMAGE_PROXY_ENABLED = os.environ.get('IMAGE_PROXY_ENABLED', '1') == '1'
+IMAGE_PROXY_HOSTS = tuple(
+    host.strip() for host in os.environ.get(
+        'IMAGE_PROXY_HOSTS', 'steamstatic.com,akamaihd.net,steampowered.com,steamusercontent.com'
+    ).split(',') if host.strip()
+)
+IMAGE_MAX_AGE = 365 * 24 * 60 * 60
+# Downloads da CDN têm um limite próprio: imagens lentas não ocupam as vagas
+# do motor de saída usadas pelas chamadas à API da Steam
+IMAGE_CONCURRENCY = int(os.environ.get('IMAGE_CONCURRENCY', 8))
+IMAGE_DOWNLOAD_TIMEOUT = 30
+_image_slots = threading.BoundedSemaphore(IMAGE_CONCURRENCY)
+
+
+def is_proxyable_image(url):
+    host = urlparse(url or '').hostname or ''
+    return any(host == allowed or host.endswith('.' + allowed) for allowed in IMAGE_PROXY_HOSTS)
+
+
+def proxy_image_url(url):
+    """Troca uma URL da CDN da Steam pela URL do proxy de imagens."""
+    if not IMAGE_PROXY_ENABLED or not is_proxyable_image(url):
+        return url
+    return url_for('steam.get_image', url=url, _external=True)
+
+
+def circuit_open_response(e):
+    """Resposta padrão quando o circuito de um endpoint da Steam está aberto."""
+    return jsonify({
+        'error': f'Steam API temporarily unavailable: {str(e)}',
+        'retry_after': round(e.retry_after)
+    }), 503, {'Retry-After': str(max(int(e.retry_after), 1))}
+
+
+def get_apps_list_cached():
+    """
+    Obtém a lista de apps da Steam com cache. Retorna (apps, stale).
+    """
+    def fetch():
+        app_list_url = f'{STEAM_API_BASE}/ISteamApps/GetAppList/v2/'
+        data = steam_get_json('webapi', app_list_url)
+        return data.get('applist', {}).get('apps', [])
+
+    return _apps_cache.get_or_fetch('apps', fetch)
+
 def get_apps_list():
     """
     Obtém a lista de apps da Steam com cache.
     """
-    global _apps_cache
-    
-    # Verifica se o cache é válido
-    if (_apps_cache['data'] is not None and 
-        _apps_cache['timestamp'] is not None and 
-        datetime.now() - _apps_cache['timestamp'] < CACHE_TIMEOUT):
-        return _apps_cache['data']
-    
-    # Se não houver cache válido, busca nova lista
-    app_list_url = 'https://api.steampowered.com/ISteamApps/GetAppList/v2/'
-    response = requests.get(app_list_url)
-    response.raise_for_status()
-    
-    data = response.json()
-    apps = data.get('applist', {}).get('apps', [])
-    
-    # Atualiza o cache
-    _apps_cache['data'] = apps
-    _apps_cache['timestamp'] = datetime.now()
-    
+    apps, _ = get_apps_list_cached()
     return apps
 
-def get_game_details_minimal(app_id):
+APP_DETAILS_URL = f'{STEAM_STORE_BASE}/api/appdetails'
+
+def _app_details_entry(app_id, data):
+    entry = data.get(str(app_id))
+    if entry and entry.get('success'):
+        # Pré-computa os requisitos numéricos usados por /api/system/playable
+        game_data = entry['data']
+        REQUIREMENTS_MATRIX.upsert(app_id, game_data.get('name'), game_data.get('pc_requirements'))
+    return entry
+
+def _fetch_app_details(app_id):
+    data = steam_get_json('store', APP_DETAILS_URL, params={'appids': app_id})
+    return _app_details_entry(app_id, data)
+
+async def _fetch_app_details_async(app_id):
+    data = await steam_get_json_async('store', APP_DETAILS_URL, params={'appids': app_id})
+    return _app_details_entry(app_id, data)
+
+def get_app_details_cached(app_id):
     """
-    Obtém apenas os detalhes mínimos necessários de um jogo.
+    Obtém a entrada de appdetails da Store API com cache. Retorna (entry, stale),
+    onde entry é o objeto {'success': ..., 'data': ...} da Steam ou None.
     """
-    try:
-        store_url = f'https://store.steampowered.com/api/appdetails?appids={app_id}'
-        response = requests.get(store_url)
-        response.raise_for_status()
-        
-        data = response.json()
+    return _details_cache.get_or_fetch(app_id, lambda: _fetch_app_details(app_id))
+
+async def get_app_details_async(app_id):
+    """Como get_app_details_cached(), no motor de saída (get_engine().submit)."""
+    return await _details_cache.get_or_fetch_async(app_id, lambda: _fetch_app_details_async(app_id))
+
+def _details_minimal(entry, stale):
+    """Só o que a busca usa de um jogo; None se o app não for um jogo."""
+    if (entry and 
+        entry['success'] and 
+        entry['data'].get('type') == 'game'):
         
-        if (str(app_id) in data and 
-            data[str(app_id)]['success'] and 
-            data[str(app_id)]['data'].get('type') == 'game'):
-            
-            return {
-                'header_image': data[str(app_id)]['data'].get('header_image')
-            }
-    except:
-        pass
+        return {
+            'header_image': entry['data'].get('header_image'),
+            'stale': stale
+        }
     return None
 
+async def _game_details_minimal_async(app_id):
+    return _details_minimal(*await get_app_details_async(app_id))
+
+def _submit_details_lookup(app_id):
+    return get_engine().submit(_game_details_minimal_async(app_id))
+
+# Orçamento de tempo da busca (parâmetro budget_ms)
+SEARCH_DEFAULT_BUDGET_MS = float(os.environ.get('SEARCH_BUDGET_MS', 2000))
+SEARCH_MAX_BUDGET_MS = 10000
+
+def _parse_budget_ms(value, maximum):
+    """Orçamento em ms entre 0 e `maximum`; ValueError se não for um número finito."""
+    budget = float(value)
+    if not math.isfinite(budget):
+        raise ValueError('budget_ms must be a finite number')
+    return min(max(budget, 0), maximum)
+
 @steam_bp.route('/games/search', methods=['GET'])
 def search_games():
     """
     Busca jogos na Steam por nome.
     Retorna uma lista apenas de jogos válidos que correspondem ao termo de busca.
+
+    Com budget_ms (padrão SEARCH_DEFAULT_BUDGET_MS) a resposta sai no prazo
+    com os jogos validados até ali e partial=true; os lookups pendentes
+    continuam no motor de saída e enchem o cache para a próxima busca.
+    Lookups que falharam também deixam partial=true (contados em `failed`);
+    se todos falharam com o circuito da Store aberto, responde 503.
     """
+    started = time.monotonic()
     query = request.args.get('q', '')
+    if any(name in request.args for name in CATALOG_FILTERS):
+        # Filtros só são respondidos pelo catálogo local, sem chamar a Steam
+        return search_catalog(query, request.args)
     if not query:
         return jsonify({'error': 'Query parameter "q" is required'}), 400
+    try:
+        budget_ms = _parse_budget_ms(request.args.get('budget_ms', SEARCH_DEFAULT_BUDGET_MS), SEARCH_MAX_BUDGET_MS)
+    except ValueError as e:
+        return jsonify({'error': f'Invalid parameter: {str(e)}'}), 400
+    deadline = started + budget_ms / 1000.0
     
     try:
         # Usa a função com cache
-        apps = get_apps_list()
+        apps, stale = get_apps_list_cached()
         query_lower = query.lower()
         
         # Otimiza a busca limitando desde o início
@@ -92,158 +198,365 @@ def search_games():
                 if len(matching_games) >= 50:  # Limita durante a busca
                     break
         
-        # Busca detalhes em paralelo
+        # Busca detalhes em paralelo, como corrotinas no motor de saída
+        # (o limite de concorrência com a Steam é global, OUTBOUND_CONCURRENCY)
         valid_games = []
-        max_workers = 10  # Limita o número de requisições paralelas
+        future_to_game = {
+            _submit_details_lookup(game['appid']): game 
+            for game in matching_games[:20]  # Limita a 20 jogos para detalhes
+        }
         
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_game = {
-                executor.submit(get_game_details_minimal, game['appid']): game 
-                for game in matching_games[:20]  # Limita a 20 jogos para detalhes
-            }
-            
-            for future in as_completed(future_to_game):
+        completed = 0
+        failed = 0
+        circuit_open = None
+        try:
+            for future in as_completed(future_to_game, timeout=max(deadline - time.monotonic(), 0)):
+                completed += 1
                 game = future_to_game[future]
                 try:
                     details = future.result()
                     if details:
-                        game['header_image'] = details.get('header_image')
+                        # Cópia: `game` é o dict da lista de apps em cache
+                        game = dict(game, header_image=proxy_image_url(details.get('header_image')))
+                        stale = stale or details.get('stale', False)
                         valid_games.append(game)
+                except CircuitOpenError as e:
+                    failed += 1
+                    circuit_open = e
+                    continue
                 except Exception:
+                    failed += 1
                     continue
                 
                 if len(valid_games) >= 20:
                     break
+        except FuturesTimeoutError:
+            # Prazo estourado: os lookups pendentes não são esperados
+            pass
+        pending = len(future_to_game) - completed
+
+        # Nenhum lookup deu certo por causa do circuito: não é "nenhum resultado"
+        if circuit_open is not None and not valid_games and failed == completed and pending == 0:
+            return circuit_open_response(circuit_open)
         
         return jsonify({
             'games': valid_games,
-            'total': len(valid_games)
+            'total': len(valid_games),
+            'stale': stale,
+            'partial': pending > 0 or failed > 0,
+            'pending': pending,
+            'failed': failed,
+            'budget_ms': budget_ms
         })
         
+    except CircuitOpenError as e:
+        return circuit_open_response(e)
     except requests.RequestException as e:
         return jsonify({'error': f'Failed to fetch data from Steam API: {str(e)}'}), 500
 
+CATALOG_FILTERS = ('type', 'genre', 'platform', 'max_price', 'free', 'released_after', 'released_before')
+CATALOG_PLATFORMS = {'windows': CatalogApp.windows, 'mac': CatalogApp.mac, 'linux': CatalogApp.linux}
+
+
+def search_catalog(query, args):
+    """
+    Busca no catálogo local (preenchido pelo crawler) com filtros:
+    type, genre, platform, max_price (na moeda da loja), free, released_after
+    e released_before (anos, inclusivos).
+    """
+    try:
+        filters = [CatalogApp.success.is_(True)]
+        if query:
+            # % e _ digitados pelo usuário são literais, não curingas
+            escaped = query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            filters.append(CatalogApp.name.ilike(f'%{escaped}%', escape='\\'))
+        if args.get('type'):
+            filters.append(CatalogApp.type == args['type'].lower())
+        if args.get('genre'):
+            filters.append(CatalogApp.genres.any(CatalogGenre.genre == args['genre'].strip().lower()))
+        if args.get('platform'):
+            platform = args['platform'].lower()
+            if platform not in CATALOG_PLATFORMS:
+                raise ValueError(f'platform must be one of {", ".join(CATALOG_PLATFORMS)}')
+            filters.append(CATALOG_PLATFORMS[platform].is_(True))
+        if args.get('max_price'):
+            max_price = float(args['max_price'])
+            if not math.isfinite(max_price):
+                raise ValueError('max_price must be a finite number')
+            filters.append(CatalogApp.price_cents <= round(max_price * 100))
+        if args.get('free'):
+            filters.append(CatalogApp.is_free.is_(args['free'].lower() in ('1', 'true', 'yes')))
+        if args.get('released_after'):
+            filters.append(CatalogApp.release_year >= int(args['released_after']))
+        if args.get('released_before'):
+            filters.append(CatalogApp.release_year <= int(args['released_before']))
+    except ValueError as e:
+        return jsonify({'error': f'Invalid filter: {str(e)}'}), 400
+
+    try:
+        rows = CatalogApp.query.filter(*filters).order_by(CatalogApp.name).limit(20).all()
+    except OperationalError:
+        return jsonify({'error': 'Catalog not initialized; run `flask --app src.main init-db` and the crawler'}), 503
+
+    games = []
+    for row in rows:
+        game = row.to_dict()
+        game['header_image'] = proxy_image_url(row.header_image)
+        games.append(game)
+    return jsonify({
+        'games': games,
+        'total': len(games),
+        'stale': False,
+        'source': 'catalog'
+    })
+
+@steam_bp.route('/catalog/status', methods=['GET'])
+def get_catalog_status():
+    """
+    Estado do catálogo local: quantos apps foram gravados e onde o crawler está.
+    """
+    try:
+        total = CatalogApp.query.count()
+        games = CatalogApp.query.filter(CatalogApp.success.is_(True), CatalogApp.type == 'game').count()
+        oldest = db.session.query(db.func.min(CatalogApp.fetched_at)).scalar()
+        state = db.session.get(CrawlerState, CURSOR_KEY)
+    except OperationalError:
+        return jsonify({'error': 'Catalog not initialized'}), 503
+
+    crawler = current_app.extensions.get('catalog_crawler')
+    return jsonify({
+        'apps': total,
+        'games': games,
+        'oldest_fetched_at': oldest.isoformat() if oldest else None,
+        'cursor': int(state.value) if state else 0,
+        'crawler': crawler.status() if crawler is not None else None
+    })
+
+def build_game_details(app_id, game_data, stale=False):
+    """
+    Monta o dict de detalhes de um jogo a partir do `data` do appdetails.
+    """
+    # Extraímos as informações relevantes
+    game_details = {
+        'app_id': app_id,
+        'name': game_data.get('name'),
+        'description': game_data.get('short_description'),
+        'detailed_description': game_data.get('detailed_description'),
+        'header_image': proxy_image_url(game_data.get('header_image')),
+        'website': game_data.get('website'),
+        'developers': game_data.get('developers', []),
+        'publishers': game_data.get('publishers', []),
+        'release_date': game_data.get('release_date', {}),
+        'genres': game_data.get('genres', []),
+        'categories': game_data.get('categories', []),
+        'screenshots': [
+            dict(shot,
+                 path_thumbnail=proxy_image_url(shot.get('path_thumbnail')),
+                 path_full=proxy_image_url(shot.get('path_full')))
+            for shot in game_data.get('screenshots', [])
+        ],
+        'movies': game_data.get('movies', []),
+        'price_overview': game_data.get('price_overview'),
+        'platforms': game_data.get('platforms'),
+        'metacritic': game_data.get('metacritic'),
+        'recommendations': game_data.get('recommendations'),
+        'stale': stale
+    }
+
+    # Adicionar processamento dos requisitos do sistema
+    if 'pc_requirements' in game_details:
+        # Processar requisitos mínimos
+        min_reqs = game_details['pc_requirements'].get('minimum', '')
+        # Processar requisitos recomendados se disponíveis
+        rec_reqs = game_details['pc_requirements'].get('recommended', '')
+
+        # Função para extrair informações específicas dos requisitos
+        def parse_requirements(req_text):
+            if not req_text:
+                return {
+                    'processor': 'Não especificado',
+                    'memory': 'Não especificado',
+                    'graphics': 'Não especificado',
+                    'os': 'Não especificado',
+                    'storage': 'Não especificado'
+                }
+
+            try:
+                # Remove tags HTML
+                clean_text = req_text.replace('<br>', '\n').replace('<strong>', '').replace('</strong>', '')
+                # Expressões regulares para extrair informações
+                import re
+
+                requirements = {
+                    'processor': 'Não especificado',
+                    'memory': 'Não especificado',
+                    'graphics': 'Não especificado',
+                    'os': 'Não especificado',
+                    'storage': 'Não especificado'
+                }
+
+                # CPU
+                cpu_pattern = r'Processor:?(.*?)(?:[\n\r]|Memory|RAM|$)'
+                cpu_match = re.search(cpu_pattern, clean_text, re.IGNORECASE | re.DOTALL)
+                if cpu_match:
+                    requirements['processor'] = cpu_match.group(1).strip()
+
+                # RAM
+                ram_pattern = r'Memory:?(.*?)(?:[\n\r]|Graphics|$)'
+                ram_match = re.search(ram_pattern, clean_text, re.IGNORECASE | re.DOTALL)
+                if ram_match:
+                    requirements['memory'] = ram_match.group(1).strip()
+
+                # GPU
+                gpu_pattern = r'Graphics:?(.*?)(?:[\n\r]|DirectX|Storage|$)'
+                gpu_match = re.search(gpu_pattern, clean_text, re.IGNORECASE | re.DOTALL)
+                if gpu_match:
+                    requirements['graphics'] = gpu_match.group(1).strip()
+
+                # Storage
+                storage_pattern = r'Storage:?(.*?)(?:[\n\r]|Additional|$)'
+                storage_match = re.search(storage_pattern, clean_text, re.IGNORECASE | re.DOTALL)
+                if storage_match:
+                    requirements['storage'] = storage_match.group(1).strip()
+
+                # OS
+                os_pattern = r'OS:?(.*?)(?:[\n\r]|Processor|$)'
+                os_match = re.search(os_pattern, clean_text, re.IGNORECASE | re.DOTALL)
+                if os_match:
+                    requirements['os'] = os_match.group(1).strip()
+
+                return requirements
+            except Exception as e:
+                print(f"Erro ao processar requisitos: {e}")
+                return {
+                    'processor': 'Não especificado',
+                    'memory': 'Não especificado',
+                    'graphics': 'Não especificado',
+                    'os': 'Não especificado',
+                    'storage': 'Não especificado'
+                }
+
+        game_details['pc_requirements'] = {
+            'minimum': parse_requirements(min_reqs),
+            'recommended': parse_requirements(rec_reqs)
+        }
+
+    return game_details
+
 @steam_bp.route('/games/<int:app_id>/details', methods=['GET'])
 def get_game_details(app_id):
     """
     Obtém detalhes de um jogo específico usando o app_id.
     """
     try:
-        # Obtemos informações básicas do jogo da Steam Store API
-        store_url = f'https://store.steampowered.com/api/appdetails?appids={app_id}'
-        response = requests.get(store_url)
-        response.raise_for_status()
+        # Obtemos informações básicas do jogo da Steam Store API (com cache)
+        entry, stale = get_app_details_cached(app_id)
         
-        data = response.json()
-        
-        if str(app_id) not in data or not data[str(app_id)]['success']:
+        if not entry or not entry['success']:
             return jsonify({'error': 'Game not found'}), 404
         
-        game_data = data[str(app_id)]['data']
+        game_data = entry['data']
         
-        # Extraímos as informações relevantes
-        game_details = {
-            'app_id': app_id,
-            'name': game_data.get('name'),
-            'description': game_data.get('short_description'),
-            'detailed_description': game_data.get('detailed_description'),
-            'header_image': game_data.get('header_image'),
-            'website': game_data.get('website'),
-            'developers': game_data.get('developers', []),
-            'publishers': game_data.get('publishers', []),
-            'release_date': game_data.get('release_date', {}),
-            'genres': game_data.get('genres', []),
-            'categories': game_data.get('categories', []),
-            'screenshots': game_data.get('screenshots', []),
-            'movies': game_data.get('movies', []),
-            'price_overview': game_data.get('price_overview'),
-            'platforms': game_data.get('platforms'),
-            'metacritic': game_data.get('metacritic'),
-            'recommendations': game_data.get('recommendations')
-        }
-        
-        # Adicionar processamento dos requisitos do sistema
-        if 'pc_requirements' in game_details:
-            # Processar requisitos mínimos
-            min_reqs = game_details['pc_requirements'].get('minimum', '')
-            # Processar requisitos recomendados se disponíveis
-            rec_reqs = game_details['pc_requirements'].get('recommended', '')
-            
-            # Função para extrair informações específicas dos requisitos
-            def parse_requirements(req_text):
-                if not req_text:
-                    return {
-                        'processor': 'Não especificado',
-                        'memory': 'Não especificado',
-                        'graphics': 'Não especificado',
-                        'os': 'Não especificado',
-                        'storage': 'Não especificado'
-                    }
-                
-                try:
-                    # Remove tags HTML
-                    clean_text = req_text.replace('<br>', '\n').replace('<strong>', '').replace('</strong>', '')
-                    # Expressões regulares para extrair informações
-                    import re
-                    
-                    requirements = {
-                        'processor': 'Não especificado',
-                        'memory': 'Não especificado',
-                        'graphics': 'Não especificado',
-                        'os': 'Não especificado',
-                        'storage': 'Não especificado'
-                    }
-                    
-                    # CPU
-                    cpu_pattern = r'Processor:?(.*?)(?:[\n\r]|Memory|RAM|$)'
-                    cpu_match = re.search(cpu_pattern, clean_text, re.IGNORECASE | re.DOTALL)
-                    if cpu_match:
-                        requirements['processor'] = cpu_match.group(1).strip()
-
-                    # RAM
-                    ram_pattern = r'Memory:?(.*?)(?:[\n\r]|Graphics|$)'
-                    ram_match = re.search(ram_pattern, clean_text, re.IGNORECASE | re.DOTALL)
-                    if ram_match:
-                        requirements['memory'] = ram_match.group(1).strip()
-
-                    # GPU
-                    gpu_pattern = r'Graphics:?(.*?)(?:[\n\r]|DirectX|Storage|$)'
-                    gpu_match = re.search(gpu_pattern, clean_text, re.IGNORECASE | re.DOTALL)
-                    if gpu_match:
-                        requirements['graphics'] = gpu_match.group(1).strip()
-
-                    # Storage
-                    storage_pattern = r'Storage:?(.*?)(?:[\n\r]|Additional|$)'
-                    storage_match = re.search(storage_pattern, clean_text, re.IGNORECASE | re.DOTALL)
-                    if storage_match:
-                        requirements['storage'] = storage_match.group(1).strip()
-
-                    # OS
-                    os_pattern = r'OS:?(.*?)(?:[\n\r]|Processor|$)'
-                    os_match = re.search(os_pattern, clean_text, re.IGNORECASE | re.DOTALL)
-                    if os_match:
-                        requirements['os'] = os_match.group(1).strip()
-
-                    return requirements
-                except Exception as e:
-                    print(f"Erro ao processar requisitos: {e}")
-                    return {
-                        'processor': 'Não especificado',
-                        'memory': 'Não especificado',
-                        'graphics': 'Não especificado',
-                        'os': 'Não especificado',
-                        'storage': 'Não especificado'
-                    }
-            
-            game_details['pc_requirements'] = {
-                'minimum': parse_requirements(min_reqs),
-                'recommended': parse_requirements(rec_reqs)
-            }
+        game_details = build_game_details(app_id, game_data, stale)
         
         return jsonify(game_details)
+    except CircuitOpenError as e:
+        return circuit_open_response(e)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# Limites do /games/details:batch
+BATCH_MAX_APPIDS = 50
+BATCH_DEFAULT_BUDGET_MS = 3000
+BATCH_MAX_BUDGET_MS = 10000
+
+def _batch_item(app_id, entry, stale, fields):
+    if not entry or not entry.get('success'):
+        return {'app_id': app_id, 'status': 'not_found'}
+    details = build_game_details(app_id, entry['data'], stale)
+    if fields:
+        details = {field: details.get(field) for field in fields}
+    return {'app_id': app_id, 'status': 'ok', 'stale': stale, 'data': details}
+
+@steam_bp.route('/games/details:batch', methods=['POST'])
+def get_game_details_batch():
+    """
+    Detalhes de vários jogos numa requisição só.
+
+    Corpo: {"appids": [...], "fields": [...] (opcional), "budget_ms": 3000 (opcional)}.
+    Entradas em cache saem na hora; as demais são buscadas em paralelo até
+    o orçamento de tempo acabar. Cada item tem seu próprio status, então um
+    appid lento ou inexistente não derruba o lote.
+    """
+    data = request.get_json(silent=True)
+    if data is None:
+        data = {}
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Body must be a JSON object'}), 400
+    if not isinstance(data.get('appids', []), list):
+        return jsonify({'error': 'Body field "appids" must be a list'}), 400
+    try:
+        appids = list(dict.fromkeys(int(appid) for appid in data.get('appids') or []))
+        fields = data.get('fields')
+        budget_ms = _parse_budget_ms(data.get('budget_ms', BATCH_DEFAULT_BUDGET_MS), BATCH_MAX_BUDGET_MS)
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': f'Invalid parameter: {str(e)}'}), 400
+    if not appids:
+        return jsonify({'error': 'Body field "appids" is required'}), 400
+    if len(appids) > BATCH_MAX_APPIDS:
+        return jsonify({'error': f'At most {BATCH_MAX_APPIDS} appids per batch'}), 400
+    if fields is not None:
+        if not isinstance(fields, list) or not all(isinstance(field, str) for field in fields):
+            return jsonify({'error': 'Body field "fields" must be a list of strings'}), 400
+        unknown = set(fields) - set(build_game_details(0, {}).keys())
+        if unknown:
+            return jsonify({'error': f'Unknown fields: {sorted(unknown)}'}), 400
+
+    engine = get_engine()
+    results = {}
+    misses = []
+    for app_id in appids:
+        entry, stale = _details_cache.peek(app_id)
+        if stale is None:
+            misses.append(app_id)
+            continue
+        if stale:
+            # Revalida no motor de saída: vira uma task no loop, não uma thread por appid
+            engine.submit(get_app_details_async(app_id))
+        results[app_id] = _batch_item(app_id, entry, stale, fields)
+
+    timed_out = []
+    if misses:
+        futures = {
+            engine.submit(get_app_details_async(app_id)): app_id
+            for app_id in misses
+        }
+        # Não espera os pendentes: as corrotinas terminam e enchem o cache
+        done, pending = wait(futures, timeout=budget_ms / 1000.0)
+        for future in done:
+            app_id = futures[future]
+            try:
+                entry, stale = future.result()
+                results[app_id] = _batch_item(app_id, entry, stale, fields)
+            except CircuitOpenError as e:
+                results[app_id] = {'app_id': app_id, 'status': 'unavailable', 'error': str(e)}
+            except Exception as e:
+                results[app_id] = {'app_id': app_id, 'status': 'error', 'error': str(e)}
+        for future in pending:
+            app_id = futures[future]
+            timed_out.append(app_id)
+            results[app_id] = {'app_id': app_id, 'status': 'timeout'}
+
+    items = [results[app_id] for app_id in appids]
+    return jsonify({
+        'results': items,
+        'total': len(items),
+        'from_cache': len(appids) - len(misses),
+        'fetched': len(misses) - len(timed_out),
+        'partial': any(item['status'] != 'ok' for item in items),
+        'stale': any(item.get('stale') for item in items)
+    })
+
 @steam_bp.route('/games/<int:app_id>/reviews', methods=['GET'])
 def get_game_reviews(app_id):
     """
@@ -258,7 +571,7 @@ def get_game_reviews(app_id):
         cursor = request.args.get('cursor', '*')
         
         # URL da API de reviews da Steam
-        reviews_url = f'https://store.steampowered.com/appreviews/{app_id}'
+        reviews_url = f'{STEAM_STORE_BASE}/appreviews/{app_id}'
         params = {
             'json': 1,
             'filter': filter_type,
@@ -268,10 +581,10 @@ def get_game_reviews(app_id):
             'cursor': cursor
         }
         
-        response = requests.get(reviews_url, params=params)
-        response.raise_for_status()
-        
-        data = response.json()
+        cache_key = (app_id, filter_type, language, review_type, num_per_page, cursor)
+        data, stale = _reviews_cache.get_or_fetch(
+            cache_key, lambda: steam_get_json('reviews', reviews_url, params=params)
+        )
         
         if not data.get('success'):
             return jsonify({'error': 'Failed to fetch reviews'}), 404
@@ -280,7 +593,8 @@ def get_game_reviews(app_id):
         reviews_data = {
             'query_summary': data.get('query_summary', {}),
             'reviews': [],
-            'cursor': data.get('cursor')
+            'cursor': data.get('cursor'),
+            'stale': stale
         }
         
         for review in data.get('reviews', []):
@@ -312,19 +626,155 @@ def get_game_reviews(app_id):
         
         return jsonify(reviews_data)
         
+    except CircuitOpenError as e:
+        return circuit_open_response(e)
     except requests.RequestException as e:
         return jsonify({'error': f'Failed to fetch reviews from Steam API: {str(e)}'}), 500
     except ValueError as e:
         return jsonify({'error': f'Invalid parameter: {str(e)}'}), 400
 
+@steam_bp.route('/games/<int:app_id>/reviews/terms', methods=['GET'])
+def get_review_terms(app_id):
+    """
+    Termos e bigramas mais citados nas reviews positivas e negativas.
+
+    A primeira chamada inicia a leitura das reviews em segundo plano e já
+    responde (202) com o que foi contado até agora; as seguintes retornam o
+    resultado atualizado, com partial=false quando terminar.
+    Parâmetros: language (padrão english), max_reviews (arredondado para
+    100, 500, 1000, 2000, 5000, 10000 ou 20000), top e restart=1.
+    Com muitas leituras rodando ao mesmo tempo responde 429.
+    """
+    try:
+        language = request.args.get('language', 'english').lower()
+        max_reviews = min(max(int(request.args.get('max_reviews', 2000)), 1), MAX_REVIEWS_LIMIT)
+        top = min(max(int(request.args.get('top', 20)), 1), 100)
+        restart = request.args.get('restart') == '1'
+        analysis = get_or_start_analysis(app_id, language, max_reviews, restart=restart)
+    except ValueError as e:
+        return jsonify({'error': f'Invalid parameter: {str(e)}'}), 400
+    except AnalysisCapacityError as e:
+        return jsonify({'error': str(e), 'retry_after': e.retry_after}), 429, {'Retry-After': str(e.retry_after)}
+
+    result = analysis.snapshot(top)
+    return jsonify(result), 202 if result['status'] == 'running' else 200
+
 @steam_bp.route('/games/<int:app_id>/stats', methods=['GET'])
 def get_game_stats(app_id):
     try:
-        achievements = fetch_achievements(app_id)
-        return jsonify({"achievements": achievements})
+        achievements, stale = _get_achievements(app_id)
+        return jsonify({"achievements": achievements, "stale": stale})
+    except CircuitOpenError as e:
+        return circuit_open_response(e)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+# Limites do /games/achievements/analytics; cada jogo fora do cache custa
+# duas chamadas à Web API (porcentagens e schema)
+ANALYTICS_MAX_APPIDS = 50
+ACHIEVEMENTS_FETCH_BUDGET = 10
+
+ACHIEVEMENT_PERCENTAGES_URL = f'{STEAM_API_BASE}/ISteamUserStats/GetGlobalAchievementPercentagesForApp/v2/'
+GAME_SCHEMA_URL = f'{STEAM_API_BASE}/ISteamUserStats/GetSchemaForGame/v2/'
+
+async def _fetch_achievements_async(app_id):
+    """Percentuais globais e schema (nomes e ícones) buscados em paralelo."""
+    from streamlit_panel.utils import merge_achievements
+
+    async def fetch_schema():
+        try:
+            return await steam_get_json_async('webapi', GAME_SCHEMA_URL,
+                                              params={'key': STEAM_API_KEY, 'appid': app_id})
+        except requests.RequestException:
+            # Sem schema as conquistas saem só com o nome interno
+            return {}
+
+    percentages, schema = await asyncio.gather(
+        steam_get_json_async('webapi', ACHIEVEMENT_PERCENTAGES_URL, params={'gameid': app_id}),
+        fetch_schema()
+    )
+    return merge_achievements(percentages, schema)
+
+async def _get_achievements_async(app_id):
+    return await _achievements_cache.get_or_fetch_async(app_id, lambda: _fetch_achievements_async(app_id))
+
+def _get_achievements(app_id):
+    return get_engine().run(_get_achievements_async(app_id))
+
+async def _get_achievements_versioned_async(app_id):
+    """
+    Como _get_achievements_async(), mais a versão da entrada no cache. As
+    atualizações do cache também rodam no loop, então a versão lida logo
+    depois do await é a da lista retornada.
+    """
+    achievements, stale = await _get_achievements_async(app_id)
+    return achievements, stale, _achievements_cache.version(app_id)
+
+@steam_bp.route('/games/achievements/analytics', methods=['GET'])
+def get_achievement_analytics():
+    """
+    Raridade das conquistas de um ou mais jogos (?appids=1,2,3): faixas de
+    raridade, percentis, índice de dificuldade (0-100), as conquistas mais
+    raras e a comparação entre os jogos. Usa as porcentagens em cache e só
+    busca na Steam até ACHIEVEMENTS_FETCH_BUDGET jogos que faltam.
+    """
+    try:
+        appids = list(dict.fromkeys(
+            int(appid) for appid in request.args.get('appids', '').split(',') if appid.strip()
+        ))
+        top = min(max(int(request.args.get('top', 5)), 0), RAREST_STORED)
+        fetch_missing = request.args.get('fetch_missing', '1') != '0'
+    except ValueError as e:
+        return jsonify({'error': f'Invalid parameter: {str(e)}'}), 400
+    if not appids:
+        return jsonify({'error': 'Query parameter "appids" is required'}), 400
+    if len(appids) > ANALYTICS_MAX_APPIDS:
+        return jsonify({'error': f'At most {ANALYTICS_MAX_APPIDS} appids per request'}), 400
+
+    engine = get_engine()
+    games, stale, missing, errors = [], False, [], {}
+    to_fetch = []
+    for appid in appids:
+        if _achievements_cache.peek(appid)[0] is not None:
+            # Em cache: get_or_fetch responde na hora (e revalida se estiver velho)
+            achievements, entry_stale, version = engine.run(_get_achievements_versioned_async(appid))
+            games.append((appid, version, achievements))
+            stale = stale or entry_stale
+        elif fetch_missing and len(to_fetch) < ACHIEVEMENTS_FETCH_BUDGET:
+            to_fetch.append(appid)
+        else:
+            missing.append(appid)
+
+    if to_fetch:
+        futures = {engine.submit(_get_achievements_versioned_async(appid)): appid for appid in to_fetch}
+        for future in as_completed(futures):
+            appid = futures[future]
+            try:
+                achievements, entry_stale, version = future.result()
+                games.append((appid, version, achievements))
+                stale = stale or entry_stale
+            except CircuitOpenError:
+                errors[appid] = 'unavailable'
+            except Exception as e:
+                errors[appid] = str(e)
+
+    aggregates = ACHIEVEMENT_AGGREGATES.get_many(games)
+    results = []
+    for appid in appids:
+        if appid in aggregates:
+            game = dict(aggregates[appid])
+            game['rarest'] = game['rarest'][:top]
+            results.append(game)
+
+    return jsonify({
+        'games': results,
+        'comparison': compare_aggregates(results),
+        'no_achievements': [appid for appid, _, achievements in games if not achievements],
+        'missing': missing,
+        'errors': {str(appid): error for appid, error in errors.items()},
+        'stale': stale
+    })
+
 @steam_bp.route('/games/<int:app_id>/news', methods=['GET'])
 def get_game_news(app_id):
     """
@@ -333,7 +783,7 @@ def get_game_news(app_id):
     try:
         count = min(int(request.args.get('count', 5)), 20)
         
-        news_url = f'https://api.steampowered.com/ISteamNews/GetNewsForApp/v2/'
+        news_url = f'{STEAM_API_BASE}/ISteamNews/GetNewsForApp/v2/'
         params = {
             'appid': app_id,
             'count': count,
@@ -341,10 +791,9 @@ def get_game_news(app_id):
             'format': 'json'
         }
         
-        response = requests.get(news_url, params=params)
-        response.raise_for_status()
-        
-        data = response.json()
+        data, stale = _news_cache.get_or_fetch(
+            (app_id, count), lambda: steam_get_json('webapi', news_url, params=params)
+        )
         
         news_items = []
         for item in data.get('appnews', {}).get('newsitems', []):
@@ -363,11 +812,83 @@ def get_game_news(app_id):
         
         return jsonify({
             'app_id': app_id,
-            'news': news_items
+            'news': news_items,
+            'stale': stale
         })
         
+    except CircuitOpenError as e:
+        return circuit_open_response(e)
     except requests.RequestException as e:
         return jsonify({'error': f'Failed to fetch news from Steam API: {str(e)}'}), 500
     except ValueError as e:
         return jsonify({'error': f'Invalid parameter: {str(e)}'}), 400
 
+def _send_cached_image(image):
+    response = send_file(image.path, mimetype=image.mimetype, etag=image.etag,
+                         max_age=IMAGE_MAX_AGE, conditional=True)
+    response.cache_control.immutable = True
+    response.cache_control.public = True
+    return response
+
+def _download_image(cache, url):
+    """
+    Baixa a imagem inteira para o cache em disco e retorna o CachedImage.
+    Levanta ValueError se a resposta não for uma imagem ou for grande demais.
+    """
+    def open_upstream():
+        upstream = requests.get(url, stream=True, timeout=REQUEST_TIMEOUT)
+        upstream.raise_for_status()
+        return upstream
+
+    upstream = call_steam('cdn', open_upstream)
+    try:
+        mimetype = upstream.headers.get('Content-Type', 'application/octet-stream').split(';')[0]
+        if not mimetype.startswith('image/'):
+            raise ValueError('Upstream did not return an image')
+        deadline = time.monotonic() + IMAGE_DOWNLOAD_TIMEOUT
+
+        def chunks():
+            # O timeout do requests vale por leitura; este limita o download inteiro
+            for chunk in upstream.iter_content(chunk_size=64 * 1024):
+                if time.monotonic() > deadline:
+                    raise requests.Timeout(f'Image download took longer than {IMAGE_DOWNLOAD_TIMEOUT}s')
+                yield chunk
+
+        image = cache.store(url, mimetype, chunks())
+        if image is None:
+            raise ValueError('Upstream image is too large')
+        return image
+    finally:
+        upstream.close()
+
+@steam_bp.route('/images', methods=['GET'])
+def get_image():
+    """
+    Proxy com cache em disco para imagens da CDN da Steam.
+    Na primeira vez a imagem é baixada inteira para o disco (com vaga em
+    _image_slots, não no motor de saída) e só então enviada; o envio ao
+    cliente não ocupa vaga nenhuma.
+    """
+    url = request.args.get('url', '')
+    if not is_proxyable_image(url):
+        return jsonify({'error': 'Parameter "url" must be a Steam CDN image URL'}), 400
+
+    cache = get_image_cache()
+    image = cache.get(url)
+    if image is not None:
+        return _send_cached_image(image)
+
+    if not _image_slots.acquire(timeout=REQUEST_TIMEOUT):
+        return jsonify({'error': 'Too many image downloads in progress'}), 503, {'Retry-After': '1'}
+    try:
+        image = _download_image(cache, url)
+    except CircuitOpenError as e:
+        return circuit_open_response(e)
+    except requests.HTTPError as e:
+        status = e.response.status_code if e.response is not None else 502
+        return jsonify({'error': f'Failed to fetch image: {str(e)}'}), 404 if status == 404 else 502
+    except (requests.RequestException, ValueError) as e:
+        return jsonify({'error': f'Failed to fetch image: {str(e)}'}), 502
+    finally:
+        _image_slots.release()
+    return _send_cached_image(image)
@@ -1,15 +1,66 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, current_app, jsonify, request
+from functools import lru_cache
+from concurrent.futures import wait
 import platform
-import psutil
-import cpuinfo
-import GPUtil
+import threading
+import time
 import traceback
 import subprocess
 import json
 import re
+import numpy as np
+from src.routes.steam import get_app_details_async
+from src.utils.outbound import get_engine
+from src.utils.requirements_matrix import (
+    COLUMNS, COMPONENTS, REQUIREMENTS_MATRIX, profile_from_specs, score_profile
+)
 
 system_bp = Blueprint('system', __name__)
 
+# Máximo de appdetails buscados na Steam por chamada ao /playable, e quanto
+# tempo esperar por eles; os que passarem do prazo continuam no motor de
+# saída e entram na matriz para a próxima chamada
+PLAYABLE_FETCH_BUDGET = 20
+PLAYABLE_FETCH_TIMEOUT = 3.0
+PLAYABLE_MAX_LIMIT = 1000
+
+# psutil, cpuinfo e GPUtil são pesados de importar; só carregam no primeiro
+# uso do system_bp (ou de quem chamar load_hardware_libs())
+psutil = None
+cpuinfo = None
+GPUtil = None
+_hardware_libs_lock = threading.Lock()
+
+def load_hardware_libs():
+    """Importa as bibliotecas de inspeção de hardware uma única vez."""
+    global psutil, cpuinfo, GPUtil
+    if psutil is not None:
+        return
+    with _hardware_libs_lock:
+        if psutil is not None:
+            return
+        import cpuinfo as _cpuinfo
+        try:
+            import GPUtil as _GPUtil
+        except ImportError:
+            _GPUtil = None
+        import psutil as _psutil
+        cpuinfo, GPUtil = _cpuinfo, _GPUtil
+        psutil = _psutil
+
+@system_bp.before_request
+def _ensure_hardware_libs():
+    load_hardware_libs()
+
+@lru_cache(maxsize=1)
+def probe_cpuinfo():
+    """
+    cpuinfo.get_cpu_info() leva ~1s e o resultado não muda com o processo
+    rodando, então só a primeira chamada paga o custo.
+    """
+    load_hardware_libs()
+    return cpuinfo.get_cpu_info()
+
 @system_bp.route('/specs', methods=['GET'])
 def get_system_specs():
     try:
@@ -42,7 +93,7 @@ def get_os_info():
 
 def get_cpu_info():
     try:
-        info = cpuinfo.get_cpu_info()
+        info = probe_cpuinfo()
         return {
             "brand": info.get("brand_raw", "Não detectado"),
             "cores_physical": psutil.cpu_count(logical=False),
@@ -149,6 +200,147 @@ def get_gpu_info():
     
     return {"error": "Nenhuma GPU detectada por nenhum método"}
 
+@system_bp.route('/telemetry', methods=['GET'])
+def get_telemetry():
+    """
+    Série temporal de uso de CPU, RAM e GPU gravada pelo sampler em segundo plano.
+
+    Parâmetros: since (timestamp; retorna só amostras mais novas), window
+    (segundos, se since não vier), buckets (máximo de pontos, com min/max/média
+    por bucket) e per_core=1. Responde 503 se o sampler não foi ligado
+    (TELEMETRY_ENABLED).
+    """
+    sampler = current_app.extensions.get('telemetry')
+    if sampler is None:
+        return jsonify({'error': 'Telemetry is disabled; set TELEMETRY_ENABLED=1', 'status': 'error'}), 503
+
+    try:
+        since = request.args.get('since', type=float)
+        window = request.args.get('window', 300, type=float)
+        buckets = request.args.get('buckets', type=int)
+        per_core = request.args.get('per_core', '0') in ('1', 'true')
+        if buckets is not None and buckets < 1:
+            return jsonify({'error': 'buckets must be >= 1'}), 400
+
+        data = sampler.window(
+            since=since,
+            seconds=None if since is not None else window,
+            buckets=buckets,
+            per_core=per_core
+        )
+        data['status'] = 'success'
+        return jsonify(data)
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'error': str(e)
+        }), 500
+
+@lru_cache(maxsize=1)
+def server_spec_profile():
+    """
+    Perfil numérico do hardware deste servidor para /playable. O hardware não
+    muda com o processo rodando, então a sondagem roda uma vez só.
+    """
+    from src.utils.requirements_matrix import cpu_tier, gpu_tier
+
+    ram = get_ram_info()
+    cpu = get_cpu_brand()
+    gpu = get_gpu_info()
+    try:
+        storage_gb = psutil.disk_usage('/').free / (1024.0 ** 3)
+    except Exception:
+        storage_gb = None
+    return {
+        'ram_gb': ram['raw']['total_gb'] if 'raw' in ram else None,
+        'storage_gb': round(storage_gb, 2) if storage_gb is not None else None,
+        'cpu': cpu,
+        'gpu': gpu.get('name'),
+        'cpu_tier': cpu_tier(cpu),
+        'gpu_tier': gpu_tier(gpu.get('name'))
+    }
+
+def get_cpu_brand():
+    try:
+        return probe_cpuinfo().get('brand_raw')
+    except Exception:
+        return None
+
+@system_bp.route('/playable', methods=['POST'])
+def get_playable_games():
+    """
+    Ordena jogos pela compatibilidade com um perfil de hardware.
+
+    Corpo (tudo opcional): profile ({ram_gb, storage_gb, cpu, gpu} ou
+    cpu_tier/gpu_tier; sem ele usa o hardware do servidor), appids (sem ele
+    usa todos os jogos já vistos), limit e fetch_missing.
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        limit = min(max(int(data.get('limit', 50)), 1), PLAYABLE_MAX_LIMIT)
+        appids = data.get('appids')
+        if appids is not None:
+            if not isinstance(appids, list):
+                raise TypeError('appids must be a list')
+            appids = [int(appid) for appid in appids]
+        client_profile = profile_from_specs(data['profile']) if data.get('profile') else None
+    except (AttributeError, TypeError, ValueError) as e:
+        return jsonify({'error': f'Invalid parameter: {str(e)}', 'status': 'error'}), 400
+
+    try:
+        if client_profile is not None:
+            profile_source = 'client'
+            profile = client_profile
+        else:
+            profile_source = 'server'
+            profile = profile_from_specs(server_spec_profile())
+
+        # Jogos pedidos que ainda não estão na matriz: busca alguns na Store API
+        if appids is not None and data.get('fetch_missing', True):
+            missing = [appid for appid in appids if appid not in REQUIREMENTS_MATRIX][:PLAYABLE_FETCH_BUDGET]
+            if missing:
+                # Falhas só deixam o jogo de fora (vai em `missing`)
+                engine = get_engine()
+                wait([engine.submit(get_app_details_async(appid)) for appid in missing],
+                     timeout=PLAYABLE_FETCH_TIMEOUT)
+
+        start = time.perf_counter()
+        ids, names, values, missing = REQUIREMENTS_MATRIX.snapshot(appids)
+        meets_min, meets_rec, score, known, order, ok_min, ok_rec = score_profile(profile, ids, values)
+        scoring_ms = (time.perf_counter() - start) * 1000.0
+
+        def number(value):
+            return None if np.isnan(value) else round(float(value), 2)
+
+        games = []
+        for row in order[:limit]:
+            games.append({
+                'app_id': int(ids[row]),
+                'name': names[row],
+                'meets_minimum': bool(meets_min[row]),
+                'meets_recommended': bool(meets_rec[row]),
+                'compatibility_percentage': number(score[row]),
+                'known_checks': int(known[row]),
+                'failing_minimum': [c for i, c in enumerate(COMPONENTS) if not ok_min[row, i]],
+                'requirements': {column: number(values[row, i]) for i, column in enumerate(COLUMNS)}
+            })
+
+        return jsonify({
+            'profile': {key: number(value) for key, value in profile.items()},
+            'profile_source': profile_source,
+            'games': games,
+            'total': len(ids),
+            'missing': missing,
+            'scoring_ms': round(scoring_ms, 3),
+            'status': 'success'
+        })
+
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
 @system_bp.route('/compare', methods=['POST'])
 def compare_specs():
     """
@@ -362,7 +554,7 @@ def test_os():
 
 def test_cpu():
     try:
-        return cpuinfo.get_cpu_info()["brand_raw"]
+        return probe_cpuinfo()["brand_raw"]
     except:
         return "Erro na CPU"
 
@@ -0,0 +1,181 @@
+"""
+Estatísticas de raridade de conquistas, calculadas com NumPy.
+
+As porcentagens globais (já em cache em _achievements_cache) de vários jogos
+são concatenadas num único vetor, com um índice de jogo por conquista. Todas
+as métricas por jogo saem de bincount/lexsort sobre esse vetor, sem laço por
+conquista. Os agregados de cada jogo ficam guardados até a lista de
+conquistas do cache ser trocada por uma nova.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# Faixas de raridade, em % de jogadores que desbloquearam a conquista
+BUCKET_EDGES = (1.0, 5.0, 10.0, 25.0, 50.0)
+BUCKET_LABELS = ('ultra_rare', 'very_rare', 'rare', 'uncommon', 'common', 'very_common')
+PERCENTILES = (10, 25, 50, 75, 90)
+
+# Conquistas mais raras guardadas por jogo
+RAREST_STORED = 10
+
+# Abaixo de 0,01% a Steam arredonda; -log10(0,01%) = 4 vira dificuldade 100
+MIN_PERCENT = 0.01
+_LOG_RANGE = np.log10(100.0 / MIN_PERCENT)
+
+
+def _percents(achievements):
+    return np.fromiter((a.get('percent') or 0.0 for a in achievements), dtype=np.float64, count=len(achievements))
+
+
+def compute_aggregates(games):
+    """
+    Calcula os agregados de vários jogos de uma vez.
+
+    `games` é uma lista de (appid, achievements), com achievements no formato
+    de fetch_achievements. Retorna {appid: agregados}.
+    """
+    games = [(appid, achievements) for appid, achievements in games if achievements]
+    if not games:
+        return {}
+
+    counts = np.array([len(achievements) for _, achievements in games])
+    n_games = len(games)
+    percent = np.clip(np.concatenate([_percents(a) for _, a in games]), 0.0, 100.0)
+    game = np.repeat(np.arange(n_games), counts)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    mean = np.bincount(game, weights=percent, minlength=n_games) / counts
+
+    # Índice de dificuldade: média de -log10(p) normalizada para 0..100,
+    # então uma conquista de 0,1% pesa três vezes uma de 10%
+    rarity = np.log10(100.0 / np.maximum(percent, MIN_PERCENT)) / _LOG_RANGE * 100.0
+    difficulty = np.bincount(game, weights=rarity, minlength=n_games) / counts
+
+    bucket = np.digitize(percent, BUCKET_EDGES)
+    n_buckets = len(BUCKET_LABELS)
+    histogram = np.bincount(game * n_buckets + bucket, minlength=n_games * n_buckets).reshape(n_games, n_buckets)
+
+    # Ordena por (jogo, porcentagem): cada jogo vira uma fatia crescente
+    order = np.lexsort((percent, game))
+    ordered = percent[order]
+    last = counts - 1
+    quantiles = {}
+    for q in PERCENTILES:
+        position = starts + last * (q / 100.0)
+        lower = np.floor(position).astype(np.int64)
+        upper = np.ceil(position).astype(np.int64)
+        fraction = position - lower
+        quantiles[f'p{q}'] = ordered[lower] + (ordered[upper] - ordered[lower]) * fraction
+
+    rarest_offsets = np.arange(RAREST_STORED)
+    rarest_index = starts[:, None] + rarest_offsets
+    rarest_valid = rarest_offsets < counts[:, None]
+    rarest_index = order[np.where(rarest_valid, rarest_index, starts[:, None])]
+
+    aggregates = {}
+    for row, (appid, achievements) in enumerate(games):
+        rarest = [
+            {
+                'name': achievements[i - starts[row]].get('name'),
+                'displayName': achievements[i - starts[row]].get('displayName'),
+                'icon': achievements[i - starts[row]].get('icon'),
+                'percent': round(float(percent[i]), 2)
+            }
+            for i, valid in zip(rarest_index[row], rarest_valid[row]) if valid
+        ]
+        aggregates[appid] = {
+            'app_id': appid,
+            'count': int(counts[row]),
+            'mean_percent': round(float(mean[row]), 2),
+            'min_percent': round(float(ordered[starts[row]]), 2),
+            'percentiles': {name: round(float(values[row]), 2) for name, values in quantiles.items()},
+            'buckets': {label: int(n) for label, n in zip(BUCKET_LABELS, histogram[row])},
+            'difficulty_index': round(float(difficulty[row]), 2),
+            'rarest': rarest
+        }
+    return aggregates
+
+
+def compare_aggregates(aggregates):
+    """
+    Compara os agregados de vários jogos: posição por dificuldade e
+    percentil de cada jogo dentro do grupo comparado.
+    """
+    if not aggregates:
+        return {'ranking': [], 'buckets': {label: 0 for label in BUCKET_LABELS}, 'mean_difficulty': None}
+
+    appids = np.array([a['app_id'] for a in aggregates])
+    difficulty = np.array([a['difficulty_index'] for a in aggregates])
+    histogram = np.array([[a['buckets'][label] for label in BUCKET_LABELS] for a in aggregates])
+
+    order = np.argsort(-difficulty, kind='stable')
+    # Percentil pela posição média no grupo (empates ficam no meio)
+    ordered = np.sort(difficulty)
+    rank = (np.searchsorted(ordered, difficulty, side='left')
+            + np.searchsorted(ordered, difficulty, side='right') - 1) / 2.0
+    percentile = rank / max(len(difficulty) - 1, 1) * 100.0
+
+    return {
+        'ranking': [
+            {
+                'app_id': int(appids[i]),
+                'difficulty_index': float(difficulty[i]),
+                'difficulty_percentile': round(float(percentile[i]), 1)
+            }
+            for i in order
+        ],
+        'buckets': {label: int(n) for label, n in zip(BUCKET_LABELS, histogram.sum(axis=0))},
+        'mean_difficulty': round(float(difficulty.mean()), 2)
+    }
+
+
+class AchievementAggregates:
+    """
+    Agregados por appid. Cada entrada guarda só a versão da entrada do cache
+    de conquistas que a gerou (não a lista, que fica dentro do orçamento de
+    bytes do cache); se a versão mudar (atualização), o jogo é recalculado.
+    """
+
+    def __init__(self, maxsize=1000):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, games):
+        """
+        `games` é uma lista de (appid, versão, achievements), com a versão
+        vinda de SWRCache.version(). Com versão None o resultado não é
+        guardado. Retorna {appid: agregados}.
+        """
+        result = {}
+        pending = []
+        versions = {}
+        with self._lock:
+            for appid, version, achievements in games:
+                entry = self._entries.get(appid)
+                if entry is not None and version is not None and entry[0] == version:
+                    self._entries.move_to_end(appid)
+                    result[appid] = entry[1]
+                else:
+                    pending.append((appid, achievements))
+                    versions[appid] = version
+
+        computed = compute_aggregates(pending)
+        with self._lock:
+            for appid, aggregates in computed.items():
+                if versions[appid] is None:
+                    continue
+                self._entries[appid] = (versions[appid], aggregates)
+                self._entries.move_to_end(appid)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        result.update(computed)
+        return result
+
+    def __len__(self):
+        return len(self._entries)
+
+
+ACHIEVEMENT_AGGREGATES = AchievementAggregates()
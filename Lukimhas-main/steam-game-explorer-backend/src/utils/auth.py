@@ -0,0 +1,24 @@
+"""
+Token das rotas de diagnóstico (/api/debug e /api/profiles) e do header
+que liga o profiling de uma requisição.
+"""
+import hmac
+
+
+def token_matches(request, header, token):
+    """True se o header `header` trouxer exatamente `token` (comparação em tempo constante)."""
+    if not token:
+        return False
+    # Em bytes: compare_digest recusa str com caracteres fora do ASCII
+    return hmac.compare_digest(request.headers.get(header, '').encode('utf-8'), token.encode('utf-8'))
+
+
+def endpoint_authorized(config, request, prefix, header):
+    """
+    Fechado por padrão: com <prefix>_TOKEN configurado exige o header igual a
+    ele; sem token, só libera com <prefix>_ENDPOINTS_ENABLED ligado (uso local).
+    """
+    token = config.get(f'{prefix}_TOKEN')
+    if token:
+        return token_matches(request, header, token)
+    return bool(config.get(f'{prefix}_ENDPOINTS_ENABLED'))
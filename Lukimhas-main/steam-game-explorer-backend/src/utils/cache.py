@@ -0,0 +1,307 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from src.utils.metrics import CACHE_BYTES, CACHE_EVENTS
+
+# Containers maiores que isso têm o tamanho estimado por amostragem
+SIZE_SAMPLE_THRESHOLD = 1000
+SIZE_SAMPLE = 64
+# Entradas menos usadas examinadas a cada despejo por orçamento
+EVICTION_CANDIDATES = 16
+
+
+# Todos os caches criados no processo, por nome
+_registry = {}
+
+
+def all_caches():
+    return dict(_registry)
+
+
+def clear_all_caches():
+    for cache in list(_registry.values()):
+        cache.clear()
+
+
+def _children(obj):
+    if isinstance(obj, dict):
+        return [item for pair in obj.items() for item in pair]
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return list(obj)
+    return ()
+
+
+def approx_size(obj, seen=None):
+    """
+    Tamanho aproximado em bytes de `obj` e de tudo que ele referencia
+    (dicts, listas, strings, números: o que sai de um JSON). Containers com
+    mais de SIZE_SAMPLE_THRESHOLD itens são estimados por uma amostra.
+    """
+    seen = set() if seen is None else seen
+    total = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+        children = _children(current)
+        if len(children) > SIZE_SAMPLE_THRESHOLD:
+            step = len(children) / SIZE_SAMPLE
+            sample = [children[int(i * step)] for i in range(SIZE_SAMPLE)]
+            # `seen` compartilhado: chaves repetidas (ex.: 'appid') contam uma vez só
+            total += int(sum(approx_size(child, seen) for child in sample) / SIZE_SAMPLE * len(children))
+        else:
+            stack.extend(children)
+    return total
+
+
+class CacheEntry:
+    __slots__ = ('value', 'timestamp', 'size', 'hits')
+
+    def __init__(self, value, timestamp, size=0):
+        self.value = value
+        self.timestamp = timestamp
+        self.size = size
+        self.hits = 0
+
+
+class SWRCache:
+    """
+    Cache LRU com stale-while-revalidate.
+
+    Uma entrada é "fresca" por `ttl` segundos. Depois disso, durante mais
+    `stale_ttl` segundos ela ainda é servida imediatamente (marcada como
+    stale) enquanto uma thread em segundo plano busca o valor novo. Se a busca
+    síncrona falhar e existir qualquer entrada antiga, ela é servida como stale.
+
+    Cada entrada guarda seu tamanho aproximado. Com `max_bytes` (ou a
+    variável CACHE_MAX_BYTES_<NOME>), passar do orçamento despeja primeiro
+    as entradas já expiradas e depois, entre as menos usadas recentemente,
+    as que tiveram menos acertos por byte.
+    """
+
+    def __init__(self, name, ttl, stale_ttl=0, maxsize=1024, max_bytes=None):
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.maxsize = maxsize
+        self.max_bytes = int(os.environ.get(f'CACHE_MAX_BYTES_{name.upper()}', max_bytes or 0)) or None
+        self.bytes = 0
+        self._entries = OrderedDict()
+        self._refreshing = set()
+        self._tasks = set()
+        self._lock = threading.Lock()
+        self._hits = CACHE_EVENTS.labels(name, 'hit')
+        self._stale_hits = CACHE_EVENTS.labels(name, 'stale_hit')
+        self._misses = CACHE_EVENTS.labels(name, 'miss')
+        self._evictions = CACHE_EVENTS.labels(name, 'eviction')
+        self._budget_evictions = CACHE_EVENTS.labels(name, 'budget_eviction')
+        self._bytes_gauge = CACHE_BYTES.labels(name)
+        _registry[name] = self
+
+    def __len__(self):
+        return len(self._entries)
+
+    def peek(self, key):
+        """
+        Retorna (valor, stale) sem buscar nada, ou (None, None) se não houver
+        entrada ou se ela já passou de ttl + stale_ttl.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None, None
+        age = time.monotonic() - entry.timestamp
+        if age >= self.ttl + self.stale_ttl:
+            return None, None
+        return entry.value, age >= self.ttl
+
+    def version(self, key):
+        """Timestamp da entrada de `key` (muda a cada set()), ou None se não houver."""
+        with self._lock:
+            entry = self._entries.get(key)
+        return entry.timestamp if entry is not None else None
+
+    def set(self, key, value):
+        # Medido fora do lock: para a lista de apps leva alguns milissegundos
+        size = approx_size(value)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = CacheEntry(value, time.monotonic(), size)
+            self._account(size)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+                self._evictions.inc()
+            if self.max_bytes:
+                # A entrada nova fica mesmo sozinha acima do orçamento
+                while self.bytes > self.max_bytes and len(self._entries) > 1:
+                    self._remove(self._eviction_candidate(key))
+                    self._budget_evictions.inc()
+
+    def _account(self, delta):
+        self.bytes += delta
+        self._bytes_gauge.inc(delta)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._account(-entry.size)
+        return entry
+
+    def _eviction_candidate(self, protected):
+        """Chave a despejar por orçamento (chamado com o lock)."""
+        now = time.monotonic()
+        best_key, best_value = None, None
+        for i, (key, entry) in enumerate(self._entries.items()):
+            if i >= EVICTION_CANDIDATES:
+                break
+            if key == protected:
+                continue
+            if now - entry.timestamp >= self.ttl + self.stale_ttl:
+                # Expirada: não seria mais servida nem como stale
+                return key
+            value = entry.hits / max(entry.size, 1)
+            if best_value is None or value < best_value:
+                best_key, best_value = key, value
+        return best_key
+
+    def invalidate(self, key):
+        with self._lock:
+            self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._account(-self.bytes)
+
+    def stats(self):
+        """Contagens, bytes e taxa de acerto, para /api/debug/memory."""
+        with self._lock:
+            entries = len(self._entries)
+            largest = sorted(self._entries.items(), key=lambda item: item[1].size, reverse=True)[:5]
+            largest = [{'key': str(key), 'bytes': entry.size, 'hits': entry.hits} for key, entry in largest]
+            total_bytes = self.bytes
+        hits, stale_hits, misses = self._hits.get(), self._stale_hits.get(), self._misses.get()
+        lookups = hits + stale_hits + misses
+        return {
+            'entries': entries,
+            'maxsize': self.maxsize,
+            'bytes': total_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': hits,
+            'stale_hits': stale_hits,
+            'misses': misses,
+            'hit_ratio': round((hits + stale_hits) / lookups, 4) if lookups else None,
+            'evictions': self._evictions.get(),
+            'budget_evictions': self._budget_evictions.get(),
+            'largest': largest
+        }
+
+    def _lookup(self, key):
+        """Retorna (entry, estado) com estado 'fresh', 'stale' ou 'miss'."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        if entry is not None:
+            age = time.monotonic() - entry.timestamp
+            if age < self.ttl:
+                self._hits.inc()
+                entry.hits += 1
+                return entry, 'fresh'
+            if age < self.ttl + self.stale_ttl:
+                self._stale_hits.inc()
+                entry.hits += 1
+                return entry, 'stale'
+        self._misses.inc()
+        return entry, 'miss'
+
+    def get_or_fetch(self, key, fetch):
+        """
+        Retorna (valor, stale) para `key`, chamando `fetch()` quando necessário.
+        """
+        entry, state = self._lookup(key)
+        if state == 'fresh':
+            return entry.value, False
+        if state == 'stale':
+            self._refresh_async(key, fetch)
+            return entry.value, True
+
+        try:
+            value = fetch()
+        except Exception:
+            # Steam fora do ar: melhor um dado antigo do que um erro
+            if entry is not None:
+                return entry.value, True
+            raise
+
+        self.set(key, value)
+        return value, False
+
+    async def get_or_fetch_async(self, key, fetch):
+        """
+        Como get_or_fetch(), com `fetch` retornando uma corrotina. Roda no
+        event loop do motor de saída; a revalidação de entradas stale vira
+        uma task no mesmo loop em vez de uma thread.
+        """
+        entry, state = self._lookup(key)
+        if state == 'fresh':
+            return entry.value, False
+        if state == 'stale':
+            self._refresh_task(key, fetch)
+            return entry.value, True
+
+        try:
+            value = await fetch()
+        except Exception:
+            if entry is not None:
+                return entry.value, True
+            raise
+
+        self.set(key, value)
+        return value, False
+
+    def _refresh_async(self, key, fetch):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def run():
+            try:
+                self.set(key, fetch())
+            except Exception:
+                # Mantém a entrada antiga; o próximo acesso tenta de novo
+                pass
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=run, name=f'swr-{self.name}', daemon=True).start()
+
+    def _refresh_task(self, key, fetch):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        async def run():
+            try:
+                self.set(key, await fetch())
+            except Exception:
+                pass
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        # O loop só guarda referência fraca às tasks
+        task = asyncio.ensure_future(run())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
@@ -0,0 +1,274 @@
+"""
+Crawler em segundo plano que enriquece o catálogo local (tabela catalog_app).
+
+A cada ciclo ele percorre a lista de apps da Steam respeitando um orçamento
+de requisições e um limite de taxa, nesta ordem de prioridade:
+
+1. apps cujo nome mudou na lista da Steam desde a última visita;
+2. apps visitados há mais de CRAWLER_MAX_AGE_DAYS (os mais antigos primeiro);
+3. apps nunca visitados, a partir do cursor salvo em crawler_state.
+
+Cada lote é gravado junto com o cursor, então um restart continua de onde parou.
+
+Com CRAWLER_ENABLED=1 o crawler sobe na primeira requisição atendida pelo
+app (python main.py, flask run ou gunicorn). Um lock de arquivo
+(CRAWLER_LOCK_FILE) garante um crawler só entre os workers; se o worker que
+o roda morrer, outro assume numa requisição seguinte.
+"""
+import os
+import re
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import requests
+
+from src.models.catalog import CatalogApp, CatalogGenre, CrawlerState
+from src.models.user import db
+from src.utils.circuit_breaker import CircuitOpenError
+
+CURSOR_KEY = 'cursor'
+# Intervalo entre tentativas de pegar o lock do crawler em cada worker
+LOCK_RETRY = 60
+
+
+def _crawler_config(app):
+    app.config.setdefault('CRAWLER_ENABLED', os.environ.get('CRAWLER_ENABLED') == '1')
+    # A Store API aceita ~200 requisições a cada 5 minutos
+    app.config.setdefault('CRAWLER_RATE', float(os.environ.get('CRAWLER_RATE', 0.5)))
+    app.config.setdefault('CRAWLER_BUDGET', int(os.environ.get('CRAWLER_BUDGET', 1000)))
+    app.config.setdefault('CRAWLER_INTERVAL', float(os.environ.get('CRAWLER_INTERVAL', 3600)))
+    app.config.setdefault('CRAWLER_MAX_AGE_DAYS', float(os.environ.get('CRAWLER_MAX_AGE_DAYS', 7)))
+    app.config.setdefault('CRAWLER_BATCH_SIZE', int(os.environ.get('CRAWLER_BATCH_SIZE', 20)))
+    app.config.setdefault('CRAWLER_LOCK_FILE', os.environ.get(
+        'CRAWLER_LOCK_FILE', os.path.join(tempfile.gettempdir(), 'steam-explorer-crawler.lock')
+    ))
+
+
+def _utcnow():
+    # fetched_at é gravado como UTC sem fuso (o SQLite não guarda o fuso)
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _release_year(release_date):
+    match = re.search(r'(\d{4})', (release_date or {}).get('date') or '')
+    return int(match.group(1)) if match else None
+
+
+def upsert_catalog_app(appid, name, entry, now=None):
+    """Grava (sem commit) o resultado de um appdetails no catálogo."""
+    now = now or _utcnow()
+    row = db.session.get(CatalogApp, appid) or CatalogApp(appid=appid)
+    row.name = name
+    row.fetched_at = now
+    row.success = bool(entry and entry.get('success'))
+    row.genres = []
+    if row.success:
+        data = entry['data']
+        price = data.get('price_overview') or {}
+        platforms = data.get('platforms') or {}
+        release = data.get('release_date') or {}
+        row.type = data.get('type')
+        row.is_free = bool(data.get('is_free'))
+        row.price_cents = 0 if row.is_free else price.get('final')
+        row.currency = price.get('currency')
+        row.windows = bool(platforms.get('windows'))
+        row.mac = bool(platforms.get('mac'))
+        row.linux = bool(platforms.get('linux'))
+        row.release_date = release.get('date')
+        row.release_year = _release_year(release)
+        row.coming_soon = bool(release.get('coming_soon'))
+        row.header_image = data.get('header_image')
+        genres = {g.get('description', '').strip().lower() for g in data.get('genres') or []}
+        row.genres = [CatalogGenre(genre=genre) for genre in sorted(genres) if genre]
+    db.session.add(row)
+    return row
+
+
+class CatalogCrawler:
+    """Lê a lista de apps e grava appdetails compactos no SQLite, com checkpoint."""
+
+    def __init__(self, app):
+        _crawler_config(app)
+        self.app = app
+        self.rate = app.config['CRAWLER_RATE']
+        self.budget = app.config['CRAWLER_BUDGET']
+        self.interval = app.config['CRAWLER_INTERVAL']
+        self.max_age = timedelta(days=app.config['CRAWLER_MAX_AGE_DAYS'])
+        self.batch_size = app.config['CRAWLER_BATCH_SIZE']
+        self._stop = threading.Event()
+        self._thread = None
+        self.last_cycle = None
+
+    def plan(self, apps):
+        """Retorna a lista de (appid, nome) a visitar neste ciclo, por prioridade."""
+        known = {
+            appid: (name, fetched_at)
+            for appid, name, fetched_at in db.session.query(
+                CatalogApp.appid, CatalogApp.name, CatalogApp.fetched_at
+            )
+        }
+        stale_before = _utcnow() - self.max_age
+        state = db.session.get(CrawlerState, CURSOR_KEY)
+        cursor = int(state.value) if state else 0
+
+        changed, stale, new = [], [], []
+        for app in apps:
+            appid, name = app['appid'], app.get('name', '')
+            if appid not in known:
+                if appid > cursor:
+                    new.append((appid, name))
+                continue
+            stored_name, fetched_at = known[appid]
+            if stored_name != name and name:
+                changed.append((appid, name))
+            elif fetched_at < stale_before:
+                stale.append((fetched_at, appid, name))
+
+        stale.sort()
+        new.sort()
+        # Apps novos abaixo do cursor (adicionados depois que ele passou) entram no fim
+        late = sorted((a['appid'], a.get('name', '')) for a in apps
+                      if a['appid'] not in known and a['appid'] <= cursor)
+        plan = changed + [(appid, name) for _, appid, name in stale] + new + late
+        return plan[:self.budget]
+
+    def _save_cursor(self, appid):
+        state = db.session.get(CrawlerState, CURSOR_KEY)
+        if state is None:
+            state = CrawlerState(key=CURSOR_KEY, value='0')
+            db.session.add(state)
+        if appid > int(state.value):
+            state.value = str(appid)
+
+    def run_cycle(self):
+        """Um ciclo completo dentro do orçamento. Retorna quantos apps foram gravados."""
+        from src.routes.steam import _fetch_app_details, get_apps_list
+
+        plan = self.plan(get_apps_list())
+        written = 0
+        delay = 1.0 / self.rate if self.rate > 0 else 0
+        pending = 0
+        next_at = time.monotonic()
+        for appid, name in plan:
+            # Limite de taxa: no máximo CRAWLER_RATE requisições por segundo
+            if self._stop.wait(max(0.0, next_at - time.monotonic())):
+                break
+            next_at = time.monotonic() + delay
+            try:
+                entry = _fetch_app_details(appid)
+            except CircuitOpenError as e:
+                # Steam fora do ar: espera o circuito tentar de novo
+                self._stop.wait(max(e.retry_after, 1))
+                continue
+            except requests.HTTPError as e:
+                if e.response is not None and e.response.status_code == 429:
+                    self._stop.wait(60)
+                continue
+            except requests.RequestException:
+                continue
+
+            upsert_catalog_app(appid, name, entry)
+            self._save_cursor(appid)
+            written += 1
+            pending += 1
+            if pending >= self.batch_size:
+                db.session.commit()
+                pending = 0
+        db.session.commit()
+        self.last_cycle = {'finished_at': _utcnow().isoformat(), 'planned': len(plan), 'written': written}
+        return written
+
+    def _run(self):
+        with self.app.app_context():
+            while not self._stop.is_set():
+                try:
+                    self.run_cycle()
+                except Exception as e:
+                    db.session.rollback()
+                    print(f"Erro no crawler do catálogo: {e}")
+                self._stop.wait(self.interval)
+
+    def start(self):
+        with self.app.app_context():
+            # WAL deixa as buscas lerem enquanto o crawler escreve
+            db.session.execute(db.text('PRAGMA journal_mode=WAL'))
+        self._thread = threading.Thread(target=self._run, name='catalog-crawler', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def status(self):
+        return {
+            'running': self._thread is not None and self._thread.is_alive(),
+            'last_cycle': self.last_cycle,
+            'rate': self.rate,
+            'budget': self.budget
+        }
+
+
+def _acquire_process_lock(path):
+    """
+    Lock exclusivo entre processos. Retorna o arquivo aberto (o lock vale
+    enquanto ele existir) ou None se outro processo já tem o lock.
+    """
+    try:
+        import fcntl
+    except ImportError:
+        # Windows: sem flock, vale um processo só
+        return True
+    handle = open(path, 'a')
+    try:
+        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        handle.close()
+        return None
+    return handle
+
+
+def init_app(app):
+    """
+    Registra o comando `flask crawl-catalog` e, com CRAWLER_ENABLED, inicia o
+    crawler na primeira requisição do processo que conseguir o lock. Comandos
+    de CLI e o processo pai do reloader não atendem requisições, então não
+    iniciam o crawler.
+    """
+    _crawler_config(app)
+
+    @app.cli.command('crawl-catalog')
+    def crawl_catalog_command():
+        """Roda um ciclo do crawler do catálogo em primeiro plano."""
+        with app.app_context():
+            written = CatalogCrawler(app).run_cycle()
+        print(f'{written} apps gravados no catálogo.')
+
+    if not app.config['CRAWLER_ENABLED']:
+        return
+
+    start_lock = threading.Lock()
+    next_try = [0.0]
+
+    @app.before_request
+    def _start_crawler_once():
+        if 'catalog_crawler' in app.extensions or time.monotonic() < next_try[0]:
+            return
+        with start_lock:
+            if 'catalog_crawler' in app.extensions:
+                return
+            next_try[0] = time.monotonic() + LOCK_RETRY
+            handle = _acquire_process_lock(app.config['CRAWLER_LOCK_FILE'])
+            if handle is None:
+                return
+            app.extensions['catalog_crawler_lock'] = handle
+            start_crawler(app)
+
+
+def start_crawler(app):
+    crawler = CatalogCrawler(app).start()
+    app.extensions['catalog_crawler'] = crawler
+    return crawler
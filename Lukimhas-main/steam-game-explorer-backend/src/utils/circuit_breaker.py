@@ -0,0 +1,118 @@
+import threading
+import time
+
+import requests
+
+
+class CircuitOpenError(requests.RequestException):
+    """Lançada quando o circuito está aberto e a chamada nem é tentada."""
+
+    def __init__(self, name, retry_after):
+        super().__init__(f'Circuit "{name}" is open; retry in {retry_after:.0f}s')
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker simples por endpoint.
+
+    closed: chamadas passam; `failure_threshold` falhas seguidas abrem o circuito.
+    open: chamadas falham na hora até `recovery_timeout` segundos passarem.
+    half_open: até `half_open_max_calls` chamadas de teste passam; sucesso fecha
+    o circuito e falha o abre de novo.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name, failure_threshold=5, recovery_timeout=30.0,
+                 half_open_max_calls=1, is_failure=None):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.is_failure = is_failure or (lambda exc: True)
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self):
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._state = self.HALF_OPEN
+            self._half_open_calls = 0
+        return self._state
+
+    def _before_call(self):
+        with self._lock:
+            state = self._current_state()
+            if state == self.OPEN:
+                retry_after = self.recovery_timeout - (time.monotonic() - self._opened_at)
+                raise CircuitOpenError(self.name, max(retry_after, 0))
+            if state == self.HALF_OPEN:
+                if self._half_open_calls >= self.half_open_max_calls:
+                    raise CircuitOpenError(self.name, self.recovery_timeout)
+                self._half_open_calls += 1
+
+    def _on_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._half_open_calls = 0
+
+    def _on_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._half_open_calls = 0
+
+    def _release_probe(self):
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._half_open_calls > 0:
+                self._half_open_calls -= 1
+
+    def call(self, func, *args, **kwargs):
+        self._before_call()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            if self.is_failure(e):
+                self._on_failure()
+            else:
+                # Erro do cliente (404 etc.) não diz nada sobre a saúde da Steam
+                self._release_probe()
+            raise
+        self._on_success()
+        return result
+
+    async def call_async(self, func, *args, **kwargs):
+        """Como call(), para uma função que retorna uma corrotina."""
+        self._before_call()
+        try:
+            result = await func(*args, **kwargs)
+        except Exception as e:
+            if self.is_failure(e):
+                self._on_failure()
+            else:
+                self._release_probe()
+            raise
+        self._on_success()
+        return result
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                'name': self.name,
+                'state': self._current_state(),
+                'failures': self._failures
+            }
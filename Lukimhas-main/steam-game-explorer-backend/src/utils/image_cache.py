@@ -0,0 +1,163 @@
+"""
+Cache LRU em disco para imagens da CDN da Steam (header_image, screenshots).
+
+O download de uma URL é gravado num arquivo temporário (store() baixa tudo;
+store_stream() repassa os pedaços enquanto grava); ao terminar, o arquivo é
+renomeado para o lugar definitivo e entra no índice. O total em disco fica
+limitado a `max_bytes`, removendo os arquivos usados há mais tempo.
+"""
+import hashlib
+import mimetypes
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlparse
+
+from src.utils.metrics import CACHE_EVENTS
+
+# Imagens maiores que isso não são guardadas
+MAX_IMAGE_BYTES = 10 * 1024 * 1024
+
+
+class CachedImage:
+    __slots__ = ('path', 'size', 'mimetype', 'etag')
+
+    def __init__(self, path, size, mimetype, etag):
+        self.path = path
+        self.size = size
+        self.mimetype = mimetype
+        self.etag = etag
+
+
+def image_key(url):
+    return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+
+class DiskLRUCache:
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._index = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = CACHE_EVENTS.labels('images', 'hit')
+        self._misses = CACHE_EVENTS.labels('images', 'miss')
+        self._evictions = CACHE_EVENTS.labels('images', 'eviction')
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self):
+        """Reconstrói o índice a partir do disco, do arquivo mais antigo ao mais novo."""
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if name.startswith('.tmp'):
+                    # Download interrompido numa execução anterior
+                    os.remove(os.path.join(root, name))
+                    continue
+                path = os.path.join(root, name)
+                stat = os.stat(path)
+                files.append((stat.st_mtime, path, stat.st_size))
+        for _, path, size in sorted(files):
+            key, ext = os.path.splitext(os.path.basename(path))
+            mimetype = mimetypes.types_map.get(ext, 'application/octet-stream')
+            self._index[key] = CachedImage(path, size, mimetype, f'{key[:16]}-{size}')
+            self.total_bytes += size
+        self._evict()
+
+    def _path_for(self, key, mimetype, url):
+        ext = mimetypes.guess_extension(mimetype or '') or os.path.splitext(urlparse(url).path)[1] or '.bin'
+        if ext == '.jpe':
+            ext = '.jpg'
+        return os.path.join(self.directory, key[:2], key + ext)
+
+    def get(self, url):
+        key = image_key(url)
+        with self._lock:
+            image = self._index.get(key)
+            if image is not None:
+                self._index.move_to_end(key)
+        if image is None or not os.path.exists(image.path):
+            self._misses.inc()
+            return None
+        self._hits.inc()
+        return image
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and self._index:
+            _, image = self._index.popitem(last=False)
+            self.total_bytes -= image.size
+            self._evictions.inc()
+            try:
+                os.remove(image.path)
+            except FileNotFoundError:
+                pass
+
+    def store_stream(self, url, mimetype, chunks):
+        """
+        Repassa `chunks` e grava o conteúdo no cache ao mesmo tempo. Se o
+        cliente desconectar ou o download falhar, o arquivo temporário some.
+        """
+        key = image_key(url)
+        path = self._path_for(key, mimetype, url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix='.tmp', dir=os.path.dirname(path))
+        size = 0
+        complete = False
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in chunks:
+                    size += len(chunk)
+                    if size <= MAX_IMAGE_BYTES:
+                        f.write(chunk)
+                    yield chunk
+            complete = size <= MAX_IMAGE_BYTES
+        finally:
+            if not complete:
+                os.remove(tmp_path)
+        if not complete:
+            # Maior que MAX_IMAGE_BYTES: foi repassada inteira, mas não entra no cache
+            return
+        os.replace(tmp_path, path)
+        # mtime guarda a ordem de uso para quando o índice for reconstruído
+        os.utime(path, (time.time(), time.time()))
+        with self._lock:
+            old = self._index.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old.size
+            self._index[key] = CachedImage(path, size, mimetype, f'{key[:16]}-{size}')
+            self.total_bytes += size
+            self._evict()
+
+    def store(self, url, mimetype, chunks):
+        """
+        Grava a imagem inteira no cache, sem repassar nada. Retorna o
+        CachedImage, ou None se passou de MAX_IMAGE_BYTES (nada fica gravado).
+        """
+        stream = self.store_stream(url, mimetype, chunks)
+        size = 0
+        for chunk in stream:
+            size += len(chunk)
+            if size > MAX_IMAGE_BYTES:
+                # O close interrompe o gerador e apaga o arquivo temporário
+                stream.close()
+                return None
+        with self._lock:
+            return self._index.get(image_key(url))
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_image_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = DiskLRUCache(
+                os.environ.get('IMAGE_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'steam-explorer-images')),
+                int(os.environ.get('IMAGE_CACHE_MAX_BYTES', 512 * 1024 * 1024))
+            )
+        return _cache
@@ -0,0 +1,91 @@
+"""
+Inspeção de memória do processo: tamanho dos caches e tracemalloc.
+
+O tracemalloc deixa cada alocação mais lenta, então fica desligado por
+padrão. Liga no startup com TRACEMALLOC_FRAMES=<n> (ou a config de mesmo
+nome) ou em tempo de execução pelo POST /api/debug/memory/tracemalloc.
+
+As rotas de /api/debug exigem o header X-Debug-Token igual a DEBUG_TOKEN;
+sem token configurado, só respondem com DEBUG_ENDPOINTS_ENABLED=1.
+"""
+import os
+import sys
+import tracemalloc
+
+from src.utils.cache import all_caches
+
+GROUP_BY = ('lineno', 'filename', 'traceback')
+
+
+def peak_rss_bytes():
+    """Pico de RSS do processo (também usado pelos benchmarks)."""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reporta em KB, macOS em bytes
+        return peak if sys.platform == 'darwin' else peak * 1024
+    except ImportError:
+        return None
+
+
+def current_rss_bytes():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def cache_report():
+    caches = {name: cache.stats() for name, cache in sorted(all_caches().items())}
+    return {
+        'caches': caches,
+        'total_bytes': sum(stats['bytes'] for stats in caches.values())
+    }
+
+
+def tracemalloc_report(limit=20, group_by='lineno'):
+    """Top-N locais de alocação do snapshot atual, ou só o estado se desligado."""
+    if not tracemalloc.is_tracing():
+        return {'tracing': False}
+    current, peak = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot().filter_traces((
+        # As próprias estruturas do tracemalloc e do import não interessam
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    ))
+    stats = snapshot.statistics(group_by)
+    return {
+        'tracing': True,
+        'frames': tracemalloc.get_traceback_limit(),
+        'traced_bytes': current,
+        'traced_peak_bytes': peak,
+        'group_by': group_by,
+        'top': [
+            {
+                'size_bytes': stat.size,
+                'count': stat.count,
+                'traceback': [f'{frame.filename}:{frame.lineno}' for frame in stat.traceback]
+            }
+            for stat in stats[:limit]
+        ]
+    }
+
+
+def start_tracemalloc(frames=1):
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+    tracemalloc.start(frames)
+
+
+def stop_tracemalloc():
+    tracemalloc.stop()
+
+
+def init_app(app):
+    app.config.setdefault('DEBUG_TOKEN', os.environ.get('DEBUG_TOKEN'))
+    app.config.setdefault('DEBUG_ENDPOINTS_ENABLED', os.environ.get('DEBUG_ENDPOINTS_ENABLED') == '1')
+    frames = app.config.setdefault('TRACEMALLOC_FRAMES', int(os.environ.get('TRACEMALLOC_FRAMES', 0)))
+    if frames and not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
@@ -0,0 +1,292 @@
+"""
+Métricas no formato texto do Prometheus.
+
+Cada thread escreve no seu próprio "shard" (uma lista de números), então o
+caminho quente não pega lock nenhum; só a coleta soma os shards. Quando uma
+thread termina, o shard dela é incorporado a um total fixo, para que threads
+criadas a cada requisição (servidor de desenvolvimento, refresh do cache) não
+acumulem memória entre uma coleta e outra.
+"""
+import threading
+import time
+import weakref
+from bisect import bisect_left
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class _ShardOwner:
+    """Guardado no threading.local; some junto com a thread e aciona o finalizer."""
+    __slots__ = ('shard', '__weakref__')
+
+    def __init__(self, shard):
+        self.shard = shard
+
+
+class _ShardedValues:
+    """Vetor de `size` números com um shard por thread viva."""
+
+    def __init__(self, size):
+        self._size = size
+        self._local = threading.local()
+        self._shards = {}
+        self._retired = [0] * size
+        # RLock: o finalizer pode rodar na thread que está coletando
+        self._lock = threading.RLock()
+
+    def shard(self):
+        try:
+            return self._local.owner.shard
+        except AttributeError:
+            shard = [0] * self._size
+            owner = _ShardOwner(shard)
+            key = id(shard)
+            with self._lock:
+                self._shards[key] = shard
+            # O CPython limpa o threading.local quando a thread termina
+            weakref.finalize(owner, self._retire, key)
+            self._local.owner = owner
+            return shard
+
+    def _retire(self, key):
+        with self._lock:
+            shard = self._shards.pop(key, None)
+            if shard is not None:
+                for i, value in enumerate(shard):
+                    self._retired[i] += value
+
+    def shard_count(self):
+        with self._lock:
+            return len(self._shards)
+
+    def collect(self):
+        with self._lock:
+            totals = list(self._retired)
+            for shard in self._shards.values():
+                for i, value in enumerate(shard):
+                    totals[i] += value
+        return totals
+
+
+class _CounterChild:
+    def __init__(self):
+        self._values = _ShardedValues(1)
+
+    def inc(self, amount=1):
+        self._values.shard()[0] += amount
+
+    def get(self):
+        return self._values.collect()[0]
+
+
+class _GaugeChild(_CounterChild):
+    """Gauge baseado em incrementos: a soma dos deltas de cada thread é o valor atual."""
+
+    def dec(self, amount=1):
+        self._values.shard()[0] -= amount
+
+
+class _HistogramChild:
+    def __init__(self, buckets):
+        self._buckets = buckets
+        # contagem por bucket (+Inf no fim) seguida da soma
+        self._values = _ShardedValues(len(buckets) + 2)
+
+    def observe(self, value):
+        shard = self._values.shard()
+        shard[bisect_left(self._buckets, value)] += 1
+        shard[-1] += value
+
+    def time(self):
+        return _Timer(self)
+
+    def get(self):
+        values = self._values.collect()
+        return values[:-1], values[-1]
+
+
+class _Timer:
+    __slots__ = ('_child', '_start')
+
+    def __init__(self, child):
+        self._child = child
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._child.observe(time.perf_counter() - self._start)
+
+
+class _Metric:
+    type_name = None
+
+    def __init__(self, name, documentation, labelnames=(), registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._children[()] = self._new_child()
+        (registry if registry is not None else REGISTRY).register(self)
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values):
+        """Retorna o filho para esses valores de label; guarde-o para não repetir o lookup."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f'{self.name} espera labels {self.labelnames}')
+            with self._lock:
+                child = self._children.setdefault(tuple(str(v) for v in values), self._new_child())
+                self._children[values] = child
+        return child
+
+    def _label_str(self, values, extra=()):
+        pairs = list(zip(self.labelnames, values)) + list(extra)
+        if not pairs:
+            return ''
+        return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in pairs) + '}'
+
+    def _unique_children(self):
+        seen = set()
+        for values, child in list(self._children.items()):
+            if id(child) in seen:
+                continue
+            seen.add(id(child))
+            yield tuple(str(v) for v in values), child
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.type_name}']
+        lines.extend(self._render_samples())
+        return lines
+
+
+class Counter(_Metric):
+    type_name = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount=1):
+        self._children[()].inc(amount)
+
+    def _render_samples(self):
+        for values, child in self._unique_children():
+            yield f'{self.name}{self._label_str(values)} {child.get()}'
+
+
+class Gauge(Counter):
+    type_name = 'gauge'
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def dec(self, amount=1):
+        self._children[()].dec(amount)
+
+
+class Histogram(_Metric):
+    type_name = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS, registry=None):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value):
+        self._children[()].observe(value)
+
+    def time(self):
+        return self._children[()].time()
+
+    def _render_samples(self):
+        for values, child in self._unique_children():
+            counts, total = child.get()
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                yield f'{self.name}_bucket{self._label_str(values, [("le", le)])} {cumulative}'
+            yield f'{self.name}_sum{self._label_str(values)} {total}'
+            yield f'{self.name}_count{self._label_str(values)} {cumulative}'
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f'Métrica duplicada: {metric.name}')
+            self._metrics[metric.name] = metric
+
+    def get(self, name):
+        return self._metrics.get(name)
+
+    def render(self):
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Métricas compartilhadas pelo app
+ROUTE_LATENCY = Histogram(
+    'http_request_duration_seconds', 'Latência das rotas Flask', ['endpoint', 'method']
+)
+ROUTE_RESPONSES = Counter(
+    'http_responses_total', 'Respostas por rota e status', ['endpoint', 'status']
+)
+UPSTREAM_LATENCY = Histogram(
+    'steam_upstream_duration_seconds', 'Latência das chamadas à Steam por endpoint', ['endpoint']
+)
+UPSTREAM_REQUESTS = Counter(
+    'steam_upstream_requests_total', 'Chamadas à Steam por endpoint e status', ['endpoint', 'status']
+)
+OUTBOUND_WAITING = Gauge(
+    'steam_outbound_waiting', 'Chamadas à Steam esperando vaga no limite global de concorrência'
+)
+OUTBOUND_ACTIVE = Gauge(
+    'steam_outbound_active', 'Chamadas à Steam em andamento no motor assíncrono'
+)
+CACHE_EVENTS = Counter(
+    'cache_events_total', 'Eventos de cache (hit, stale_hit, miss, eviction, budget_eviction)', ['cache', 'event']
+)
+CACHE_BYTES = Gauge(
+    'cache_bytes', 'Tamanho aproximado das entradas em memória por cache', ['cache']
+)
+
+
+def init_app(app):
+    """Mede a latência e o status de todas as rotas do app."""
+    from flask import g, request
+
+    @app.before_request
+    def _start_timer():
+        g._metrics_start = time.perf_counter()
+
+    @app.after_request
+    def _record_request(response):
+        start = getattr(g, '_metrics_start', None)
+        if start is not None:
+            endpoint = request.endpoint or 'unmatched'
+            ROUTE_LATENCY.labels(endpoint, request.method).observe(time.perf_counter() - start)
+            ROUTE_RESPONSES.labels(endpoint, response.status_code).inc()
+        return response
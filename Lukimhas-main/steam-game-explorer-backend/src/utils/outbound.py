@@ -0,0 +1,160 @@
+"""
+Motor assíncrono compartilhado para as chamadas à Steam.
+
+Um único event loop roda numa thread dedicada, com uma sessão aiohttp e um
+semáforo global. As views síncronas do Flask submetem corrotinas com submit()
+e esperam os futures, então uma busca com 20 lookups custa 20 corrotinas em
+vez de 10 threads, e o total de chamadas simultâneas à Steam fica limitado
+para o processo inteiro (OUTBOUND_CONCURRENCY).
+
+Chamadas síncronas com requests (steam_get_json, e com ele o crawler, os
+refreshes do cache e a análise de reviews) pegam uma vaga do mesmo semáforo
+com slot(), então o limite vale para todas. Os downloads de imagens da CDN
+ficam de fora, com um limite próprio (veja get_image em routes/steam.py).
+"""
+import asyncio
+import os
+import threading
+from contextlib import contextmanager
+
+import requests
+
+from src.utils.metrics import OUTBOUND_ACTIVE, OUTBOUND_WAITING
+from src.utils.profiling import propagate_async
+
+OUTBOUND_CONCURRENCY = int(os.environ.get('OUTBOUND_CONCURRENCY', 32))
+
+# O import do aiohttp leva ~250ms; só carrega quando o motor é criado
+aiohttp = None
+
+
+def _load_aiohttp():
+    global aiohttp
+    if aiohttp is None:
+        import aiohttp as _aiohttp
+        aiohttp = _aiohttp
+
+
+def _http_error(status, url, reason):
+    """
+    Converte uma resposta de erro num requests.HTTPError, que é o que o
+    circuit breaker e as rotas já sabem tratar.
+    """
+    response = requests.Response()
+    response.status_code = status
+    response.url = url
+    response.reason = reason
+    return requests.HTTPError(f'{status} Error: {reason} for url: {url}', response=response)
+
+
+class OutboundEngine:
+    def __init__(self, concurrency=OUTBOUND_CONCURRENCY):
+        _load_aiohttp()
+        self.concurrency = concurrency
+        self.loop = asyncio.new_event_loop()
+        self._session = None
+        self._semaphore = None
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(ready,), name='steam-outbound', daemon=True)
+        self._thread.start()
+        ready.wait()
+
+    def _run(self, ready):
+        asyncio.set_event_loop(self.loop)
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self.loop.call_soon(ready.set)
+        self.loop.run_forever()
+
+    def _get_session(self):
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.concurrency)
+            )
+        return self._session
+
+    async def get_json(self, url, params=None, timeout=10):
+        """GET na Steam respeitando o limite global; retorna o JSON da resposta."""
+        if params:
+            # aiohttp só aceita str/int/float nos parâmetros
+            params = {key: str(value) for key, value in params.items()}
+        await self._acquire()
+        try:
+            session = self._get_session()
+            async with session.get(url, params=params,
+                                   timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                if response.status >= 400:
+                    raise _http_error(response.status, str(response.url), response.reason)
+                return await response.json(content_type=None)
+        except asyncio.TimeoutError as e:
+            raise requests.Timeout(f'Timeout after {timeout}s: {url}') from e
+        except aiohttp.ClientError as e:
+            raise requests.ConnectionError(str(e)) from e
+        finally:
+            self._release()
+
+    async def _acquire(self):
+        OUTBOUND_WAITING.inc()
+        try:
+            await self._semaphore.acquire()
+        finally:
+            OUTBOUND_WAITING.dec()
+        OUTBOUND_ACTIVE.inc()
+
+    def _release(self):
+        OUTBOUND_ACTIVE.dec()
+        self._semaphore.release()
+
+    def acquire_slot(self):
+        """
+        Espera uma vaga no limite global a partir de uma thread comum. Quem
+        chama precisa devolver a vaga com release_slot().
+        """
+        if threading.current_thread() is self._thread:
+            # Bloquearia o próprio loop que libera as vagas
+            raise RuntimeError('acquire_slot() chamado dentro do loop de saída')
+        self.run(self._acquire())
+
+    def release_slot(self):
+        self.loop.call_soon_threadsafe(self._release)
+
+    @contextmanager
+    def slot(self):
+        """Vaga no limite global durante uma chamada síncrona (requests)."""
+        self.acquire_slot()
+        try:
+            yield
+        finally:
+            self.release_slot()
+
+    def submit(self, coro):
+        """
+        Agenda `coro` no loop e retorna um concurrent.futures.Future, que
+        funciona com wait()/as_completed(). Abandonar o future não cancela a
+        corrotina: ela termina e, se for um lookup com cache, enche o cache.
+        """
+        return asyncio.run_coroutine_threadsafe(propagate_async(coro), self.loop)
+
+    def run(self, coro, timeout=None):
+        """Submete `coro` e espera o resultado."""
+        return self.submit(coro).result(timeout)
+
+    def close(self):
+        async def shutdown():
+            if self._session is not None:
+                await self._session.close()
+        asyncio.run_coroutine_threadsafe(shutdown(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    """Motor do processo, criado no primeiro uso."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = OutboundEngine()
+        return _engine
@@ -0,0 +1,237 @@
+"""
+Profiling opcional por requisição.
+
+Uma requisição é perfilada quando PROFILING_ENABLED está ligado, quando cai na
+amostragem de PROFILING_SAMPLE_RATE, ou quando manda o header X-Profile-Token
+igual a PROFILING_TOKEN. O modo 'cprofile' grava um .pstats; o modo 'sampler'
+amostra a pilha da thread da requisição e grava um .collapsed (formato do
+flamegraph.pl / speedscope). Os dois gravam um .json com o tempo de parede de
+cada chamada à Steam feita durante a requisição.
+
+A listagem e o download em /api/profiles exigem o header com PROFILING_TOKEN;
+sem token configurado, só respondem com PROFILING_ENDPOINTS_ENABLED=1.
+"""
+import contextvars
+import cProfile
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+
+from src.utils.auth import token_matches
+
+PROFILE_HEADER = 'X-Profile-Token'
+
+_local = threading.local()
+# Nas corrotinas do motor de saída (src/utils/outbound.py) o gravador vai no contexto da task
+_task_recorder = contextvars.ContextVar('profiling_recorder', default=None)
+
+
+class OutboundRecorder:
+    """Acumula as chamadas à Steam feitas durante uma requisição perfilada."""
+
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, seconds, status):
+        with self._lock:
+            self.calls.append({
+                'endpoint': endpoint,
+                'ms': round(seconds * 1000.0, 3),
+                'status': status,
+                'thread': threading.current_thread().name
+            })
+
+
+def current_recorder():
+    return getattr(_local, 'recorder', None) or _task_recorder.get()
+
+
+def propagate_async(coro):
+    """
+    Faz `coro` registrar chamadas à Steam no gravador da requisição atual,
+    embora vá rodar no event loop de saída (src/utils/outbound.py).
+    """
+    recorder = current_recorder()
+    if recorder is None:
+        return coro
+
+    async def wrapper():
+        _task_recorder.set(recorder)
+        return await coro
+
+    return wrapper()
+
+
+class StackSampler:
+    """Amostra periodicamente a pilha de uma thread via sys._current_frames()."""
+
+    def __init__(self, thread_id, interval=0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='profile-sampler', daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{os.path.basename(code.co_filename)}:{code.co_name}')
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def write_collapsed(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f'{stack} {count}\n')
+
+
+def profile_dir(app):
+    return app.config['PROFILING_DIR']
+
+
+def _should_profile(app, request):
+    config = app.config
+    if token_matches(request, PROFILE_HEADER, config['PROFILING_TOKEN']):
+        return True
+    if config['PROFILING_ENABLED']:
+        return True
+    rate = config['PROFILING_SAMPLE_RATE']
+    return rate > 0 and random.random() < rate
+
+
+def _rotate(directory, max_profiles):
+    """Mantém só os `max_profiles` perfis mais recentes (cada perfil tem vários arquivos)."""
+    metas = sorted(
+        (name for name in os.listdir(directory) if name.endswith('.json')),
+        reverse=True
+    )
+    for name in metas[max_profiles:]:
+        stem = name[:-len('.json')]
+        for ext in ('.json', '.pstats', '.collapsed'):
+            try:
+                os.remove(os.path.join(directory, stem + ext))
+            except FileNotFoundError:
+                pass
+
+
+def list_profiles(app, limit=50):
+    """Retorna os metadados dos perfis mais recentes, do mais novo ao mais antigo."""
+    directory = profile_dir(app)
+    if not os.path.isdir(directory):
+        return []
+    profiles = []
+    for name in sorted((n for n in os.listdir(directory) if n.endswith('.json')), reverse=True)[:limit]:
+        try:
+            with open(os.path.join(directory, name), encoding='utf-8') as f:
+                profiles.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return profiles
+
+
+def init_app(app):
+    """Registra os hooks de profiling; tudo desligado por padrão."""
+    from flask import g, request
+
+    app.config.setdefault('PROFILING_ENABLED', os.environ.get('PROFILING_ENABLED') == '1')
+    app.config.setdefault('PROFILING_SAMPLE_RATE', float(os.environ.get('PROFILING_SAMPLE_RATE', 0)))
+    app.config.setdefault('PROFILING_TOKEN', os.environ.get('PROFILING_TOKEN'))
+    # Sem token, /api/profiles só responde com esta flag ligada (uso local)
+    app.config.setdefault('PROFILING_ENDPOINTS_ENABLED', os.environ.get('PROFILING_ENDPOINTS_ENABLED') == '1')
+    app.config.setdefault('PROFILING_MODE', os.environ.get('PROFILING_MODE', 'cprofile'))
+    app.config.setdefault('PROFILING_DIR', os.environ.get(
+        'PROFILING_DIR', os.path.join(tempfile.gettempdir(), 'steam-explorer-profiles')
+    ))
+    app.config.setdefault('PROFILING_MAX_PROFILES', int(os.environ.get('PROFILING_MAX_PROFILES', 50)))
+
+    @app.before_request
+    def _start_profile():
+        if not _should_profile(app, request):
+            return
+        recorder = OutboundRecorder()
+        _local.recorder = recorder
+        if app.config['PROFILING_MODE'] == 'sampler':
+            profiler = StackSampler(threading.get_ident())
+            profiler.start()
+        else:
+            profiler = cProfile.Profile()
+            profiler.enable()
+        g._profile = (profiler, recorder, time.perf_counter())
+
+    @app.after_request
+    def _finish_profile(response):
+        state = g.pop('_profile', None)
+        if state is None:
+            return response
+        profiler, recorder, start = state
+        wall = time.perf_counter() - start
+        if isinstance(profiler, StackSampler):
+            profiler.stop()
+        else:
+            profiler.disable()
+
+        directory = profile_dir(app)
+        os.makedirs(directory, exist_ok=True)
+        # Ordenável por nome: a listagem e a rotação dependem disso
+        now_ns = time.time_ns()
+        profile_id = (f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(now_ns // 10**9))}"
+                      f"-{now_ns % 10**9:09d}-{uuid.uuid4().hex[:4]}")
+        stem = os.path.join(directory, profile_id)
+        if isinstance(profiler, StackSampler):
+            profiler.write_collapsed(stem + '.collapsed')
+            files = [profile_id + '.collapsed']
+        else:
+            profiler.dump_stats(stem + '.pstats')
+            files = [profile_id + '.pstats']
+
+        outbound_ms = sum(call['ms'] for call in recorder.calls)
+        meta = {
+            'id': profile_id,
+            'endpoint': request.endpoint,
+            'method': request.method,
+            'path': request.full_path.rstrip('?'),
+            'status': response.status_code,
+            'wall_ms': round(wall * 1000.0, 3),
+            'outbound_calls': recorder.calls,
+            'outbound_total_ms': round(outbound_ms, 3),
+            'mode': app.config['PROFILING_MODE'],
+            'files': files,
+            'created_at': time.time()
+        }
+        with open(stem + '.json', 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2)
+        _rotate(directory, app.config['PROFILING_MAX_PROFILES'])
+
+        response.headers['X-Profile-Id'] = profile_id
+        return response
+
+    @app.teardown_request
+    def _clear_recorder(exc):
+        _local.recorder = None
+        state = g.pop('_profile', None)
+        if state is not None:
+            # after_request não rodou (exceção): só desliga o profiler
+            profiler = state[0]
+            if isinstance(profiler, StackSampler):
+                profiler.stop()
+            else:
+                profiler.disable()
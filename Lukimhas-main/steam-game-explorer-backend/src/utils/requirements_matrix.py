@@ -0,0 +1,248 @@
+"""
+Matriz numérica de requisitos de sistema por appid.
+
+Cada appdetails buscado na Steam tem os requisitos de PC convertidos uma
+única vez em números (RAM e armazenamento em GB, e um "tier" aproximado de
+CPU e GPU numa escala de 0 a 100). Comparar um perfil de hardware com
+milhares de jogos vira então um punhado de comparações vetorizadas.
+"""
+import re
+import threading
+
+import numpy as np
+
+COLUMNS = (
+    'min_ram_gb', 'rec_ram_gb',
+    'min_storage_gb', 'rec_storage_gb',
+    'min_cpu_tier', 'rec_cpu_tier',
+    'min_gpu_tier', 'rec_gpu_tier',
+)
+COMPONENTS = ('ram_gb', 'storage_gb', 'cpu_tier', 'gpu_tier')
+
+# Peso de atingir o mínimo vs. o recomendado na porcentagem de compatibilidade
+MIN_WEIGHT = 0.6
+REC_WEIGHT = 0.4
+
+_BREAK_RE = re.compile(r'<br\s*/?>|</?li>', re.IGNORECASE)
+_TAG_RE = re.compile(r'<[^>]+>')
+_SIZE_RE = r'(\d+(?:[.,]\d+)?)\s*(gb|mb|tb)'
+
+# Tiers aproximados por geração; servem para ordenar, não para benchmark
+_NVIDIA_GEN = {4: 10, 5: 14, 6: 20, 7: 26, 9: 34, 10: 44, 16: 50, 20: 58, 30: 70, 40: 82, 50: 92}
+_RADEON_GEN = {5: 50, 6: 60, 7: 70, 9: 86}
+_INTEL_GEN = {2: 10, 3: 12, 4: 15, 5: 17, 6: 20, 7: 22, 8: 28, 9: 30, 10: 33, 11: 36, 12: 45, 13: 50, 14: 52}
+_RYZEN_GEN = {1: 20, 2: 24, 3: 32, 4: 33, 5: 42, 7: 50, 8: 52, 9: 56}
+_CLASS_BONUS = {'3': 0, '5': 8, '7': 14, '9': 18}
+
+
+def clean_requirement_text(text):
+    text = _BREAK_RE.sub('\n', text or '')
+    return _TAG_RE.sub('', text).replace('&nbsp;', ' ')
+
+
+def _field(text, label, stop_labels):
+    # O ':' é obrigatório para não casar com "64-bit processor and operating system"
+    match = re.search(rf'{label}\s*:(.*?)(?:\n|{stop_labels}|$)', text, re.IGNORECASE | re.DOTALL)
+    return match.group(1).strip() if match else ''
+
+
+def _size_gb(text):
+    match = re.search(_SIZE_RE, text, re.IGNORECASE)
+    if not match:
+        return np.nan
+    value = float(match.group(1).replace(',', '.'))
+    unit = match.group(2).lower()
+    if unit == 'mb':
+        return value / 1024.0
+    if unit == 'tb':
+        return value * 1024.0
+    return value
+
+
+def gpu_tier(text):
+    """Tier da placa de vídeo mais fraca citada no texto (0-100), ou NaN."""
+    text = (text or '').lower()
+    tiers = []
+    for _, number in re.findall(r'\b(gtx|rtx|gt)\s*(\d{3,4})', text):
+        n = int(number)
+        gen, model = divmod(n, 100)
+        if gen in _NVIDIA_GEN:
+            tiers.append(_NVIDIA_GEN[gen] + (model - 50) * 0.4)
+    for number in re.findall(r'\brx\s*(\d{3,4})', text):
+        n = int(number)
+        if n < 1000:
+            tiers.append(30 + (n % 100 - 50) * 0.4)
+        elif n // 1000 in _RADEON_GEN:
+            tiers.append(_RADEON_GEN[n // 1000] + ((n % 1000) // 100 - 6) * 5)
+    for number in re.findall(r'\br[579]\s*(\d{3})', text):
+        tiers.append(20 + (int(number) % 100) * 0.15)
+    for number in re.findall(r'radeon\s*hd\s*(\d{4})', text):
+        tiers.append(8 + (int(number) % 1000) / 100)
+    for number in re.findall(r'\barc\s*a(\d{3})', text):
+        tiers.append({3: 35, 5: 50, 7: 62}.get(int(number) // 100, 40))
+    if re.search(r'iris', text):
+        tiers.append(12)
+    if re.search(r'\buhd\b', text):
+        tiers.append(8)
+    elif re.search(r'intel\s*hd|hd\s*graphics', text):
+        tiers.append(5)
+    if not tiers:
+        vram = _size_gb(text)
+        if not np.isnan(vram) and vram <= 24:
+            tiers.append(min(10 + vram * 5.5, 70))
+    return float(min(tiers)) if tiers else np.nan
+
+
+def cpu_tier(text):
+    """Tier do processador mais fraco citado no texto (0-100), ou NaN."""
+    text = (text or '').lower()
+    tiers = []
+    for cls, model in re.findall(r'\bi([3579])[\s-]*(\d{4,5})', text):
+        gen = int(model[:2]) if len(model) == 5 else int(model[0])
+        if gen in _INTEL_GEN:
+            tiers.append(_INTEL_GEN[gen] + _CLASS_BONUS[cls])
+    if not tiers:
+        for cls in re.findall(r'core\s*i([3579])\b', text):
+            tiers.append(15 + _CLASS_BONUS[cls])
+    for cls, model in re.findall(r'ryzen\s*([3579])\s*(\d{4})', text):
+        gen = int(model[0])
+        if gen in _RYZEN_GEN:
+            tiers.append(_RYZEN_GEN[gen] + _CLASS_BONUS[cls])
+    if not tiers:
+        ghz = re.search(r'(\d+(?:\.\d+)?)\s*ghz', text)
+        if ghz:
+            tiers.append(min(float(ghz.group(1)) * 8, 40))
+    return float(min(tiers)) if tiers else np.nan
+
+
+def parse_requirement_numbers(req_text):
+    """Extrai RAM, armazenamento, tier de CPU e de GPU de um bloco de requisitos da Steam."""
+    text = clean_requirement_text(req_text)
+    return {
+        'ram_gb': _size_gb(_field(text, r'(?:Memory|RAM)', 'Graphics')),
+        'storage_gb': _size_gb(_field(text, r'(?:Storage|Hard Drive|Hard Disk Space)', 'Additional')),
+        'cpu_tier': cpu_tier(_field(text, 'Processor', 'Memory')),
+        'gpu_tier': gpu_tier(_field(text, r'(?:Graphics|Video Card)', 'DirectX|Storage')),
+    }
+
+
+class RequirementsMatrix:
+    """
+    Linhas (appid) x colunas (COLUMNS) em float32; NaN = requisito desconhecido.
+    Cresce dobrando a capacidade, então upserts saem em O(1) amortizado.
+    """
+
+    def __init__(self, capacity=1024):
+        self._lock = threading.Lock()
+        self._appids = np.zeros(capacity, dtype=np.int64)
+        self._values = np.full((capacity, len(COLUMNS)), np.nan, dtype=np.float32)
+        self._names = []
+        self._rows = {}
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, appid):
+        return appid in self._rows
+
+    def upsert(self, appid, name, pc_requirements):
+        if not isinstance(pc_requirements, dict):
+            # A Steam manda [] quando o jogo não tem requisitos
+            pc_requirements = {}
+        minimum = parse_requirement_numbers(pc_requirements.get('minimum', ''))
+        recommended = parse_requirement_numbers(pc_requirements.get('recommended', ''))
+        row_values = [
+            minimum['ram_gb'], recommended['ram_gb'],
+            minimum['storage_gb'], recommended['storage_gb'],
+            minimum['cpu_tier'], recommended['cpu_tier'],
+            minimum['gpu_tier'], recommended['gpu_tier'],
+        ]
+        with self._lock:
+            row = self._rows.get(appid)
+            if row is None:
+                row = len(self._names)
+                if row == len(self._appids):
+                    self._grow()
+                self._rows[appid] = row
+                self._names.append(name)
+                self._appids[row] = appid
+            else:
+                self._names[row] = name
+            self._values[row] = row_values
+
+    def _grow(self):
+        capacity = len(self._appids) * 2
+        appids = np.zeros(capacity, dtype=np.int64)
+        values = np.full((capacity, len(COLUMNS)), np.nan, dtype=np.float32)
+        appids[:len(self._appids)] = self._appids
+        values[:len(self._values)] = self._values
+        self._appids, self._values = appids, values
+
+    def snapshot(self, appids=None):
+        """
+        Copia (appids, nomes, valores) de todas as linhas ou só de `appids`.
+        Retorna também a lista de appids pedidos que não estão na matriz.
+        """
+        with self._lock:
+            size = len(self._names)
+            if appids is None:
+                return (self._appids[:size].copy(), list(self._names),
+                        self._values[:size].copy(), [])
+            rows, missing = [], []
+            for appid in appids:
+                row = self._rows.get(appid)
+                if row is None:
+                    missing.append(appid)
+                else:
+                    rows.append(row)
+            rows = np.asarray(rows, dtype=np.int64)
+            return (self._appids[rows], [self._names[r] for r in rows],
+                    self._values[rows], missing)
+
+
+def score_profile(profile, appids, values):
+    """
+    Compara um perfil {'ram_gb', 'storage_gb', 'cpu_tier', 'gpu_tier'} com as
+    linhas da matriz. Retorna arrays (meets_min, meets_rec, score, known, ordem,
+    ok_min, ok_rec); as duas últimas são por componente, na ordem de COMPONENTS.
+    Componentes desconhecidos (no perfil ou no jogo) não contam contra o jogo.
+    """
+    profile_vec = np.array([profile.get(c, np.nan) for c in COMPONENTS], dtype=np.float32)
+    minimum = values[:, 0::2]
+    recommended = values[:, 1::2]
+
+    with np.errstate(invalid='ignore'):
+        known_min = ~np.isnan(minimum) & ~np.isnan(profile_vec)
+        known_rec = ~np.isnan(recommended) & ~np.isnan(profile_vec)
+        ok_min = np.where(known_min, profile_vec >= minimum, True)
+        ok_rec = np.where(known_rec, profile_vec >= recommended, ok_min)
+
+    known = known_min.sum(axis=1)
+    points = (MIN_WEIGHT * (ok_min & known_min) + REC_WEIGHT * (ok_rec & known_min)).sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        score = np.where(known > 0, points / known * 100.0, np.nan)
+
+    meets_min = ok_min.all(axis=1)
+    meets_rec = ok_rec.all(axis=1)
+    # lexsort ordena pela última chave primeiro: recomendado, mínimo, score, checagens
+    order = np.lexsort((-known, -np.nan_to_num(score, nan=-1.0),
+                        -meets_min.astype(np.int8), -meets_rec.astype(np.int8)))
+    return meets_min, meets_rec, score, known, order, ok_min, ok_rec
+
+
+def profile_from_specs(data):
+    """
+    Monta o perfil numérico a partir do que o cliente mandou: ram_gb,
+    storage_gb e cpu/gpu como texto (ex.: "Ryzen 5 3600") ou já como tier.
+    """
+    def number(key):
+        value = data.get(key)
+        return float(value) if value is not None else np.nan
+
+    profile = {'ram_gb': number('ram_gb'), 'storage_gb': number('storage_gb')}
+    profile['cpu_tier'] = number('cpu_tier') if data.get('cpu_tier') is not None else cpu_tier(data.get('cpu'))
+    profile['gpu_tier'] = number('gpu_tier') if data.get('gpu_tier') is not None else gpu_tier(data.get('gpu'))
+    return profile
+
+
+REQUIREMENTS_MATRIX = RequirementsMatrix()
@@ -0,0 +1,267 @@
+"""
+Termos e bigramas mais frequentes nas reviews de um jogo, com memória fixa.
+
+As páginas da appreviews são lidas em sequência numa thread; cada review é
+tokenizada e descartada. As contagens ficam em sketches Space-Saving (um por
+tipo de termo e por voted_up), que guardam no máximo `capacity` chaves cada:
+quando um termo novo chega com o sketch cheio, ele herda a contagem do menor
+e o excesso fica registrado como erro máximo da estimativa.
+"""
+import heapq
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+
+from src.utils.steam_client import STEAM_STORE_BASE, steam_get_json
+
+# Chaves guardadas por sketch; o top-k confiável fica bem abaixo disso
+SKETCH_CAPACITY = 500
+# max_reviews é arredondado para cima para um desses valores, para que a
+# chave da análise não mude a cada número pedido
+MAX_REVIEWS_BUCKETS = (100, 500, 1000, 2000, 5000, 10000, 20000)
+MAX_REVIEWS_LIMIT = MAX_REVIEWS_BUCKETS[-1]
+PAGE_SIZE = 100
+# Análises terminadas ficam disponíveis por esse tempo
+RESULT_TTL = 60 * 60
+# Depois de um erro (ex.: circuito aberto), a próxima consulta tenta de novo após isso
+ERROR_RETRY = 60
+MAX_ANALYSES = 20
+# Leituras em segundo plano simultâneas; acima disso a rota responde 429
+MAX_RUNNING_ANALYSES = 4
+BUSY_RETRY = 30
+
+# Valores aceitos pelo parâmetro `language` da appreviews
+STEAM_LANGUAGES = frozenset('''
+all arabic brazilian bulgarian czech danish dutch english finnish french
+german greek hungarian indonesian italian japanese koreana latam norwegian
+polish portuguese romanian russian schinese spanish swedish tchinese thai
+turkish ukrainian vietnamese
+'''.split())
+
+_MARKUP_RE = re.compile(r'\[/?[^\]]*\]|https?://\S+')
+_WORD_RE = re.compile(r"[^\W\d_]+(?:'[^\W\d_]+)?")
+
+STOPWORDS = frozenset('''
+a about after all also am an and any are as at be because been but by can
+could did do does doesn't don't even for from game games get got had has
+have he her his how i i'm if in into is it it's its just me more most my
+no not of on one only or other our out play played playing really so some
+still than that the their them then there these they this to too up very
+was we were what when which while who will with would you your
+o os as um uma de do da dos das em no na nos nas que e é se por para com
+não mais mas como foi ser tem jogo jogos eu me meu minha muito já ao ou
+'''.split())
+
+
+class AnalysisCapacityError(Exception):
+    """Já há MAX_RUNNING_ANALYSES leituras rodando."""
+
+    def __init__(self, retry_after=BUSY_RETRY):
+        self.retry_after = retry_after
+        super().__init__(f'Too many review analyses running; retry in {retry_after}s')
+
+
+def bucket_max_reviews(max_reviews):
+    """Menor valor de MAX_REVIEWS_BUCKETS que cobre `max_reviews`."""
+    index = bisect_left(MAX_REVIEWS_BUCKETS, max_reviews)
+    return MAX_REVIEWS_BUCKETS[min(index, len(MAX_REVIEWS_BUCKETS) - 1)]
+
+
+def tokenize(text):
+    """Palavras em minúsculas, sem markup da Steam, URLs e stopwords."""
+    text = _MARKUP_RE.sub(' ', (text or '').lower())
+    return [word for word in _WORD_RE.findall(text) if len(word) > 1 and word not in STOPWORDS]
+
+
+class SpaceSaving:
+    """
+    Sketch Space-Saving (Metwally et al.) com no máximo `capacity` chaves.
+    O menor contador é achado por um heap com remoção preguiçosa, que é
+    reconstruído quando acumula entradas velhas demais.
+    """
+
+    def __init__(self, capacity=SKETCH_CAPACITY):
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        self.total = 0
+        self._heap = []
+
+    def add(self, key, weight=1):
+        self.total += weight
+        counts = self.counts
+        if key in counts:
+            counts[key] += weight
+        elif len(counts) < self.capacity:
+            counts[key] = weight
+            self.errors[key] = 0
+        else:
+            floor_key, floor = self._pop_min()
+            del counts[floor_key]
+            del self.errors[floor_key]
+            counts[key] = floor + weight
+            self.errors[key] = floor
+        heapq.heappush(self._heap, (counts[key], key))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(count, k) for k, count in counts.items()]
+            heapq.heapify(self._heap)
+
+    def _pop_min(self):
+        while True:
+            count, key = heapq.heappop(self._heap)
+            if self.counts.get(key) == count:
+                return key, count
+
+    def top(self, n):
+        items = sorted(self.counts.items(), key=lambda item: (-item[1], item[0]))[:n]
+        return [{'term': key, 'count': count, 'error': self.errors[key]} for key, count in items]
+
+
+class ReviewTermAnalysis:
+    """Uma análise em andamento (ou terminada) das reviews de um app."""
+
+    def __init__(self, app_id, language, max_reviews, capacity=SKETCH_CAPACITY):
+        self.app_id = app_id
+        self.language = language
+        self.max_reviews = max_reviews
+        self.sketches = {
+            (kind, side): SpaceSaving(capacity)
+            for kind in ('terms', 'bigrams') for side in ('positive', 'negative')
+        }
+        self.reviews = {'positive': 0, 'negative': 0}
+        self.pages = 0
+        self.status = 'running'
+        self.error = None
+        self.started_at = time.time()
+        self.finished_at = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def add_review(self, review):
+        tokens = tokenize(review.get('review'))
+        side = 'positive' if review.get('voted_up') else 'negative'
+        with self._lock:
+            self.reviews[side] += 1
+            terms = self.sketches['terms', side]
+            for token in tokens:
+                terms.add(token)
+            bigrams = self.sketches['bigrams', side]
+            for first, second in zip(tokens, tokens[1:]):
+                bigrams.add(f'{first} {second}')
+
+    def run(self):
+        url = f'{STEAM_STORE_BASE}/appreviews/{self.app_id}'
+        cursor = '*'
+        seen_cursors = set()
+        try:
+            while self.reviews['positive'] + self.reviews['negative'] < self.max_reviews:
+                if self._stop.is_set():
+                    self.status = 'cancelled'
+                    return
+                params = {
+                    'json': 1,
+                    'filter': 'recent',
+                    'language': self.language,
+                    'review_type': 'all',
+                    'purchase_type': 'all',
+                    'num_per_page': PAGE_SIZE,
+                    'cursor': cursor
+                }
+                data = steam_get_json('reviews', url, params=params)
+                if not data.get('success'):
+                    raise ValueError('Failed to fetch reviews')
+                page = data.get('reviews', [])
+                remaining = self.max_reviews - self.reviews['positive'] - self.reviews['negative']
+                for review in page[:remaining]:
+                    self.add_review(review)
+                self.pages += 1
+                seen_cursors.add(cursor)
+                cursor = data.get('cursor')
+                # A Steam repete o cursor quando as reviews acabam
+                if not page or not cursor or cursor in seen_cursors:
+                    break
+            self.status = 'done'
+        except Exception as e:
+            # Qualquer falha (inclusive circuito aberto) encerra a análise; nunca fica em 'running'
+            self.status = 'error'
+            self.error = str(e)
+        finally:
+            self.finished_at = time.time()
+
+    def stop(self):
+        """Pede para a thread parar antes da próxima página."""
+        self._stop.set()
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self.run, name=f'review-terms-{self.app_id}', daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def snapshot(self, top):
+        """Resultado atual; enquanto status == 'running' ele é parcial."""
+        with self._lock:
+            result = {
+                side: {
+                    'reviews': self.reviews[side],
+                    'terms': self.sketches['terms', side].top(top),
+                    'bigrams': self.sketches['bigrams', side].top(top)
+                }
+                for side in ('positive', 'negative')
+            }
+        result.update({
+            'app_id': self.app_id,
+            'language': self.language,
+            'status': self.status,
+            'partial': self.status != 'done',
+            'error': self.error,
+            'pages': self.pages,
+            'max_reviews': self.max_reviews,
+            'elapsed_s': round((self.finished_at or time.time()) - self.started_at, 2)
+        })
+        return result
+
+
+_analyses = OrderedDict()
+_analyses_lock = threading.Lock()
+
+
+def _evict_oldest():
+    """Descarta a análise usada há mais tempo, preferindo as que já terminaram."""
+    victim = next((key for key, analysis in _analyses.items() if analysis.status != 'running'),
+                  next(iter(_analyses)))
+    _analyses.pop(victim).stop()
+
+
+def get_or_start_analysis(app_id, language, max_reviews, restart=False):
+    """
+    Retorna a análise de (app_id, language, max_reviews), iniciando uma nova
+    se não houver, se a anterior falhou ou expirou, ou se restart=True.
+    `language` precisa estar em STEAM_LANGUAGES e `max_reviews` é arredondado
+    por bucket_max_reviews(). Levanta AnalysisCapacityError se for preciso
+    iniciar uma leitura com MAX_RUNNING_ANALYSES já rodando.
+    """
+    if language not in STEAM_LANGUAGES:
+        raise ValueError(f'Unsupported language: {language}')
+    max_reviews = bucket_max_reviews(max_reviews)
+    key = (app_id, language, max_reviews)
+    now = time.time()
+    with _analyses_lock:
+        analysis = _analyses.get(key)
+        expired = analysis is not None and analysis.finished_at is not None and (
+            now - analysis.finished_at > (ERROR_RETRY if analysis.status == 'error' else RESULT_TTL)
+        )
+        if analysis is None or expired or (restart and analysis.status != 'running'):
+            running = sum(1 for other in _analyses.values() if other.status == 'running')
+            if running >= MAX_RUNNING_ANALYSES:
+                raise AnalysisCapacityError()
+            analysis = ReviewTermAnalysis(app_id, language, max_reviews).start()
+            _analyses[key] = analysis
+        _analyses.move_to_end(key)
+        while len(_analyses) > MAX_ANALYSES:
+            _evict_oldest()
+    return analysis
@@ -0,0 +1,138 @@
+"""
+Servir o build do SPA (src/static) sem tocar no disco a cada navegação.
+
+O manifesto é montado uma vez no startup: cada arquivo tem tipo, ETag, se é
+"fingerprinted" (nome com hash, como os assets do Vite) e se tem uma
+variante .gz pré-comprimida. O index.html fica em memória, já comprimido.
+
+Só os arquivos com hash recebem cache imutável de um ano. Quando o build tem
+o manifesto do Vite (build.manifest: true), a lista sai dele; senão o nome
+precisa ter o formato do Vite dentro de assets/.
+"""
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+
+from flask import Response, send_file
+
+# Vite gera nomes como assets/index-U1UHlJBx.js: '-', 8 caracteres de hash e a
+# extensão. O lookahead exige algo além de minúsculas no hash, para que nomes
+# como my-fallback.png não passem por hash
+FINGERPRINT_RE = re.compile(r'-(?=[a-z]{0,7}[A-Z0-9_])[A-Za-z0-9_]{8}\.[A-Za-z0-9]+$')
+VITE_ASSETS_DIR = 'assets/'
+VITE_MANIFEST = '.vite/manifest.json'
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+
+class StaticAsset:
+    __slots__ = ('path', 'gz_path', 'mimetype', 'etag', 'fingerprinted')
+
+    def __init__(self, path, gz_path, mimetype, etag, fingerprinted):
+        self.path = path
+        self.gz_path = gz_path
+        self.mimetype = mimetype
+        self.etag = etag
+        self.fingerprinted = fingerprinted
+
+
+def is_fingerprinted(rel):
+    """Heurística para um caminho relativo ao build: asset do Vite com hash no nome."""
+    return rel.startswith(VITE_ASSETS_DIR) and bool(FINGERPRINT_RE.search(rel))
+
+
+def load_vite_manifest(static_folder):
+    """Arquivos gerados com hash segundo o manifesto do Vite, ou None se não houver manifesto."""
+    try:
+        with open(os.path.join(static_folder, VITE_MANIFEST), encoding='utf-8') as f:
+            chunks = json.load(f)
+    except (OSError, ValueError):
+        return None
+    files = set()
+    for chunk in chunks.values():
+        files.add(chunk['file'])
+        files.update(chunk.get('css', ()))
+        files.update(chunk.get('assets', ()))
+    return files
+
+
+def _accepts_gzip(request):
+    return 'gzip' in request.headers.get('Accept-Encoding', '').lower()
+
+
+class StaticAssets:
+    def __init__(self, static_folder):
+        self.static_folder = static_folder
+        self.manifest = {}
+        self.index_html = None
+        self.index_gz = None
+        self.index_etag = None
+        self.build()
+
+    def build(self):
+        """(Re)monta o manifesto e recarrega o index.html."""
+        manifest = {}
+        if self.static_folder and os.path.isdir(self.static_folder):
+            hashed = load_vite_manifest(self.static_folder)
+            for root, _, names in os.walk(self.static_folder):
+                for name in names:
+                    if name.endswith('.gz'):
+                        continue
+                    path = os.path.join(root, name)
+                    rel = os.path.relpath(path, self.static_folder).replace(os.sep, '/')
+                    stat = os.stat(path)
+                    gz_path = path + '.gz'
+                    manifest[rel] = StaticAsset(
+                        path,
+                        gz_path if os.path.exists(gz_path) else None,
+                        mimetypes.guess_type(name)[0] or 'application/octet-stream',
+                        f'{int(stat.st_mtime)}-{stat.st_size:x}',
+                        rel in hashed if hashed is not None else is_fingerprinted(rel)
+                    )
+        self.manifest = manifest
+
+        index = manifest.get('index.html')
+        if index is not None:
+            with open(index.path, 'rb') as f:
+                self.index_html = f.read()
+            self.index_gz = gzip.compress(self.index_html, compresslevel=9)
+            self.index_etag = hashlib.sha1(self.index_html).hexdigest()[:20]
+        else:
+            self.index_html = self.index_gz = self.index_etag = None
+
+    def serve(self, path, request):
+        asset = self.manifest.get(path) if path else None
+        if asset is None or path == 'index.html':
+            return self.serve_index(request)
+
+        use_gz = asset.gz_path is not None and _accepts_gzip(request)
+        if asset.fingerprinted:
+            response = send_file(asset.gz_path if use_gz else asset.path, mimetype=asset.mimetype,
+                                 etag=asset.etag + ('-gz' if use_gz else ''),
+                                 max_age=IMMUTABLE_MAX_AGE, conditional=True)
+            response.cache_control.public = True
+            response.cache_control.immutable = True
+        else:
+            response = send_file(asset.gz_path if use_gz else asset.path, mimetype=asset.mimetype,
+                                 etag=asset.etag + ('-gz' if use_gz else ''), conditional=True)
+            response.cache_control.no_cache = True
+        if use_gz:
+            response.headers['Content-Encoding'] = 'gzip'
+        if asset.gz_path is not None:
+            response.vary.add('Accept-Encoding')
+        return response
+
+    def serve_index(self, request):
+        if self.index_html is None:
+            return "index.html not found", 404
+        use_gz = _accepts_gzip(request)
+        response = Response(self.index_gz if use_gz else self.index_html, mimetype='text/html')
+        response.set_etag(self.index_etag + ('-gz' if use_gz else ''))
+        if use_gz:
+            response.headers['Content-Encoding'] = 'gzip'
+        response.vary.add('Accept-Encoding')
+        # index.html aponta para os assets com hash, então precisa revalidar sempre
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
@@ -0,0 +1,114 @@
+import os
+import time
+
+import requests
+
+from src.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from src.utils.metrics import UPSTREAM_LATENCY, UPSTREAM_REQUESTS
+from src.utils.outbound import get_engine
+from src.utils.profiling import current_recorder
+
+# Configuráveis para apontar para um servidor stub (ver benchmarks/)
+STEAM_STORE_BASE = os.environ.get('STEAM_STORE_BASE', 'https://store.steampowered.com').rstrip('/')
+STEAM_API_BASE = os.environ.get('STEAM_API_BASE', 'https://api.steampowered.com').rstrip('/')
+
+# Sem timeout uma Steam lenta segura a thread do worker indefinidamente
+REQUEST_TIMEOUT = float(os.environ.get('STEAM_REQUEST_TIMEOUT', 10))
+
+
+def _is_upstream_failure(exc):
+    """Só conta como falha o que indica Steam fora do ar: rede, timeout, 5xx e 429."""
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        status = exc.response.status_code
+        return status >= 500 or status == 429
+    return isinstance(exc, requests.RequestException)
+
+
+def _make_breaker(name):
+    return CircuitBreaker(
+        name,
+        failure_threshold=int(os.environ.get('STEAM_BREAKER_THRESHOLD', 5)),
+        recovery_timeout=float(os.environ.get('STEAM_BREAKER_RECOVERY', 30)),
+        is_failure=_is_upstream_failure
+    )
+
+
+# Um circuito por endpoint: a Store API pode cair sem derrubar a Web API
+BREAKERS = {
+    'store': _make_breaker('store'),
+    'webapi': _make_breaker('webapi'),
+    'reviews': _make_breaker('reviews'),
+    'cdn': _make_breaker('cdn'),
+}
+
+
+def _status_label(exc):
+    if isinstance(exc, CircuitOpenError):
+        return 'circuit_open'
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        return str(exc.response.status_code)
+    if isinstance(exc, requests.Timeout):
+        return 'timeout'
+    return 'error'
+
+
+def _record_call(endpoint, start, status):
+    elapsed = time.perf_counter() - start
+    UPSTREAM_LATENCY.labels(endpoint).observe(elapsed)
+    UPSTREAM_REQUESTS.labels(endpoint, status).inc()
+    recorder = current_recorder()
+    if recorder is not None:
+        recorder.record(endpoint, elapsed, status)
+
+
+def call_steam(endpoint, func, *args, **kwargs):
+    """
+    Executa `func` (uma chamada à Steam) pelo circuit breaker de `endpoint`
+    ('store', 'webapi', 'reviews' ou 'cdn'), registrando latência e status.
+    """
+    status = '200'
+    start = time.perf_counter()
+    try:
+        return BREAKERS[endpoint].call(func, *args, **kwargs)
+    except Exception as e:
+        status = _status_label(e)
+        raise
+    finally:
+        _record_call(endpoint, start, status)
+
+
+async def call_steam_async(endpoint, func, *args, **kwargs):
+    """Como call_steam(), para uma função que retorna uma corrotina."""
+    status = '200'
+    start = time.perf_counter()
+    try:
+        return await BREAKERS[endpoint].call_async(func, *args, **kwargs)
+    except Exception as e:
+        status = _status_label(e)
+        raise
+    finally:
+        _record_call(endpoint, start, status)
+
+
+def steam_get_json(endpoint, url, params=None, timeout=None):
+    """
+    Faz um GET na Steam pelo circuit breaker de `endpoint` e retorna o JSON.
+    A chamada ocupa uma vaga do limite global do motor de saída.
+    """
+    def do_get():
+        with get_engine().slot():
+            response = requests.get(url, params=params, timeout=timeout or REQUEST_TIMEOUT)
+            response.raise_for_status()
+            response.content  # lê o corpo ainda com a vaga
+        # O parse fica fora da vaga: a lista de apps leva centenas de ms
+        return response.json()
+
+    return call_steam(endpoint, do_get)
+
+
+async def steam_get_json_async(endpoint, url, params=None, timeout=None):
+    """
+    Versão assíncrona de steam_get_json, executada no motor de saída
+    compartilhado (veja src/utils/outbound.py).
+    """
+    return await call_steam_async(endpoint, get_engine().get_json, url, params, timeout or REQUEST_TIMEOUT)
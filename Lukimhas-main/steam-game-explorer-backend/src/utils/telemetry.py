@@ -0,0 +1,224 @@
+"""
+Amostrador em segundo plano do uso de CPU, RAM e GPU.
+
+Sobe no create_app() com TELEMETRY_ENABLED=1 (intervalo e tamanho em
+TELEMETRY_INTERVAL e TELEMETRY_CAPACITY).
+
+As amostras vão para buffers circulares NumPy de tamanho fixo, então a
+memória não cresce com o tempo de execução. Leituras copiam só a janela
+pedida e podem ser reduzidas no servidor para buckets de min/max/média.
+"""
+import os
+import threading
+import time
+
+import numpy as np
+
+
+class RingBuffer:
+    """Buffer circular de linhas de tamanho fixo (shape: capacity x width)."""
+
+    def __init__(self, capacity, width=1, dtype=np.float32):
+        self.capacity = capacity
+        self.data = np.full((capacity, width), np.nan, dtype=dtype)
+
+    def write(self, index, values):
+        self.data[index % self.capacity] = values
+
+    def read(self, start, stop):
+        """Retorna as linhas [start, stop) do fluxo total, em ordem."""
+        positions = np.arange(start, stop) % self.capacity
+        return self.data[positions]
+
+
+def _bucketize(values, starts):
+    """min/max/média por bucket, ignorando NaN (GPU ausente em algumas amostras)."""
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+    sums = np.add.reduceat(filled, starts, axis=0)
+    valid_counts = np.add.reduceat(valid.astype(np.int32), starts, axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = sums / valid_counts
+    mins = np.fmin.reduceat(values, starts, axis=0)
+    maxs = np.fmax.reduceat(values, starts, axis=0)
+    return mins, maxs, means
+
+
+def _to_list(array):
+    """Converte para lista JSON-serializável (NaN vira None)."""
+    rounded = np.round(array.astype(np.float64), 2)
+    return np.where(np.isnan(rounded), None, rounded).tolist()
+
+
+class TelemetrySampler:
+    """
+    Grava CPU total, CPU por núcleo, RAM e carga da GPU (se o GPUtil estiver
+    disponível) a cada `interval` segundos, guardando as últimas `capacity` amostras.
+    """
+
+    def __init__(self, interval=1.0, capacity=3600):
+        self.interval = interval
+        self.capacity = capacity
+        self._count = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._psutil = None
+        self._gputil = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        with self._lock:
+            if self.running:
+                return self
+            import psutil
+            self._psutil = psutil
+            try:
+                import GPUtil
+                self._gputil = GPUtil if GPUtil.getGPUs() else None
+            except Exception:
+                self._gputil = None
+
+            self.cores = psutil.cpu_count(logical=True) or 1
+            self.timestamps = RingBuffer(self.capacity, dtype=np.float64)
+            self.cpu = RingBuffer(self.capacity)
+            self.per_core = RingBuffer(self.capacity, width=self.cores)
+            self.ram = RingBuffer(self.capacity)
+            self.gpu = RingBuffer(self.capacity)
+
+            # A primeira chamada sem intervalo sempre retorna 0; serve só de referência
+            psutil.cpu_percent(interval=None)
+            psutil.cpu_percent(interval=None, percpu=True)
+
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='telemetry-sampler', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample()
+            except Exception as e:
+                print(f"Erro na amostragem de telemetria: {e}")
+
+    def _gpu_load(self):
+        if self._gputil is None:
+            return np.nan
+        try:
+            gpus = self._gputil.getGPUs()
+            return gpus[0].load * 100 if gpus else np.nan
+        except Exception:
+            return np.nan
+
+    def sample(self):
+        psutil = self._psutil
+        cpu = psutil.cpu_percent(interval=None)
+        per_core = psutil.cpu_percent(interval=None, percpu=True)
+        ram = psutil.virtual_memory().percent
+        gpu = self._gpu_load()
+        now = time.time()
+        with self._lock:
+            index = self._count
+            self.timestamps.write(index, now)
+            self.cpu.write(index, cpu)
+            self.per_core.write(index, per_core[:self.cores])
+            self.ram.write(index, ram)
+            self.gpu.write(index, gpu)
+            self._count += 1
+
+    def window(self, since=None, seconds=None, buckets=None, per_core=False):
+        """
+        Retorna as amostras com timestamp > `since` (ou dos últimos `seconds`),
+        reduzidas a no máximo `buckets` pontos de min/max/média.
+        """
+        with self._lock:
+            stop = self._count
+            start = max(0, stop - self.capacity)
+            timestamps = self.timestamps.read(start, stop)[:, 0]
+            if since is None and seconds is not None:
+                since = (timestamps[-1] if len(timestamps) else time.time()) - seconds
+            if since is not None:
+                # Timestamps crescem com o índice: busca binária em vez de máscara
+                offset = int(np.searchsorted(timestamps, since, side='right'))
+                start += offset
+                timestamps = timestamps[offset:]
+            series = {
+                'cpu': self.cpu.read(start, stop),
+                'ram': self.ram.read(start, stop),
+                'gpu': self.gpu.read(start, stop),
+            }
+            if per_core:
+                series['per_core'] = self.per_core.read(start, stop)
+
+        count = len(timestamps)
+        if buckets and count > buckets:
+            starts = np.linspace(0, count, buckets + 1).astype(np.int64)[:-1]
+            ends = np.append(starts[1:], count)
+            # Cada bucket é identificado pelo timestamp da sua última amostra
+            bucket_ts = timestamps[ends - 1]
+            counts = ends - starts
+        else:
+            starts = np.arange(count)
+            bucket_ts = timestamps
+            counts = np.ones(count, dtype=np.int64)
+
+        result = {
+            'interval': self.interval,
+            'latest': float(timestamps[-1]) if count else since,
+            'samples': count,
+            'downsampled': bool(buckets and count > buckets),
+            'timestamps': bucket_ts.tolist(),
+            'bucket_sizes': counts.tolist(),
+            'series': {}
+        }
+        for name, values in series.items():
+            if name == 'gpu' and (count == 0 or np.isnan(values).all()):
+                result['series'][name] = None
+                continue
+            if count == 0:
+                result['series'][name] = {'min': [], 'max': [], 'mean': []}
+                continue
+            mins, maxs, means = _bucketize(values, starts)
+            if name != 'per_core':
+                mins, maxs, means = mins[:, 0], maxs[:, 0], means[:, 0]
+            result['series'][name] = {
+                'min': _to_list(mins),
+                'max': _to_list(maxs),
+                'mean': _to_list(means)
+            }
+        return result
+
+
+_sampler = None
+_sampler_lock = threading.Lock()
+
+
+def get_sampler():
+    """Sampler do processo, criado e iniciado na primeira chamada."""
+    global _sampler
+    with _sampler_lock:
+        if _sampler is None:
+            _sampler = TelemetrySampler(
+                interval=float(os.environ.get('TELEMETRY_INTERVAL', 1.0)),
+                capacity=int(os.environ.get('TELEMETRY_CAPACITY', 3600))
+            )
+        return _sampler.start()
+
+
+def init_app(app):
+    """
+    Com TELEMETRY_ENABLED (desligado por padrão), inicia o sampler junto com
+    o app, para que /api/system/telemetry já tenha amostras na primeira chamada.
+    """
+    app.config.setdefault('TELEMETRY_ENABLED', os.environ.get('TELEMETRY_ENABLED') == '1')
+    if app.config['TELEMETRY_ENABLED']:
+        app.extensions['telemetry'] = get_sampler()
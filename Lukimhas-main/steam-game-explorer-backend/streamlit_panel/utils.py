@@ -1,7 +1,8 @@
 import requests
 import os
 
-STEAM_API_BASE = "https://api.steampowered.com"
+STEAM_API_BASE = os.environ.get('STEAM_API_BASE', "https://api.steampowered.com").rstrip('/')
+STEAM_STORE_BASE = os.environ.get('STEAM_STORE_BASE', "https://store.steampowered.com").rstrip('/')
 STEAM_API_KEY = os.environ.get('STEAM_API_KEY', '191216FAB4F49662CE0209FBF2A218FD')
 
 def fetch_achievements(app_id):
@@ -11,13 +12,18 @@ def fetch_achievements(app_id):
     resp = requests.get(url, params=params)
     resp.raise_for_status()
     data = resp.json()
-    achievements = data.get("achievementpercentages", {}).get("achievements", [])
 
     # Busca schema para nomes legíveis e ícones
     schema_url = f"{STEAM_API_BASE}/ISteamUserStats/GetSchemaForGame/v2/"
     schema_params = {"key": STEAM_API_KEY, "appid": app_id}
     schema_resp = requests.get(schema_url, params=schema_params)
     schema_data = schema_resp.json()
+    return merge_achievements(data, schema_data)
+
+def merge_achievements(data, schema_data):
+    """Junta os percentuais globais com os nomes e ícones do schema."""
+    achievements = data.get("achievementpercentages", {}).get("achievements", [])
+
     schema_achievements = {}
     try:
         for ach in schema_data["game"]["availableGameStats"]["achievements"]:
@@ -47,7 +53,7 @@ def fetch_achievements(app_id):
     return enriched
 
 def fetch_game_details(app_id):
-    url = f"https://store.steampowered.com/api/appdetails?appids={app_id}"
+    url = f"{STEAM_STORE_BASE}/api/appdetails?appids={app_id}"
     resp = requests.get(url)
     resp.raise_for_status()
     data = resp.json()
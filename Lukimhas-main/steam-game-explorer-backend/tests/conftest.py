@@ -0,0 +1,24 @@
+import os
+import sys
+
+import pytest
+
+# Os módulos importam como `src.utils...`, a partir da raiz do backend
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def make_app(tmp_path):
+    """create_app() com banco e perfis em diretório temporário (o app.db do repo fica intocado)."""
+    from src.main import create_app
+
+    def make(**config):
+        base = {
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'test.db'}",
+            'PROFILING_DIR': str(tmp_path / 'profiles'),
+        }
+        base.update(config)
+        return create_app(base)
+
+    return make
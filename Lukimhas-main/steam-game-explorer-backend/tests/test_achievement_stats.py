@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+
+from src.routes import steam
+from src.utils.achievement_stats import AchievementAggregates, PERCENTILES, compute_aggregates
+from src.utils.cache import clear_all_caches
+
+URL = '/api/steam/games/achievements/analytics'
+
+
+def _achievements(*percents):
+    return [{'name': f'ACH_{i}', 'displayName': f'Achievement {i}', 'icon': None, 'percent': percent}
+            for i, percent in enumerate(percents)]
+
+
+def test_percentiles_and_buckets_per_game():
+    first = [40.0, 0.5, 80.0, 8.0, 20.0, 2.0]
+    second = [50.0, 10.0, 30.0]
+    aggregates = compute_aggregates([(1, _achievements(*first)), (2, _achievements(*second))])
+
+    for appid, percents in ((1, first), (2, second)):
+        expected = {f'p{q}': round(float(np.percentile(percents, q)), 2) for q in PERCENTILES}
+        assert aggregates[appid]['percentiles'] == expected
+        assert aggregates[appid]['count'] == len(percents)
+        assert aggregates[appid]['min_percent'] == min(percents)
+        assert aggregates[appid]['mean_percent'] == round(sum(percents) / len(percents), 2)
+
+    assert aggregates[1]['buckets'] == {
+        'ultra_rare': 1, 'very_rare': 1, 'rare': 1, 'uncommon': 1, 'common': 1, 'very_common': 1
+    }
+    # As bordas das faixas são inclusivas embaixo
+    assert aggregates[2]['buckets'] == {
+        'ultra_rare': 0, 'very_rare': 0, 'rare': 0, 'uncommon': 1, 'common': 1, 'very_common': 1
+    }
+    assert [a['percent'] for a in aggregates[1]['rarest']] == sorted(first)
+    assert aggregates[1]['rarest'][0]['name'] == 'ACH_1'
+
+
+def test_difficulty_index_spans_0_to_100():
+    aggregates = compute_aggregates([(1, _achievements(100.0)), (2, _achievements(0.0)), (3, [])])
+
+    assert aggregates[1]['difficulty_index'] == 0
+    assert aggregates[2]['difficulty_index'] == 100
+    assert 3 not in aggregates
+
+
+def test_aggregates_are_recomputed_when_the_version_changes():
+    store = AchievementAggregates()
+    first = store.get_many([(1, 1.0, _achievements(10.0))])
+    # Mesma versão: não olha a lista (nem guarda referência a ela)
+    assert store.get_many([(1, 1.0, _achievements(90.0))])[1] is first[1]
+
+    updated = store.get_many([(1, 2.0, _achievements(90.0))])
+    assert updated[1]['mean_percent'] == 90.0
+
+    store.get_many([(2, None, _achievements(5.0))])
+    assert len(store) == 1
+
+
+@pytest.fixture
+def client(make_app, monkeypatch):
+    clear_all_caches()
+    fetched = []
+
+    async def fetch(app_id):
+        fetched.append(app_id)
+        if app_id == 3:
+            return []
+        return _achievements(1.0 * app_id, 50.0)
+
+    monkeypatch.setattr(steam, '_fetch_achievements_async', fetch)
+    client = make_app().test_client()
+    client.fetched = fetched
+    yield client
+    clear_all_caches()
+
+
+def test_analytics_route_aggregates_and_compares(client):
+    response = client.get(URL, query_string={'appids': '1,2,3', 'top': 1})
+    data = response.get_json()
+
+    assert response.status_code == 200
+    assert sorted(client.fetched) == [1, 2, 3]
+    assert [game['app_id'] for game in data['games']] == [1, 2]
+    assert all(len(game['rarest']) == 1 for game in data['games'])
+    assert [entry['app_id'] for entry in data['comparison']['ranking']] == [1, 2]
+    assert data['no_achievements'] == [3]
+    assert data['missing'] == [] and data['errors'] == {}
+
+    # Segunda chamada sai do cache, sem buscar de novo
+    again = client.get(URL, query_string={'appids': '1,2,3', 'top': 1}).get_json()
+    assert again['games'] == data['games']
+    assert sorted(client.fetched) == [1, 2, 3]
+
+
+def test_analytics_route_respects_fetch_missing(client):
+    data = client.get(URL, query_string={'appids': '7', 'fetch_missing': '0'}).get_json()
+
+    assert data['games'] == []
+    assert data['missing'] == [7]
+    assert client.fetched == []
+
+
+@pytest.mark.parametrize('query', [{}, {'appids': 'a,b'}])
+def test_analytics_route_rejects_bad_appids(client, query):
+    assert client.get(URL, query_string=query).status_code == 400
@@ -0,0 +1,110 @@
+import threading
+import time
+import types
+
+import pytest
+
+from src.utils import cache as cache_module
+from src.utils.cache import SWRCache, approx_size
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module, 'time', types.SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+def test_fresh_entry_is_served_without_fetching(clock):
+    cache = SWRCache('test_fresh', ttl=60, stale_ttl=60)
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return 'v1'
+
+    assert cache.get_or_fetch('k', fetch) == ('v1', False)
+    clock.now += 59
+    assert cache.get_or_fetch('k', fetch) == ('v1', False)
+    assert calls == [1]
+    assert cache.peek('k') == ('v1', False)
+
+
+def test_stale_entry_is_served_and_revalidated(clock):
+    cache = SWRCache('test_stale', ttl=60, stale_ttl=60)
+    cache.set('k', 'old')
+    clock.now += 61
+    refreshed = threading.Event()
+
+    def fetch():
+        refreshed.set()
+        return 'new'
+
+    assert cache.peek('k') == ('old', True)
+    assert cache.get_or_fetch('k', fetch) == ('old', True)
+    assert refreshed.wait(2)
+    deadline = time.monotonic() + 2
+    while cache.peek('k') != ('new', False) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert cache.peek('k') == ('new', False)
+
+
+def test_entry_expires_after_stale_ttl(clock):
+    cache = SWRCache('test_expired', ttl=60, stale_ttl=60)
+    cache.set('k', 'old')
+    clock.now += 120
+
+    assert cache.peek('k') == (None, None)
+    assert cache.get_or_fetch('k', lambda: 'new') == ('new', False)
+
+
+def test_expired_entry_is_served_when_the_fetch_fails(clock):
+    cache = SWRCache('test_fallback', ttl=60, stale_ttl=60)
+    cache.set('k', 'old')
+    clock.now += 500
+
+    def fetch():
+        raise ConnectionError('down')
+
+    assert cache.get_or_fetch('k', fetch) == ('old', True)
+
+
+def test_byte_budget_evicts_least_valuable_entries(clock):
+    value = 'x' * 1000
+    size = approx_size(value)
+    cache = SWRCache('test_budget', ttl=60, max_bytes=size * 2 + size // 2)
+    cache.set('a', value)
+    cache.set('b', value)
+    # 'a' é a menos recente, mas teve acertos: 'b' sai no lugar dela
+    cache.get_or_fetch('a', lambda: value)
+    cache.set('c', value)
+
+    assert cache.peek('a')[0] == value
+    assert cache.peek('b') == (None, None)
+    assert cache.peek('c')[0] == value
+    assert cache.bytes == 2 * size <= cache.max_bytes
+    assert cache.stats()['budget_evictions'] == 1
+
+
+def test_expired_entries_are_evicted_first(clock):
+    value = 'x' * 1000
+    size = approx_size(value)
+    cache = SWRCache('test_budget_expired', ttl=60, max_bytes=size * 2 + size // 2)
+    cache.set('a', value)
+    cache.get_or_fetch('a', lambda: value)
+    clock.now += 61
+    cache.set('b', value)
+    cache.get_or_fetch('b', lambda: value)
+    cache.set('c', value)
+
+    assert cache.peek('a') == (None, None)
+    assert cache.peek('b')[0] == value
+    assert len(cache) == 2
@@ -0,0 +1,73 @@
+import pytest
+
+from src.main import init_db
+from src.models.catalog import CatalogApp
+from src.models.user import db
+from src.utils import catalog_crawler
+from src.utils.catalog_crawler import upsert_catalog_app
+
+
+@pytest.fixture
+def started(monkeypatch):
+    """Troca o crawler real por um registro de quais apps o iniciariam."""
+    calls = []
+
+    def fake_start(app):
+        calls.append(app)
+        app.extensions['catalog_crawler'] = object()
+
+    monkeypatch.setattr(catalog_crawler, 'start_crawler', fake_start)
+    return calls
+
+
+def test_crawler_starts_on_first_request_of_create_app(make_app, started, tmp_path):
+    app = make_app(CRAWLER_ENABLED=True, CRAWLER_LOCK_FILE=str(tmp_path / 'crawler.lock'))
+    assert started == []
+
+    client = app.test_client()
+    client.get('/api/metrics')
+    client.get('/api/metrics')
+    assert started == [app]
+
+
+def test_only_one_process_gets_the_crawler(make_app, started, tmp_path):
+    lock_file = str(tmp_path / 'crawler.lock')
+    # Cada app faz o papel de um worker: o flock é por arquivo aberto
+    first = make_app(CRAWLER_ENABLED=True, CRAWLER_LOCK_FILE=lock_file)
+    second = make_app(CRAWLER_ENABLED=True, CRAWLER_LOCK_FILE=lock_file)
+    first.test_client().get('/api/metrics')
+    second.test_client().get('/api/metrics')
+    assert started == [first]
+
+
+def test_disabled_crawler_never_starts(make_app, started):
+    make_app(CRAWLER_ENABLED=False).test_client().get('/api/metrics')
+    assert started == []
+
+
+def test_name_filter_treats_wildcards_literally(make_app):
+    app = make_app()
+    init_db(app)
+    with app.app_context():
+        for appid, name in [(1, '100% Orange Juice'), (2, '100 Orange'), (3, 'a_b'), (4, 'axb')]:
+            upsert_catalog_app(appid, name, {'success': True, 'data': {'type': 'game'}})
+        db.session.commit()
+        assert CatalogApp.query.count() == 4
+
+    client = app.test_client()
+
+    def names(query):
+        response = client.get('/api/steam/games/search', query_string={'q': query, 'type': 'game'})
+        return [game['name'] for game in response.get_json()['games']]
+
+    assert names('100%') == ['100% Orange Juice']
+    assert names('a_b') == ['a_b']
+    assert names('orange') == ['100 Orange', '100% Orange Juice']
+
+
+@pytest.mark.parametrize('max_price', ['inf', '-inf', 'nan', 'abc'])
+def test_max_price_must_be_a_finite_number(make_app, max_price):
+    response = make_app().test_client().get('/api/steam/games/search',
+                                            query_string={'q': 'x', 'max_price': max_price})
+    assert response.status_code == 400
+    assert response.get_json()['error'].startswith('Invalid filter:')
@@ -0,0 +1,117 @@
+import types
+
+import pytest
+import requests
+
+from src.utils import circuit_breaker
+from src.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(circuit_breaker, 'time', types.SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+def _fail():
+    raise requests.ConnectionError('down')
+
+
+def _trip(breaker):
+    for _ in range(breaker.failure_threshold):
+        with pytest.raises(requests.ConnectionError):
+            breaker.call(_fail)
+
+
+def test_opens_after_failure_threshold(clock):
+    breaker = CircuitBreaker('test', failure_threshold=3, recovery_timeout=30)
+    for _ in range(2):
+        with pytest.raises(requests.ConnectionError):
+            breaker.call(_fail)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    with pytest.raises(requests.ConnectionError):
+        breaker.call(_fail)
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_success_resets_the_failure_count(clock):
+    breaker = CircuitBreaker('test', failure_threshold=3, recovery_timeout=30)
+    for _ in range(2):
+        with pytest.raises(requests.ConnectionError):
+            breaker.call(_fail)
+    assert breaker.call(lambda: 'ok') == 'ok'
+    for _ in range(2):
+        with pytest.raises(requests.ConnectionError):
+            breaker.call(_fail)
+
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_open_circuit_fails_fast_until_cooldown(clock):
+    breaker = CircuitBreaker('test', failure_threshold=2, recovery_timeout=30)
+    _trip(breaker)
+    calls = []
+    clock.now += 10
+
+    with pytest.raises(CircuitOpenError) as excinfo:
+        breaker.call(lambda: calls.append(1))
+    assert calls == []
+    assert excinfo.value.retry_after == 20
+
+    clock.now += 20
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+
+def test_half_open_probe_success_closes(clock):
+    breaker = CircuitBreaker('test', failure_threshold=2, recovery_timeout=30)
+    _trip(breaker)
+    clock.now += 30
+
+    def probe():
+        # Só uma chamada de teste por vez no half-open
+        with pytest.raises(CircuitOpenError):
+            breaker.call(lambda: 'second')
+        return 'ok'
+
+    assert breaker.call(probe) == 'ok'
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.to_dict()['failures'] == 0
+
+
+def test_half_open_probe_failure_reopens(clock):
+    breaker = CircuitBreaker('test', failure_threshold=2, recovery_timeout=30)
+    _trip(breaker)
+    clock.now += 30
+
+    with pytest.raises(requests.ConnectionError):
+        breaker.call(_fail)
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: 'ok')
+
+    clock.now += 30
+    assert breaker.call(lambda: 'ok') == 'ok'
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_client_errors_do_not_count(clock):
+    breaker = CircuitBreaker('test', failure_threshold=1, recovery_timeout=30,
+                             is_failure=lambda exc: not isinstance(exc, KeyError))
+
+    def not_found():
+        raise KeyError('missing')
+
+    for _ in range(3):
+        with pytest.raises(KeyError):
+            breaker.call(not_found)
+    assert breaker.state == CircuitBreaker.CLOSED
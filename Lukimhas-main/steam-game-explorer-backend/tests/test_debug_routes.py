@@ -0,0 +1,46 @@
+import tracemalloc
+
+import pytest
+
+from src.routes.debug import DEBUG_HEADER
+
+
+@pytest.fixture(autouse=True)
+def stop_tracing():
+    yield
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+@pytest.mark.parametrize('method, path', [
+    ('get', '/api/debug/memory'),
+    ('post', '/api/debug/memory/tracemalloc'),
+])
+def test_closed_by_default(make_app, method, path):
+    client = make_app(DEBUG_TOKEN=None, DEBUG_ENDPOINTS_ENABLED=False).test_client()
+    response = getattr(client, method)(path, json={'action': 'start'})
+    assert response.status_code == 403
+    assert not tracemalloc.is_tracing()
+
+
+def test_profiling_token_does_not_open_debug(make_app):
+    client = make_app(PROFILING_TOKEN='p', DEBUG_TOKEN='d').test_client()
+    assert client.get('/api/debug/memory', headers={'X-Profile-Token': 'p'}).status_code == 403
+    assert client.get('/api/debug/memory', headers={DEBUG_HEADER: 'd'}).status_code == 200
+
+
+def test_memory_report_and_tracemalloc_toggle(make_app):
+    client = make_app(DEBUG_ENDPOINTS_ENABLED=True).test_client()
+
+    report = client.get('/api/debug/memory').get_json()
+    assert 'app_details' in report['caches']
+    assert report['total_bytes'] == sum(c['bytes'] for c in report['caches'].values())
+    assert report['tracemalloc'] == {'tracing': False}
+
+    assert client.post('/api/debug/memory/tracemalloc', json={'action': 'start', 'frames': 2}).get_json() == {'tracing': True}
+    traced = client.get('/api/debug/memory?top=3').get_json()['tracemalloc']
+    assert traced['tracing'] and traced['frames'] == 2 and len(traced['top']) <= 3
+
+    assert client.post('/api/debug/memory/tracemalloc', json={'action': 'stop'}).get_json() == {'tracing': False}
+    assert client.post('/api/debug/memory/tracemalloc', json={'action': 'x'}).status_code == 400
+    assert client.get('/api/debug/memory?group_by=x').status_code == 400
@@ -0,0 +1,103 @@
+import threading
+import time
+
+import pytest
+
+from src.routes import steam
+from src.utils.cache import clear_all_caches
+
+URL = '/api/steam/games/details:batch'
+
+
+@pytest.mark.parametrize('fields', [[['name']], [{'name': 1}], ['name', 3], 'name'])
+def test_fields_must_be_a_list_of_strings(make_app, fields):
+    response = make_app().test_client().post(URL, json={'appids': [10], 'fields': fields})
+    assert response.status_code == 400
+    assert 'list of strings' in response.get_json()['error']
+
+
+def test_unknown_field_is_rejected(make_app):
+    response = make_app().test_client().post(URL, json={'appids': [10], 'fields': ['name', 'nope']})
+    assert response.status_code == 400
+    assert response.get_json()['error'] == "Unknown fields: ['nope']"
+
+
+@pytest.mark.parametrize('body', [[10, 20], 'appids', 42])
+def test_body_must_be_an_object(make_app, body):
+    response = make_app().test_client().post(URL, json=body)
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Body must be a JSON object'
+
+
+@pytest.mark.parametrize('appids', ['570', 570, {'570': True}])
+def test_appids_must_be_a_list(make_app, appids):
+    response = make_app().test_client().post(URL, json={'appids': appids})
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Body field "appids" must be a list'
+
+
+@pytest.mark.parametrize('budget_ms', ['nan', 'inf', '-inf'])
+def test_non_finite_budget_is_rejected(make_app, budget_ms):
+    response = make_app().test_client().post(URL, json={'appids': [10], 'budget_ms': budget_ms})
+    assert response.status_code == 400
+    assert 'finite' in response.get_json()['error']
+
+
+def test_negative_budget_is_clamped_to_zero(make_app):
+    steam._details_cache.set(10, {'success': True, 'data': {'type': 'game', 'name': 'Cached'}})
+    try:
+        response = make_app().test_client().post(URL, json={'appids': [10], 'budget_ms': -500})
+    finally:
+        steam._details_cache.invalidate(10)
+    assert response.status_code == 200
+    assert response.get_json()['results'][0]['status'] == 'ok'
+
+
+def _game(name):
+    return {'success': True, 'data': {'type': 'game', 'name': name}}
+
+
+def _age(app_id, seconds):
+    steam._details_cache._entries[app_id].timestamp -= seconds
+
+
+@pytest.fixture
+def cache():
+    clear_all_caches()
+    yield steam._details_cache
+    clear_all_caches()
+
+
+def test_stale_entry_is_revalidated_on_the_outbound_engine(make_app, monkeypatch, cache):
+    fetched_on = []
+
+    async def fetch(app_id):
+        fetched_on.append(threading.current_thread().name)
+        return _game('Fresh')
+
+    monkeypatch.setattr(steam, '_fetch_app_details_async', fetch)
+    cache.set(10, _game('Old'))
+    _age(10, cache.ttl + 1)
+    data = make_app().test_client().post(URL, json={'appids': [10]}).get_json()
+
+    assert data['results'][0]['stale'] is True
+    assert data['results'][0]['data']['name'] == 'Old'
+    deadline = time.monotonic() + 2
+    while cache.peek(10) != (_game('Fresh'), False) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert cache.peek(10) == (_game('Fresh'), False)
+    assert fetched_on == ['steam-outbound']
+
+
+def test_entry_past_stale_ttl_is_fetched_again(make_app, monkeypatch, cache):
+    async def fetch(app_id):
+        return _game('New')
+
+    monkeypatch.setattr(steam, '_fetch_app_details_async', fetch)
+    cache.set(10, _game('Expired'))
+    _age(10, cache.ttl + cache.stale_ttl + 1)
+    data = make_app().test_client().post(URL, json={'appids': [10]}).get_json()
+
+    assert data['from_cache'] == 0
+    assert data['results'][0]['stale'] is False
+    assert data['results'][0]['data']['name'] == 'New'
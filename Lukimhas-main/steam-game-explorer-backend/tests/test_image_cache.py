@@ -0,0 +1,63 @@
+import os
+
+from src.utils import image_cache
+from src.utils.image_cache import DiskLRUCache
+
+URL = 'https://cdn.example/steam/apps/10/header.jpg'
+
+
+def _files(directory):
+    return [name for _, _, names in os.walk(directory) for name in names]
+
+
+def test_stream_is_stored_and_indexed(tmp_path):
+    cache = DiskLRUCache(str(tmp_path), max_bytes=1024 * 1024)
+    body = b''.join(cache.store_stream(URL, 'image/jpeg', [b'abc', b'def']))
+
+    assert body == b'abcdef'
+    image = cache.get(URL)
+    assert image is not None and image.size == 6
+    with open(image.path, 'rb') as f:
+        assert f.read() == b'abcdef'
+    assert cache.total_bytes == 6
+
+
+def test_oversized_body_is_streamed_but_not_cached(tmp_path, monkeypatch):
+    monkeypatch.setattr(image_cache, 'MAX_IMAGE_BYTES', 8)
+    cache = DiskLRUCache(str(tmp_path), max_bytes=1024 * 1024)
+    chunks = [b'12345', b'67890', b'abcde']
+
+    body = b''.join(cache.store_stream(URL, 'image/jpeg', chunks))
+
+    assert body == b''.join(chunks)
+    assert cache.get(URL) is None
+    assert cache.total_bytes == 0
+    assert _files(tmp_path) == []
+
+
+def test_interrupted_stream_leaves_no_file(tmp_path):
+    cache = DiskLRUCache(str(tmp_path), max_bytes=1024 * 1024)
+    stream = cache.store_stream(URL, 'image/jpeg', [b'abc', b'def'])
+    next(stream)
+    stream.close()
+
+    assert cache.get(URL) is None
+    assert _files(tmp_path) == []
+
+
+def test_store_downloads_whole_image(tmp_path):
+    cache = DiskLRUCache(str(tmp_path), max_bytes=1024 * 1024)
+    image = cache.store(URL, 'image/jpeg', iter([b'abc', b'def']))
+    assert image is not None and image.size == 6
+    assert cache.get(URL).path == image.path
+
+
+def test_store_stops_reading_oversized_body(tmp_path, monkeypatch):
+    monkeypatch.setattr(image_cache, 'MAX_IMAGE_BYTES', 8)
+    cache = DiskLRUCache(str(tmp_path), max_bytes=1024 * 1024)
+    chunks = iter([b'12345', b'67890', b'abcde'])
+
+    assert cache.store(URL, 'image/jpeg', chunks) is None
+    # Parou no pedaço que estourou o limite
+    assert next(chunks) == b'abcde'
+    assert _files(tmp_path) == []
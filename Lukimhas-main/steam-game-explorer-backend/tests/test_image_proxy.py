@@ -0,0 +1,115 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.routes import steam
+from src.utils import steam_client
+from src.utils.image_cache import DiskLRUCache
+from src.utils.outbound import OutboundEngine
+
+
+class UpstreamServer:
+    """CDN e API falsas: /stall.png trava no meio do corpo até `release`."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def _send(self, ctype, body, stall=False):
+                self.send_response(200)
+                self.send_header('Content-Type', ctype)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if stall:
+                    self.wfile.write(body[:2])
+                    self.wfile.flush()
+                    server.release.wait(10)
+                    body = body[2:]
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path.startswith('/stall.png'):
+                    self._send('image/png', b'x' * 1000, stall=True)
+                elif self.path.startswith('/ok.png'):
+                    self._send('image/png', b'png-bytes')
+                elif self.path.startswith('/page.png'):
+                    self._send('text/html', b'<html></html>')
+                else:
+                    self._send('application/json', json.dumps({'ok': True}).encode())
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = 'http://127.0.0.1:%d' % self.httpd.server_address[1]
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.release.set()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def upstream():
+    server = UpstreamServer()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def client(make_app, monkeypatch, tmp_path, upstream):
+    engine = OutboundEngine(concurrency=1)
+    monkeypatch.setattr(steam_client, 'get_engine', lambda: engine)
+    monkeypatch.setattr(steam, 'get_engine', lambda: engine)
+    monkeypatch.setattr(steam, 'IMAGE_PROXY_HOSTS', ('127.0.0.1',))
+    cache = DiskLRUCache(str(tmp_path / 'images'), max_bytes=1024 * 1024)
+    monkeypatch.setattr(steam, 'get_image_cache', lambda: cache)
+    for name in list(steam_client.BREAKERS):
+        monkeypatch.setitem(steam_client.BREAKERS, name, steam_client._make_breaker(name))
+    yield make_app().test_client()
+    engine.close()
+
+
+def test_stalled_image_does_not_block_steam_lookups(client, upstream):
+    image = {}
+    thread = threading.Thread(target=lambda: image.setdefault(
+        'response', client.get('/api/steam/images', query_string={'url': upstream.url + '/stall.png'})
+    ))
+    thread.start()
+    time.sleep(0.2)
+
+    # O motor tem uma vaga só: se a imagem a ocupasse, isto esperaria o release
+    start = time.monotonic()
+    assert steam_client.steam_get_json('store', upstream.url + '/api/appdetails') == {'ok': True}
+    assert time.monotonic() - start < 2
+    assert thread.is_alive()
+
+    upstream.release.set()
+    thread.join(5)
+    assert image['response'].status_code == 200
+    assert image['response'].data == b'x' * 1000
+
+
+def test_image_is_downloaded_then_served_from_disk(client, upstream):
+    url = upstream.url + '/ok.png'
+    first = client.get('/api/steam/images', query_string={'url': url})
+    assert first.status_code == 200 and first.data == b'png-bytes'
+    assert first.cache_control.immutable
+    first.close()
+
+    second = client.get('/api/steam/images', query_string={'url': url}, headers={'If-None-Match': first.headers['ETag']})
+    assert second.status_code == 304
+
+
+def test_non_image_upstream_is_rejected(client, upstream):
+    response = client.get('/api/steam/images', query_string={'url': upstream.url + '/page.png'})
+    assert response.status_code == 502
+    assert steam._image_slots._value == steam.IMAGE_CONCURRENCY
@@ -0,0 +1,52 @@
+import threading
+
+from src.utils.metrics import Counter, Gauge, Registry
+
+
+def _run_threads(target, count, batch=200):
+    for start in range(0, count, batch):
+        threads = [threading.Thread(target=target) for _ in range(min(batch, count - start))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+
+def test_shards_of_finished_threads_are_folded_without_collect():
+    counter = Counter('test_short_lived', 'teste', registry=Registry())
+    child = counter._children[()]
+
+    _run_threads(counter.inc, 5000)
+
+    # Nenhuma coleta rodou: o shard de cada thread é incorporado quando ela termina
+    assert child._values.shard_count() <= 1
+    assert child.get() == 5000
+
+
+def test_gauge_keeps_deltas_from_finished_threads():
+    gauge = Gauge('test_gauge_threads', 'teste', registry=Registry())
+    _run_threads(lambda: gauge.inc(3), 100)
+    _run_threads(lambda: gauge.dec(1), 100)
+    assert gauge._children[()].get() == 200
+
+
+def test_live_thread_shard_is_counted():
+    counter = Counter('test_live', 'teste', ['kind'], registry=Registry())
+    child = counter.labels('a')
+    started, release = threading.Event(), threading.Event()
+
+    def worker():
+        child.inc(2)
+        started.set()
+        release.wait()
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    started.wait()
+    assert child.get() == 2
+    assert child._values.shard_count() == 1
+    release.set()
+    thread.join()
+    assert child.get() == 2
+    assert child._values.shard_count() == 0
+    assert 'test_live{kind="a"} 2' in counter.render()
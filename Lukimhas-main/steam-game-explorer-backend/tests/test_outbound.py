@@ -0,0 +1,96 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.utils import steam_client
+from src.utils.outbound import OutboundEngine
+
+
+class ConcurrencyServer:
+    """Servidor local que responde {"ok": true} devagar e mede o pico de conexões simultâneas."""
+
+    def __init__(self, delay=0.05):
+        self.active = 0
+        self.peak = 0
+        lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                with lock:
+                    server.active += 1
+                    server.peak = max(server.peak, server.active)
+                time.sleep(delay)
+                with lock:
+                    server.active -= 1
+                body = json.dumps({'ok': True}).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = 'http://127.0.0.1:%d/' % self.httpd.server_address[1]
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    engine = OutboundEngine(concurrency=2)
+    monkeypatch.setattr(steam_client, 'get_engine', lambda: engine)
+    # Circuitos novos: as falhas daqui não abrem os circuitos dos outros testes
+    for name in list(steam_client.BREAKERS):
+        monkeypatch.setitem(steam_client.BREAKERS, name, steam_client._make_breaker(name))
+    yield engine
+    engine.close()
+
+
+@pytest.fixture
+def server():
+    server = ConcurrencyServer()
+    yield server
+    server.stop()
+
+
+def test_sync_and_async_calls_share_the_global_limit(engine, server):
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        sync_calls = [pool.submit(steam_client.steam_get_json, 'webapi', server.url) for _ in range(8)]
+        async_calls = [engine.submit(engine.get_json(server.url)) for _ in range(8)]
+        wait(sync_calls + async_calls)
+
+    assert all(f.result() == {'ok': True} for f in sync_calls + async_calls)
+    assert server.peak <= 2
+
+
+def test_slot_is_released_when_the_call_fails(engine):
+    for _ in range(3):
+        with pytest.raises(Exception):
+            steam_client.steam_get_json('cdn', 'http://127.0.0.1:9/')
+    # As duas vagas voltaram: dá para pegar as duas sem bloquear
+    engine.acquire_slot()
+    engine.acquire_slot()
+    engine.release_slot()
+    engine.release_slot()
+
+
+def test_slot_cannot_be_taken_inside_the_loop(engine):
+    async def nested():
+        engine.acquire_slot()
+
+    with pytest.raises(RuntimeError):
+        engine.run(nested(), timeout=5)
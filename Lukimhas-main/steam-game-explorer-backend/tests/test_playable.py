@@ -0,0 +1,64 @@
+import asyncio
+import time
+
+import pytest
+
+from src.routes import system
+from src.utils.requirements_matrix import RequirementsMatrix
+
+URL = '/api/system/playable'
+PROFILE = {'ram_gb': 16, 'storage_gb': 100, 'cpu_tier': 40, 'gpu_tier': 60}
+
+
+def _requirements(ram_gb):
+    return {'minimum': f'Memory: {ram_gb} GB RAM', 'recommended': f'Memory: {ram_gb * 2} GB RAM'}
+
+
+@pytest.fixture
+def client(make_app, monkeypatch):
+    matrix = RequirementsMatrix()
+    matrix.upsert(1, 'Light', _requirements(4))
+    matrix.upsert(2, 'Medium', _requirements(12))
+    matrix.upsert(3, 'Heavy', _requirements(32))
+    monkeypatch.setattr(system, 'REQUIREMENTS_MATRIX', matrix)
+    return make_app().test_client()
+
+
+def test_games_are_ranked_for_the_client_profile(client):
+    data = client.post(URL, json={'profile': PROFILE, 'appids': [3, 2, 1]}).get_json()
+
+    assert data['profile_source'] == 'client'
+    assert [game['app_id'] for game in data['games']] == [1, 2, 3]
+    assert [game['meets_recommended'] for game in data['games']] == [True, False, False]
+    assert [game['meets_minimum'] for game in data['games']] == [True, True, False]
+    assert data['games'][2]['failing_minimum'] == ['ram_gb']
+    assert data['total'] == 3
+
+
+@pytest.mark.parametrize('limit, expected', [(0, 1), (-5, 1), (2, 2), (10 ** 9, 3)])
+def test_limit_is_clamped(client, limit, expected):
+    data = client.post(URL, json={'profile': PROFILE, 'limit': limit}).get_json()
+
+    assert len(data['games']) == expected
+
+
+@pytest.mark.parametrize('body', [{'limit': 'x'}, {'appids': '570'}, {'appids': ['a']}, [1, 2]])
+def test_invalid_body_is_rejected(client, body):
+    response = client.post(URL, json=body)
+
+    assert response.status_code == 400
+    assert response.get_json()['status'] == 'error'
+
+
+def test_missing_games_do_not_block_past_the_timeout(client, monkeypatch):
+    async def slow_details(app_id):
+        await asyncio.sleep(1)
+
+    monkeypatch.setattr(system, 'get_app_details_async', slow_details)
+    monkeypatch.setattr(system, 'PLAYABLE_FETCH_TIMEOUT', 0.1)
+    started = time.monotonic()
+    data = client.post(URL, json={'profile': PROFILE, 'appids': [1, 99]}).get_json()
+
+    assert time.monotonic() - started < 1
+    assert [game['app_id'] for game in data['games']] == [1]
+    assert data['missing'] == [99]
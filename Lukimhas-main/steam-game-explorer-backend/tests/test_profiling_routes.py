@@ -0,0 +1,37 @@
+import pytest
+from flask import request
+
+from src.utils.profiling import PROFILE_HEADER, _should_profile
+
+
+@pytest.mark.parametrize('path', ['/api/profiles', '/api/profiles/x.json'])
+def test_closed_without_token_or_flag(make_app, path):
+    client = make_app(PROFILING_TOKEN=None, PROFILING_ENDPOINTS_ENABLED=False).test_client()
+    assert client.get(path).status_code == 403
+
+
+def test_token_is_required_when_configured(make_app):
+    client = make_app(PROFILING_TOKEN='secret', PROFILING_ENDPOINTS_ENABLED=True).test_client()
+    assert client.get('/api/profiles').status_code == 403
+    assert client.get('/api/profiles', headers={PROFILE_HEADER: 'wrong'}).status_code == 403
+    response = client.get('/api/profiles', headers={PROFILE_HEADER: 'secret'})
+    assert response.status_code == 200
+    assert response.get_json() == {'profiles': []}
+
+
+def test_explicit_flag_opens_without_token(make_app):
+    client = make_app(PROFILING_TOKEN=None, PROFILING_ENDPOINTS_ENABLED=True).test_client()
+    assert client.get('/api/profiles').status_code == 200
+
+
+def test_non_ascii_token_header_is_rejected(make_app):
+    client = make_app(PROFILING_TOKEN='secret').test_client()
+    response = client.get('/api/profiles', headers={PROFILE_HEADER: 'sécret'})
+    assert response.status_code == 403
+
+
+def test_profile_header_must_match_the_token(make_app):
+    app = make_app(PROFILING_TOKEN='secret')
+    for value, expected in (('secret', True), ('secreT', False), ('sécret', False), ('', False)):
+        with app.test_request_context(headers={PROFILE_HEADER: value}):
+            assert _should_profile(app, request) is expected
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from src.utils.requirements_matrix import RequirementsMatrix, parse_requirement_numbers, score_profile
+
+NAN = np.nan
+PROFILE = {'ram_gb': 16.0, 'storage_gb': 100.0, 'cpu_tier': 40.0, 'gpu_tier': 60.0}
+# min/rec de RAM, armazenamento, CPU e GPU, na ordem de COLUMNS
+VALUES = np.array([
+    [8, 16, 50, 50, 20, 30, 40, 50],          # atinge o recomendado
+    [8, 32, 50, 50, 20, 60, 40, 80],          # só o mínimo
+    [64, 64, NAN, NAN, NAN, NAN, NAN, NAN],   # falta RAM
+    [NAN] * 8,                                # requisitos desconhecidos
+], dtype=np.float32)
+APPIDS = np.array([1, 2, 3, 4])
+
+
+def test_score_profile_flags_and_scores():
+    meets_min, meets_rec, score, known, order, ok_min, ok_rec = score_profile(PROFILE, APPIDS, VALUES)
+
+    assert meets_min.tolist() == [True, True, False, True]
+    assert meets_rec.tolist() == [True, False, False, True]
+    assert known.tolist() == [4, 4, 1, 0]
+    assert score[:3].tolist() == pytest.approx([100.0, 70.0, 0.0])
+    assert np.isnan(score[3])
+    assert ok_min[2].tolist() == [False, True, True, True]
+    assert ok_rec[1].tolist() == [False, True, False, False]
+
+
+def test_score_profile_order():
+    order = score_profile(PROFILE, APPIDS, VALUES)[4]
+
+    # Recomendado primeiro, depois mínimo; dentro do grupo, pelo score
+    assert APPIDS[order].tolist() == [1, 4, 2, 3]
+
+
+def test_unknown_profile_component_is_not_counted():
+    profile = dict(PROFILE, gpu_tier=NAN)
+    meets_min, meets_rec, score, known, *_ = score_profile(profile, APPIDS, VALUES)
+
+    assert known.tolist() == [3, 3, 1, 0]
+    assert score[1] == pytest.approx((0.6 * 3 + 0.4) / 3 * 100)
+
+
+def test_matrix_parses_requirement_text():
+    matrix = RequirementsMatrix(capacity=1)
+    matrix.upsert(10, 'Game', {
+        'minimum': 'Processor: Intel Core i5-8400<br>Memory: 8 GB RAM<br>'
+                   'Graphics: NVIDIA GeForce GTX 1060<br>Storage: 50 GB available space',
+    })
+    matrix.upsert(20, 'No requirements', [])
+    ids, names, values, missing = matrix.snapshot([10, 20, 30])
+
+    assert ids.tolist() == [10, 20] and names == ['Game', 'No requirements']
+    assert missing == [30]
+    assert values[0, 0] == 8 and values[0, 2] == 50
+    assert not np.isnan(values[0, 4]) and not np.isnan(values[0, 6])
+    assert np.isnan(values[1]).all()
+    assert parse_requirement_numbers('Memory: 512 MB RAM')['ram_gb'] == 0.5
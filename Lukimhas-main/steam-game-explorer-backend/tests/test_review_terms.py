@@ -0,0 +1,96 @@
+import threading
+
+import pytest
+
+from src.utils import review_terms
+from src.utils.circuit_breaker import CircuitOpenError
+from src.utils.review_terms import AnalysisCapacityError, bucket_max_reviews, get_or_start_analysis
+
+
+@pytest.fixture(autouse=True)
+def analyses():
+    review_terms._analyses.clear()
+    yield review_terms._analyses
+    for analysis in review_terms._analyses.values():
+        analysis.stop()
+    review_terms._analyses.clear()
+
+
+@pytest.fixture
+def blocking_steam(monkeypatch):
+    """Cada página espera `release`; conta quantas páginas foram pedidas."""
+    release = threading.Event()
+    calls = []
+
+    def fake_get_json(endpoint, url, params=None):
+        calls.append(params['cursor'])
+        release.wait(5)
+        page = len(calls)
+        return {'success': 1, 'cursor': f'c{page}',
+                'reviews': [{'review': 'great story', 'voted_up': True}]}
+
+    monkeypatch.setattr(review_terms, 'steam_get_json', fake_get_json)
+    yield release, calls
+    release.set()
+
+
+def _join(analysis):
+    analysis._thread.join(5)
+    assert not analysis._thread.is_alive()
+
+
+@pytest.mark.parametrize('requested, bucket', [(1, 100), (100, 100), (101, 500), (1999, 2000), (20000, 20000)])
+def test_max_reviews_is_bucketed(requested, bucket):
+    assert bucket_max_reviews(requested) == bucket
+
+
+def test_same_bucket_reuses_the_analysis(blocking_steam):
+    first = get_or_start_analysis(10, 'english', 150)
+    assert get_or_start_analysis(10, 'english', 499) is first
+    assert first.max_reviews == 500
+
+
+def test_unknown_language_is_rejected():
+    with pytest.raises(ValueError):
+        get_or_start_analysis(10, 'klingon', 100)
+
+
+def test_running_analyses_are_capped(blocking_steam, monkeypatch):
+    monkeypatch.setattr(review_terms, 'MAX_RUNNING_ANALYSES', 2)
+    get_or_start_analysis(1, 'english', 100)
+    get_or_start_analysis(2, 'english', 100)
+    with pytest.raises(AnalysisCapacityError):
+        get_or_start_analysis(3, 'english', 100)
+
+
+def test_evicted_analysis_stops_its_worker(blocking_steam, monkeypatch):
+    release, calls = blocking_steam
+    monkeypatch.setattr(review_terms, 'MAX_ANALYSES', 1)
+    first = get_or_start_analysis(1, 'english', 5000)
+    get_or_start_analysis(2, 'english', 5000)
+
+    release.set()
+    _join(first)
+    assert first.status == 'cancelled'
+    assert first.pages <= 1
+
+
+def test_any_exception_ends_in_error(monkeypatch):
+    def open_circuit(endpoint, url, params=None):
+        raise CircuitOpenError('reviews', 30)
+
+    monkeypatch.setattr(review_terms, 'steam_get_json', open_circuit)
+    analysis = get_or_start_analysis(10, 'english', 100)
+    _join(analysis)
+    assert analysis.status == 'error'
+    assert analysis.finished_at is not None
+
+
+def test_route_returns_429_when_busy(make_app, blocking_steam, monkeypatch):
+    monkeypatch.setattr(review_terms, 'MAX_RUNNING_ANALYSES', 1)
+    client = make_app().test_client()
+    assert client.get('/api/steam/games/1/reviews/terms').status_code == 202
+    busy = client.get('/api/steam/games/2/reviews/terms')
+    assert busy.status_code == 429
+    assert busy.headers['Retry-After'] == str(review_terms.BUSY_RETRY)
+    assert client.get('/api/steam/games/2/reviews/terms?language=klingon').status_code == 400
@@ -0,0 +1,89 @@
+import asyncio
+import time
+
+import pytest
+import requests
+
+from src.routes import steam
+from src.utils.cache import clear_all_caches
+from src.utils.circuit_breaker import CircuitOpenError
+
+APPS = [{'appid': appid, 'name': f'Space Game {appid}'} for appid in range(1, 7)]
+
+
+@pytest.fixture
+def client(make_app, monkeypatch):
+    clear_all_caches()
+    monkeypatch.setattr(steam, 'get_apps_list_cached', lambda: (APPS, False))
+    yield make_app().test_client()
+    clear_all_caches()
+
+
+def _entry(appid):
+    return {'success': True, 'data': {'type': 'game', 'name': f'Space Game {appid}',
+                                      'header_image': f'https://cdn.akamai.steamstatic.com/{appid}.jpg'}}
+
+
+def test_open_store_circuit_is_not_an_empty_result(client, monkeypatch):
+    async def circuit_open(app_id):
+        raise CircuitOpenError('store', 30)
+
+    monkeypatch.setattr(steam, '_fetch_app_details_async', circuit_open)
+    response = client.get('/api/steam/games/search?q=space')
+
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '30'
+
+
+def test_failed_lookups_mark_the_result_partial(client, monkeypatch):
+    async def half_fail(app_id):
+        if app_id % 2:
+            raise requests.ConnectionError('boom')
+        return _entry(app_id)
+
+    monkeypatch.setattr(steam, '_fetch_app_details_async', half_fail)
+    data = client.get('/api/steam/games/search?q=space').get_json()
+
+    assert sorted(game['appid'] for game in data['games']) == [2, 4, 6]
+    assert data['failed'] == 3
+    assert data['partial'] is True
+
+
+def test_complete_search_is_not_partial(client, monkeypatch):
+    async def ok(app_id):
+        return _entry(app_id)
+
+    monkeypatch.setattr(steam, '_fetch_app_details_async', ok)
+    data = client.get('/api/steam/games/search?q=space').get_json()
+
+    assert data['total'] == 6
+    assert data['failed'] == 0 and data['pending'] == 0
+    assert data['partial'] is False
+
+
+@pytest.mark.parametrize('budget_ms', ['nan', 'inf', '-inf'])
+def test_non_finite_budget_is_rejected(client, budget_ms):
+    response = client.get('/api/steam/games/search', query_string={'q': 'space', 'budget_ms': budget_ms})
+
+    assert response.status_code == 400
+    assert 'finite' in response.get_json()['error']
+
+
+def test_lookups_past_the_budget_are_left_pending(client, monkeypatch):
+    async def slow_odd(app_id):
+        if app_id % 2:
+            await asyncio.sleep(0.5)
+            # Falha depois do prazo para não deixar nada no cache
+            raise requests.ConnectionError('late')
+        return _entry(app_id)
+
+    monkeypatch.setattr(steam, '_fetch_app_details_async', slow_odd)
+    started = time.monotonic()
+    data = client.get('/api/steam/games/search', query_string={'q': 'space', 'budget_ms': 100}).get_json()
+
+    assert time.monotonic() - started < 0.5
+    assert sorted(game['appid'] for game in data['games']) == [2, 4, 6]
+    assert data['pending'] == 3
+    assert data['failed'] == 0
+    assert data['partial'] is True
+    assert data['budget_ms'] == 100
@@ -0,0 +1,67 @@
+import json
+
+import pytest
+
+from src.utils.static_assets import StaticAssets, is_fingerprinted
+
+
+@pytest.mark.parametrize('path', [
+    'assets/index-U1UHlJBx.js',
+    'assets/index-ua1pGBLo.css',
+    'assets/logo-D_3mw5Kd.svg',
+    'assets/vendor-a1b2c3d4.js',
+])
+def test_vite_hashed_names(path):
+    assert is_fingerprinted(path)
+
+
+@pytest.mark.parametrize('path', [
+    'apple-touch-icon.png',
+    'my-background.png',
+    'vite.svg',
+    'index.html',
+    'assets/apple-touch-icon.png',
+    'assets/my-background.png',
+    'assets/my-fallback.png',
+    'assets/jquery-3.7.1.min.js',
+    'assets/icon-U1U-lJBx.png',
+    'assets/index.U1UHlJBx.js',
+    # Formato de hash, mas fora de assets/ (arquivos de public/ não têm hash)
+    'index-U1UHlJBx.js',
+])
+def test_plain_names_are_not_fingerprinted(path):
+    assert not is_fingerprinted(path)
+
+
+def _write(folder, rel, content=b'x'):
+    path = folder / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+
+
+def test_only_hashed_assets_get_immutable_cache(tmp_path, make_app):
+    _write(tmp_path, 'index.html', b'<html></html>')
+    _write(tmp_path, 'assets/index-U1UHlJBx.js')
+    _write(tmp_path, 'apple-touch-icon.png')
+    assets = StaticAssets(str(tmp_path))
+
+    with make_app().test_request_context():
+        from flask import request
+        hashed = assets.serve('assets/index-U1UHlJBx.js', request)
+        plain = assets.serve('apple-touch-icon.png', request)
+    assert hashed.cache_control.immutable and hashed.cache_control.max_age == 365 * 24 * 60 * 60
+    assert not plain.cache_control.immutable and plain.cache_control.no_cache
+
+
+def test_vite_manifest_is_authoritative(tmp_path):
+    _write(tmp_path, 'assets/main-abcdefgh.js')
+    _write(tmp_path, 'assets/index-U1UHlJBx.js')
+    _write(tmp_path, 'assets/index-Bq1xYz9_.css')
+    _write(tmp_path, '.vite/manifest.json', json.dumps({
+        'index.html': {'file': 'assets/main-abcdefgh.js', 'css': ['assets/index-Bq1xYz9_.css']}
+    }).encode())
+    manifest = StaticAssets(str(tmp_path)).manifest
+
+    assert manifest['assets/main-abcdefgh.js'].fingerprinted
+    assert manifest['assets/index-Bq1xYz9_.css'].fingerprinted
+    assert not manifest['assets/index-U1UHlJBx.js'].fingerprinted
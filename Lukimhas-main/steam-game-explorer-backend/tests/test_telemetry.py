@@ -0,0 +1,101 @@
+import types
+
+import numpy as np
+import pytest
+
+from src.utils import telemetry
+from src.utils.telemetry import RingBuffer, TelemetrySampler
+
+URL = '/api/system/telemetry'
+
+
+def test_ring_buffer_wraps_in_order():
+    ring = RingBuffer(4)
+    for i in range(6):
+        ring.write(i, i)
+
+    assert ring.read(2, 6)[:, 0].tolist() == [2, 3, 4, 5]
+    # As posições 0 e 1 foram sobrescritas pelas amostras 4 e 5
+    assert ring.data[:, 0].tolist() == [4, 5, 2, 3]
+
+
+@pytest.fixture
+def sampler(monkeypatch):
+    """Sampler com psutil e relógio falsos; a thread nunca chega a amostrar."""
+    clock = types.SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(telemetry, 'time', types.SimpleNamespace(time=lambda: clock.now))
+    sampler = TelemetrySampler(interval=3600, capacity=8).start()
+    readings = iter(range(100))
+    cpu = {}
+
+    def cpu_percent(interval=None, percpu=False):
+        if percpu:
+            return [cpu['value']] * sampler.cores
+        cpu['value'] = float(next(readings))
+        return cpu['value']
+
+    sampler._psutil = types.SimpleNamespace(
+        cpu_percent=cpu_percent,
+        virtual_memory=lambda: types.SimpleNamespace(percent=50.0)
+    )
+    sampler._gputil = None
+    sampler.clock = clock
+    yield sampler
+    sampler.stop()
+
+
+def _take(sampler, n):
+    for _ in range(n):
+        sampler.clock.now += 1
+        sampler.sample()
+
+
+def test_window_keeps_the_last_capacity_samples(sampler):
+    _take(sampler, 10)
+    data = sampler.window()
+
+    assert data['samples'] == 8
+    assert data['series']['cpu']['mean'] == [float(i) for i in range(2, 10)]
+    assert data['timestamps'] == [1000.0 + i for i in range(3, 11)]
+    assert data['series']['gpu'] is None
+
+
+def test_buckets_summarize_min_max_mean(sampler):
+    _take(sampler, 10)
+    data = sampler.window(buckets=2, per_core=True)
+
+    assert data['downsampled'] is True
+    assert data['bucket_sizes'] == [4, 4]
+    assert data['timestamps'] == [1006.0, 1010.0]
+    assert data['series']['cpu'] == {'min': [2.0, 6.0], 'max': [5.0, 9.0], 'mean': [3.5, 7.5]}
+    assert data['series']['ram']['mean'] == [50.0, 50.0]
+    assert np.array(data['series']['per_core']['max']).shape == (2, sampler.cores)
+
+
+def test_since_and_window_filter_by_timestamp(sampler):
+    _take(sampler, 5)
+
+    assert sampler.window(since=1003.0)['series']['cpu']['mean'] == [3.0, 4.0]
+    assert sampler.window(seconds=1)['samples'] == 1
+    empty = sampler.window(since=2000.0)
+    assert empty['samples'] == 0 and empty['series']['cpu'] == {'min': [], 'max': [], 'mean': []}
+
+
+def test_route_is_disabled_by_default(make_app):
+    response = make_app().test_client().get(URL)
+
+    assert response.status_code == 503
+    assert 'TELEMETRY_ENABLED' in response.get_json()['error']
+
+
+def test_create_app_starts_the_sampler_when_enabled(make_app, monkeypatch):
+    monkeypatch.setattr(telemetry, '_sampler', TelemetrySampler(interval=3600, capacity=8))
+    app = make_app(TELEMETRY_ENABLED=True)
+    sampler = app.extensions['telemetry']
+    try:
+        assert sampler.running
+        response = app.test_client().get(URL)
+        assert response.status_code == 200
+        assert response.get_json()['samples'] == 0
+    finally:
+        sampler.stop()
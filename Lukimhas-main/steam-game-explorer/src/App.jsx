@@ -49,24 +49,8 @@ function App() {
       
       const data = await response.json();
       
-      // Buscar detalhes de cada jogo para obter as imagens
-      const gamesWithDetails = await Promise.all(
-        data.games.map(async (game) => {
-          try {
-            const detailsResponse = await fetch(`${API_BASE_URL}/games/${game.appid}/details`);
-            const details = await detailsResponse.json();
-            return {
-              ...game,
-              header_image: details.header_image
-            };
-          } catch (error) {
-            console.error(`Erro ao buscar detalhes do jogo ${game.appid}:`, error);
-            return game;
-          }
-        })
-      );
-      
-      setSearchResults(gamesWithDetails || []);
+      // A busca já traz header_image (pelo proxy de imagens); não precisa de outra requisição
+      setSearchResults(data.games || []);
     } catch (error) {
       console.error('Erro ao buscar jogos:', error);
       alert('Erro ao buscar jogos: ' + error.message);